@@ -1,6 +1,8 @@
 # Import libraries
 import numpy as np
 import pandas as pd
+from scipy import sparse
+from .utilities._cache import DerivedMatrixCache, DEFAULT_CACHE_BYTES
 
 
 # Define HierarchiaPy class
@@ -15,6 +17,7 @@ class Hierarchia:
 
         Initialization via Pandas Dataframe - Required to have two more arguments: Winner and Loser Column names
         Initialization via 2D Numpy - Require to be symmetric (n x n)
+        Initialization via SciPy sparse matrix - Require to be symmetric (n x n), kept as a CSR matrix
 
     """
     
@@ -36,6 +39,9 @@ class Hierarchia:
             Pandas DataFrame initialization: 'df' for Dataframe, 'winner_col' columns for winner individuals and 
                 'loser_col' columns for loser individuals
             2D Numpy: 'mat' for Numpy 2D Array (Matrix) and 'name_seq' for ordered individual names for rows/columns.
+            'mat' can also be a SciPy sparse matrix (e.g. CSR or COO). For Pandas DataFrame initialization, 'sparse'
+            (True) builds the matrix as a SciPy CSR matrix instead of a dense NumPy array. (False)
+            'cache_max_bytes' sets the memory cap of the cache of derived matrices shared by the methods. (2 ** 28)
 
         .. note::
         
@@ -54,7 +60,7 @@ class Hierarchia:
             if isinstance(args[0], pd.DataFrame):
                 self.df = args[0]
 
-            if isinstance(args[0], np.ndarray):
+            if isinstance(args[0], np.ndarray) or sparse.issparse(args[0]):
                 self.mat = args[0]
                 if self.mat.shape[0] != self.mat.shape[1]:
                     raise ValueError('Please provide symmetric 2D array')
@@ -62,7 +68,7 @@ class Hierarchia:
             if 'df' in kwargs and isinstance(kwargs['df'], pd.DataFrame):
                 self.df = kwargs['df']
 
-            if 'mat' in kwargs and isinstance(kwargs['mat'], np.ndarray):
+            if 'mat' in kwargs and (isinstance(kwargs['mat'], np.ndarray) or sparse.issparse(kwargs['mat'])):
                 self.mat = kwargs['mat']
                 if self.mat.shape[0] != self.mat.shape[1]:
                     raise ValueError('Please provide symmetric 2D array')
@@ -70,6 +76,11 @@ class Hierarchia:
         if not hasattr(self, 'df') and not hasattr(self, 'mat'):
             raise ValueError('Please provide valid Pandas Dataframe (argument: df) or NumPy array (argument: mat)')
 
+        # keep sparse matrices in CSR format (row slicing, sums and products without densifying)
+
+        if hasattr(self, 'mat') and sparse.issparse(self.mat):
+            self.mat = sparse.csr_matrix(self.mat)
+
         # initialize indices (if matrix provided)
 
         if hasattr(self, 'mat'):
@@ -78,7 +89,7 @@ class Hierarchia:
             elif 'name_seq' in kwargs and isinstance(kwargs['name_seq'], (np.ndarray, list)):
                 self.indices = kwargs['name_seq']
             else:
-                self.indices = np.arange(0, len(self.mat))
+                self.indices = np.arange(0, self.mat.shape[0])
                 print('Warning: Matrix indices will be used as name sequence, consider passing a name_seq')
             if len(self.indices) != self.mat.shape[0]:
                 raise ValueError('Name sequence is not equal to the length of rows/columns')
@@ -113,23 +124,42 @@ class Hierarchia:
             else:
                 raise ValueError('Please provide valid winner and/or loser column names')
 
-            # create matrix from dataframe
+            # create matrix from dataframe (names are integer-coded together, in sorted order)
+
+            codes, uniques = pd.factorize(pd.concat([self.df[self.winner_col], self.df[self.loser_col]],
+                                                    ignore_index=True), sort=True)
+            winner_codes, loser_codes = codes[:len(self.df)].astype('int64'), codes[len(self.df):].astype('int64')
+            known = (winner_codes >= 0) & (loser_codes >= 0)
+            self.indices = list(uniques)
+            if kwargs.get('sparse', False):
+                self.mat = sparse.csr_matrix((np.ones(known.sum(), dtype='int64'),
+                                              (winner_codes[known], loser_codes[known])),
+                                             shape=(len(self.indices), len(self.indices)))
+                self.cross_tab_df = pd.DataFrame.sparse.from_spmatrix(
+                    self.mat, index=pd.Index(self.indices, name=self.winner_col),
+                    columns=pd.Index(self.indices, name=self.loser_col))
+            else:
+                self.mat = np.bincount(winner_codes[known] * len(self.indices) + loser_codes[known],
+                                       minlength=len(self.indices) ** 2).reshape(len(self.indices), len(self.indices))
+                self.cross_tab_df = pd.DataFrame(self.mat, index=pd.Index(self.indices, name=self.winner_col),
+                                                 columns=pd.Index(self.indices, name=self.loser_col), copy=False)
+            self._owns_mat = True
+            if known.all():
+                self._interaction_codes = (winner_codes, loser_codes)
+
+        # cache of derived matrices shared by the methods
 
-            self.indices = sorted(set(list(self.df[self.winner_col]) + list(self.df[self.loser_col])))
-            self.cross_tab_df = pd.crosstab(index=self.df[self.winner_col],
-                                            columns=self.df[self.loser_col],
-                                            dropna=True).reindex(self.indices,
-                                                                 fill_value=0,
-                                                                 axis=0).reindex(self.indices,
-                                                                                 fill_value=0,
-                                                                                 axis=1)
-            self.mat = self.cross_tab_df.to_numpy()
-            self.indices = list(self.cross_tab_df.columns)
+        self._cache = DerivedMatrixCache(kwargs.get('cache_max_bytes', DEFAULT_CACHE_BYTES))
 
     # import methods
     
+    from .utilities._from_file import from_file
+    from_file = classmethod(from_file)
     from .methods._elo import elo
+    from .methods._elo import elo_trajectory
+    from .methods._elo import optimize_elo_k
     from .methods._randomized_elo import randomized_elo
+    from .methods._elo_tracker import elo_tracker
     from .methods._adagio import adagio
     from .methods._average_dominance_index import average_dominance_index
     from .methods._davids_score import davids_score
@@ -141,3 +171,11 @@ class Hierarchia:
     from .metrics._dci import dci
     from .metrics._landau_h import landau_h
     from .metrics._kendall_k import kendall_k
+    from .metrics._stability_index import stability_index
+    from .utilities._update import add_interactions
+    from .utilities._update import update
+    from .utilities._update import _get_df, _set_df
+    df = property(_get_df, _set_df)
+    from .utilities._windows import rolling_windows
+    from .utilities._cache import clear_cache
+    from .utilities._cache import cache_info
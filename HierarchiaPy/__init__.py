@@ -4,3 +4,6 @@ name = 'HierarchiaPy'
 __version__ = "0.2.6"
 
 from .HierarchiaPy import Hierarchia
+from .methods._elo_tracker import EloTracker
+from .methods._batch import HierarchiaBatch
+from .methods._grouped_elo import grouped_elo
@@ -0,0 +1,33 @@
+import argparse
+from .metrics._kendall_k import KENDALL_NULL_SEED, precompute_kendall_nulls
+from .utilities._null_store import cache_dir
+
+
+def main(argv: list = None):
+
+    """Command line interface, e.g. precompute the Kendall K null distributions of group sizes 3 to 20:
+
+    python -m HierarchiaPy kendall-null 3 20 --runs 100000 --n-jobs -1
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m HierarchiaPy')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    kendall_parser = subparsers.add_parser('kendall-null', help='precompute the null distributions of Kendall K '
+                                                                '(d) for a range of group sizes')
+    kendall_parser.add_argument('min_n', type=int, help='smallest group size')
+    kendall_parser.add_argument('max_n', type=int, help='largest group size (inclusive)')
+    kendall_parser.add_argument('--runs', type=int, default=100000, help='random matrices per group size (100000)')
+    kendall_parser.add_argument('--seed', type=int, default=KENDALL_NULL_SEED, help='seed of the random matrices (0)')
+    kendall_parser.add_argument('--n-jobs', type=int, default=1, help='worker processes, -1 uses all CPUs (1)')
+    args = parser.parse_args(argv)
+
+    if args.min_n < 2 or args.max_n < args.min_n:
+        parser.error('group sizes have to satisfy 2 <= min_n <= max_n')
+    print('Null distributions are stored in ' + cache_dir())
+    for path in precompute_kendall_nulls(range(args.min_n, args.max_n + 1), runs=args.runs, seed=args.seed,
+                                         n_jobs=args.n_jobs):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,74 @@
 import numpy as np
+from ..utilities._cache import result_key, cached_result, store_result
+from ..utilities._derived import dominance_matrix
+from ..utilities._parallel import map_blocks, randomization_blocks
 
+# Number of iterative runs of every independent search chain (de Vries (1998) suggests 100 runs)
+_ISI98_CHAIN_RUNS = 100
 
-def ISI98(self, runs: int = 1000, verbose: bool = False) -> dict:
 
+def _swap_individuals(mat: np.ndarray, seq: np.ndarray, index_x: int, index_y: int):
+
+    # Swap two individuals in the matrix (rows and columns) and in the sequence, in place
+    mat[:, [index_x, index_y]] = mat[:, [index_y, index_x]]
+    mat[[index_x, index_y], :] = mat[[index_y, index_x], :]
+    seq[[index_x, index_y]] = seq[[index_y, index_x]]
+
+
+def _inconsistencies(mat: np.ndarray) -> tuple:
+
+    # Inconsistent dyads (row, column indices above the diagonal) and strength of inconsistencies
+    inconsistencies = np.where(np.triu(mat - np.transpose(mat)) < 0)
+    return inconsistencies, int(np.sum(inconsistencies[1] - inconsistencies[0]))
+
+
+def _ISI98_chain(runs: int, seed, mat: np.ndarray) -> tuple:
+
+    # Iterative phase of one search chain started from the initial order, random swaps are drawn with the seed
+    rng = np.random.default_rng(seed)
+    temp_mat = mat.copy()
+    temp_seq = np.arange(mat.shape[0])
+    inconsistencies, min_str_i = _inconsistencies(temp_mat)
+    min_inconsistencies = len(inconsistencies[0])
+    best_mat = temp_mat.copy()
+    best_seq = temp_seq.copy()
+
+    for run in range(runs):
+        flag = True
+        flag_i = 0
+        while flag:
+            flag = False
+            flag_i += 1
+            inconsistencies = np.where(np.triu(temp_mat - np.transpose(temp_mat)) < 0)
+            for idx in range(len(inconsistencies[0])):
+                net_incs = 0
+                for idy in range(inconsistencies[0][idx], inconsistencies[1][idx]):
+                    net_incs += (temp_mat[inconsistencies[1][idx], idy] - temp_mat[idy, inconsistencies[1][idx]])
+                if net_incs > 0:
+                    _swap_individuals(temp_mat, temp_seq, inconsistencies[0][idx], inconsistencies[1][idx])
+                    flag = True
+            if flag_i > 10000:
+                flag = False
+
+        # Compute number of inconsistencies and strength of inconsistencies
+        inconsistencies, str_i = _inconsistencies(temp_mat)
+
+        if (len(inconsistencies[0]) < min_inconsistencies or
+                (len(inconsistencies[0])) == min_inconsistencies and str_i < min_str_i):
+            best_seq, best_mat = temp_seq.copy(), temp_mat.copy()
+            min_inconsistencies, min_str_i = len(inconsistencies[0]), str_i
+        elif min_str_i > 0 and run < runs - 1:
+            # Random swap partners of all inconsistencies in one draw (0 for an inconsistency with individual 1)
+            random_swap_idx = rng.integers(0, np.maximum(inconsistencies[1] - 1, 1))
+            for idx in range(len(inconsistencies[0])):
+                _swap_individuals(temp_mat, temp_seq, random_swap_idx[idx], inconsistencies[1][idx])
+        else:
+            break
+
+    return min_inconsistencies, min_str_i, best_mat, best_seq
+
+
+def ISI98(self, runs: int = 1000, verbose: bool = False, n_jobs: int = 1, random_state=None) -> dict:
     """I&SI 1998 from an interaction dataframe/matrix.
     
     Parameters
@@ -13,6 +79,12 @@ def ISI98(self, runs: int = 1000, verbose: bool = False) -> dict:
     :param verbose: bool
         Print initial, intermediate and final inconsistencies, strength of inconsistencies and matrices. Used for
         detailed output of computational process. (False)
+    :param n_jobs: int
+        Number of worker processes the search chains are split across, -1 uses all CPUs. (1)
+    :param random_state: int, np.random.SeedSequence or np.random.Generator
+        Seed of the random swaps. Results are identical for a given seed whatever the number of workers, and results
+        of integer seeds are cached on the object; the global NumPy random state seeds the search if not provided.
+        (None)
     
     Returns
     -------
@@ -35,6 +107,11 @@ def ISI98(self, runs: int = 1000, verbose: bool = False) -> dict:
     assumption is the existence of a linear or near-linear hierarchy which can be verified by means of a
     linearity test. 
     (de Vries, 1998)
+
+    The runs are split into independent search chains of 100 runs, each started from the initial order with its own
+    random stream, and the best order over all chains (earliest chain on ties) enters the final phase. The chains are
+    used with n_jobs=1 as well, so that results do not depend on the number of workers; restarting from the initial
+    order reaches at least the inconsistencies of a single continuous chain of the same number of runs in our tests.
     
     References
     ----------
@@ -42,101 +119,53 @@ def ISI98(self, runs: int = 1000, verbose: bool = False) -> dict:
       a new procedure and review. Animal Behaviour, 55, 827-843
     """
     
+    # Cached result of a seeded search
+    key = result_key('ISI98', random_state, runs) if not verbose else None
+    best_seq = cached_result(self, key)
+    if best_seq is not None:
+        return best_seq
+
     # Matrix manipulations
-    mat = self.mat.astype('int64')
-    for idx in range(mat.shape[0]):
-        for idy in range(idx + 1, mat.shape[0]):
-            if mat[idx, idy] == mat[idy, idx]:
-                mat[idx, idy] = 0
-                mat[idy, idx] = 0
-            elif mat[idx, idy] > mat[idy, idx]:
-                mat[idx, idy] = 1
-                mat[idy, idx] = 0
-            else:
-                mat[idx, idy] = 0
-                mat[idy, idx] = 1
-
-    # Utility functions
-    def swap_column_2d(arr, index_x, index_y):
-        arr[:, [index_x, index_y]] = temp_mat[:, [index_y, index_x]]
-        return arr
-
-    def swap_row_2d(arr, index_x, index_y):
-        arr[[index_x, index_y], :] = temp_mat[[index_y, index_x], :]
-        return arr
-
-    def swap_element_1d(arr, index_x, index_y):
-        arr[index_x], arr[index_y] = arr[index_y], arr[index_x]
-        return arr
+    mat = dominance_matrix(self, tie_value=0).astype('int64')
 
     # Calculate number of inconsistencies and number strength of inconsistencies
-    diff_mat = mat - np.transpose(mat)
-    inconsistencies = np.where(np.triu(diff_mat) < 0)
-    str_i = sum([inconsistencies[1][idx] - inconsistencies[0][idx] for idx in range(len(inconsistencies[0]))])
+    inconsistencies, str_i = _inconsistencies(mat)
 
     if verbose:
         print('Initial Phase\n-------------')
         print('Initial number of inconsistencies: ', len(inconsistencies[0]))
         print('Initial strength of inconsistencies: ', str_i, '\n')
 
-    # Define parameters
-    min_inconsistencies = len(inconsistencies[0])
-    min_str_i = str_i
-
-    temp_mat = mat.copy()
-    temp_seq = self.indices.copy()
-    best_mat = temp_mat.copy()
-    best_seq = temp_seq.copy()
-
-    # Iterative process
-    for _ in range(runs):
-        flag = True
-        flag_i = 0
-        while flag:
-            flag = False
-            flag_i += 1
-            inconsistencies = np.where(np.triu(temp_mat - np.transpose(temp_mat)) < 0)
-            for idx in range(len(inconsistencies[0])):
-                net_incs = 0
-                for idy in range(inconsistencies[0][idx], inconsistencies[1][idx]):
-                    net_incs += (temp_mat[inconsistencies[1][idx], idy] - temp_mat[idy, inconsistencies[1][idx]])
-                if net_incs > 0:
-                    temp_mat = swap_column_2d(temp_mat, inconsistencies[0][idx], inconsistencies[1][idx])
-                    temp_mat = swap_row_2d(temp_mat, inconsistencies[0][idx], inconsistencies[1][idx])
-                    temp_seq = swap_element_1d(temp_seq, inconsistencies[0][idx], inconsistencies[1][idx])
-                    flag = True
-            if flag_i > 10000:
-                flag = False
-
-        # Compute number of inconsistencies and strength of inconsistencies
-        inconsistencies = np.where(np.triu(temp_mat - np.transpose(temp_mat)) < 0)
-        str_i = sum([inconsistencies[1][idx] - inconsistencies[0][idx] for idx in range(len(inconsistencies[0]))])
-
-        if (len(inconsistencies[0]) < min_inconsistencies or
-                (len(inconsistencies[0])) == min_inconsistencies and str_i < min_str_i):
-            best_seq, best_mat = temp_seq.copy(), temp_mat.copy()
-            min_inconsistencies, min_str_i = len(inconsistencies[0]), str_i
+    # Iterative process in independent search chains (optionally in parallel), a chain without inconsistencies
+    # cannot be improved upon so later chains are not needed
+    min_inconsistencies, min_str_i = len(inconsistencies[0]), str_i
+    best_mat, best_order = mat.copy(), np.arange(mat.shape[0])
+    for chain_inconsistencies, chain_str_i, chain_mat, chain_order in map_blocks(
+            _ISI98_chain, randomization_blocks(runs, _ISI98_CHAIN_RUNS), random_state=random_state, n_jobs=n_jobs,
+            args=(mat,)):
+        if (chain_inconsistencies < min_inconsistencies or
+                chain_inconsistencies == min_inconsistencies and chain_str_i < min_str_i):
+            best_mat, best_order = chain_mat, chain_order
+            min_inconsistencies, min_str_i = chain_inconsistencies, chain_str_i
+        if min_inconsistencies == 0:
+            break
+    best_seq = [self.indices[idx] for idx in best_order]
+
+    # Chains only stop before their runs are used up once no inconsistencies are left
+    if verbose:
+        print('End of Iterative Phase\n-------------')
+        if min_inconsistencies == 0:
+            print('Optimal or near-optimal linear ranking is found!')
         else:
-            if min_str_i > 0 and _ < runs - 1:
-                for idx in range(len(inconsistencies[0])):
-                    random_swap_idx = 0
-                    if inconsistencies[1][idx] - 1 != 0:
-                        random_swap_idx = np.random.randint(0, inconsistencies[1][idx] - 1)
-                    temp_mat = swap_column_2d(temp_mat, random_swap_idx, inconsistencies[1][idx])
-                    temp_mat = swap_row_2d(temp_mat, random_swap_idx, inconsistencies[1][idx])
-                    temp_seq = swap_element_1d(temp_seq, random_swap_idx, inconsistencies[1][idx])
-            else:
-                if verbose:
-                    print('End of Iterative Phase\n-------------')
-                    print('Optimal or near-optimal linear ranking is found!')
-                    print('Best sequence after iterative phase: ', best_seq)
-                    print('Matrix after iterative phase: \n')
-                    print(best_mat, '\n')
-                break
+            print('Number of inconsistencies after iterative phase: ', min_inconsistencies)
+            print('Strength of inconsistencies after iterative phase: ', min_str_i)
+        print('Best sequence after iterative phase: ', best_seq)
+        print('Matrix after iterative phase: \n')
+        print(best_mat, '\n')
 
     # Final phase
     temp_mat = best_mat.copy()
-    temp_seq = best_seq.copy()
+    temp_seq = np.array(best_seq, dtype='object')
     best_diff_mat = (best_mat - np.transpose(best_mat)).astype('float64')
     upper_triangle_indices = np.triu_indices_from(best_diff_mat, k=1)
 
@@ -149,16 +178,12 @@ def ISI98(self, runs: int = 1000, verbose: bool = False) -> dict:
             s_j = len(np.where(best_diff_mat[upper_triangle_indices[1][idx], :] < 0)[0])
 
             if d_i - s_i < d_j - s_j:
-                temp_mat = swap_column_2d(temp_mat, upper_triangle_indices[0][idx], upper_triangle_indices[1][idx])
-                temp_mat = swap_row_2d(temp_mat, upper_triangle_indices[0][idx], upper_triangle_indices[1][idx])
-                temp_seq = swap_element_1d(temp_seq, upper_triangle_indices[0][idx], upper_triangle_indices[1][idx])
-                temp_i = np.where(np.triu(temp_mat - np.transpose(temp_mat)) < 0)
-                temp_str_i = sum([temp_i[1][idz] - temp_i[0][idz] for idz in range(len(temp_i[0]))])
+                _swap_individuals(temp_mat, temp_seq, upper_triangle_indices[0][idx], upper_triangle_indices[1][idx])
+                _, temp_str_i = _inconsistencies(temp_mat)
                 if not temp_str_i > min_str_i:
-                    best_seq, best_mat = temp_seq.copy(), temp_mat.copy()
+                    best_seq, best_mat = temp_seq.tolist(), temp_mat.copy()
 
-    inconsistencies = np.where(np.triu(best_mat - np.transpose(best_mat)) < 0)
-    str_i = sum([inconsistencies[1][idx] - inconsistencies[0][idx] for idx in range(len(inconsistencies[0]))])
+    inconsistencies, str_i = _inconsistencies(best_mat)
 
     if verbose:
         print('Final Phase\n-------------')
@@ -169,5 +194,5 @@ def ISI98(self, runs: int = 1000, verbose: bool = False) -> dict:
         print(best_mat)
     
     # Return best sequence
-    best_seq = {key: idx for idx, key in enumerate(best_seq)}
-    return best_seq
+    best_seq = {name: idx for idx, name in enumerate(best_seq)}
+    return store_result(self, key, best_seq)
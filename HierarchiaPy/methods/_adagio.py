@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from ..utilities._sparse import is_sparse
 
 
 def adagio(self, preprocessing: bool = False, plot_network: bool = False, rank: str = 'topological') -> dict:
@@ -52,11 +53,16 @@ def adagio(self, preprocessing: bool = False, plot_network: bool = False, rank:
     
     # Preprocessing
     if preprocessing:
-        mat = mat - np.transpose(mat)
-        mat = np.where(mat < 0, 0, mat)
+        mat = mat - mat.T
+        mat = mat.maximum(0) if is_sparse(mat) else np.where(mat < 0, 0, mat)
     
     # Network 
-    network_graph = nx.from_numpy_array(mat, create_using=nx.DiGraph(directed=True))
+    if is_sparse(mat):
+        mat = mat.tocsr()
+        mat.eliminate_zeros()
+        network_graph = nx.from_scipy_sparse_array(mat, create_using=nx.DiGraph(directed=True))
+    else:
+        network_graph = nx.from_numpy_array(mat, create_using=nx.DiGraph(directed=True))
     
     # Plot network
     if plot_network:
@@ -66,12 +72,14 @@ def adagio(self, preprocessing: bool = False, plot_network: bool = False, rank:
     # Calculation of ranks
     largest = max(nx.strongly_connected_components(network_graph), key=len)
     while len(largest) > 1:
-        sliced_mat = mat[list(largest), :][:, list(largest)]
-        min_edges = np.where(sliced_mat == np.min(sliced_mat[sliced_mat > 0]))
+        largest_nodes = np.array(list(largest))
+        sliced_mat = mat[largest_nodes, :][:, largest_nodes]
+        positive_edges = sliced_mat.data[sliced_mat.data > 0] if is_sparse(sliced_mat) else sliced_mat[sliced_mat > 0]
+        min_edges = (sliced_mat == np.min(positive_edges)).nonzero()
 
-        for idx in range(len(min_edges[0])):
-            network_graph.remove_edge(list(largest)[min_edges[0][idx]], list(largest)[min_edges[1][idx]])
-            mat[list(largest)[min_edges[0][idx]], list(largest)[min_edges[1][idx]]] = 0
+        edge_rows, edge_cols = largest_nodes[min_edges[0]], largest_nodes[min_edges[1]]
+        network_graph.remove_edges_from(zip(edge_rows.tolist(), edge_cols.tolist()))
+        mat[edge_rows, edge_cols] = 0
 
         largest = max(nx.strongly_connected_components(network_graph), key=len)
     
@@ -1,4 +1,6 @@
 import numpy as np
+from ..utilities._derived import proportion_matrix, sparse_proportions
+from ..utilities._sparse import is_sparse
 
 
 def average_dominance_index(self) -> dict:
@@ -32,25 +34,17 @@ def average_dominance_index(self) -> dict:
 
     """
 
-    # Matrix manipulation
-    mat = self.mat.astype('float64')
-    np.fill_diagonal(mat, np.nan)
-    sum_mat = mat.copy()
-
-    for idx in range(0, mat.shape[0]):
-        for idy in range(idx + 1, mat.shape[0]):
-            temp_sum = mat[idx, idy] + mat[idy, idx]
-            if temp_sum > 0:
-                sum_mat[idx, idy] = temp_sum
-                sum_mat[idy, idx] = temp_sum
-            else:
-                sum_mat[idx, idy] = np.nan
-                sum_mat[idy, idx] = np.nan
-
-    # Calculation of matrix properties
-    prop_mat = mat / sum_mat
-    var_w = np.nansum(prop_mat, axis=1)
-    var_adi = var_w / np.count_nonzero(~np.isnan(prop_mat), axis=1)
+    # Sparse matrix (only the dyads that interacted are stored)
+    if is_sparse(self.mat):
+        prop_mat, total_mat = sparse_proportions(self)
+        var_w = np.asarray(prop_mat.sum(axis=1)).ravel()
+        var_adi = var_w / total_mat.getnnz(axis=1)
+
+    # Dense matrix (proportions of wins shared with David's scores)
+    else:
+        prop_mat = proportion_matrix(self)
+        var_w = np.nansum(prop_mat, axis=1)
+        var_adi = var_w / np.count_nonzero(~np.isnan(prop_mat), axis=1)
 
     # Create ADI dictionary
     average_dominance_index_dict = {i: round(var_adi[idx], 4) for idx, i in enumerate(self.indices)}
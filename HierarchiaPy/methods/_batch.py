@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+from ..utilities._dyads import pair_totals
+
+
+class HierarchiaBatch:
+
+    """Batch of many small social groups for vectorized hierarchy calculations.
+
+    The interaction matrices of all groups are stored as one zero-padded (groups x n x n) array, n being the size of
+    the largest group, together with a (groups x n) mask of the rows/columns that belong to real individuals. The
+    methods compute David's scores, average dominance indices, DCI and steepness of all groups at once along the
+    batch axis, so the cost per group is a few array operations instead of a Hierarchia object and its method calls.
+
+    .. note::
+
+        Padded individuals have no interactions, so they drop out of every dyadic calculation. Results are returned
+        as tidy Pandas DataFrames with one row per group (or per individual), like :py:func:`_grouped_elo.grouped_elo`.
+
+    """
+
+    def __init__(self, mats: list, name_seqs: list = None, group_ids: list = None, group_col: str = 'group'):
+
+        """Batch from a list of interaction matrices.
+
+        Parameters
+        ----------
+        :param mats: list
+            Square interaction matrices (2D NumPy arrays) of the groups, the groups can differ in size.
+        :param name_seqs: list
+            Ordered individual names for the rows/columns of every matrix, matrix indices are used if not provided.
+            (None)
+        :param group_ids: list
+            Identification of the groups, the position in mats is used if not provided. (None)
+        :param group_col: str
+            Name of the group column of the resulting DataFrames. ('group')
+        """
+
+        # Validate input
+        mats = [np.asarray(mat) for mat in mats]
+        for mat in mats:
+            if mat.ndim != 2 or mat.shape[0] != mat.shape[1]:
+                raise ValueError('Please provide symmetric 2D arrays')
+        if name_seqs is None:
+            name_seqs = [list(range(mat.shape[0])) for mat in mats]
+        if group_ids is None:
+            group_ids = list(range(len(mats)))
+        if len(name_seqs) != len(mats) or len(group_ids) != len(mats):
+            raise ValueError('Name sequences and group identifications are not equal to the number of matrices')
+        for mat, name_seq in zip(mats, name_seqs):
+            if len(name_seq) != mat.shape[0]:
+                raise ValueError('Name sequence is not equal to the length of rows/columns')
+
+        # Padded stack of matrices and individual mask
+        self.sizes = np.array([mat.shape[0] for mat in mats], dtype='int64')
+        n = int(self.sizes.max()) if len(mats) > 0 else 0
+        self.mats = np.zeros((len(mats), n, n), dtype='float64')
+        for idx, mat in enumerate(mats):
+            self.mats[idx, :mat.shape[0], :mat.shape[0]] = mat
+        self.mask = np.arange(n) < self.sizes[:, np.newaxis]
+        self.indices = [list(name_seq) for name_seq in name_seqs]
+        self.group_ids = list(group_ids)
+        self.group_col = group_col
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, group_col: str, winner_col: str, loser_col: str):
+
+        """Batch from a single interaction dataframe of many social groups.
+
+        Parameters
+        ----------
+        :param df: pd.DataFrame
+            Interaction dataframe with one row per interaction.
+        :param group_col: str
+            Name of the column identifying the social group of each interaction.
+        :param winner_col: str
+            Name of the column of winner individuals.
+        :param loser_col: str
+            Name of the column of loser individuals.
+
+        Returns
+        -------
+        HierarchiaBatch : object
+            Batch with groups sorted by group and individuals sorted by name within each group, i.e. every matrix is
+            identical to the one of a Hierarchia object initialized with the interactions of the group.
+        """
+
+        # Validate columns
+        for col in [group_col, winner_col, loser_col]:
+            if col not in df.columns:
+                raise ValueError('Please provide valid group, winner and/or loser column names')
+        df = df.dropna(subset=[group_col, winner_col, loser_col])
+
+        # Integer-code groups and (group, individual) pairs in sorted order
+        pairs = pd.MultiIndex.from_arrays([pd.concat([df[group_col], df[group_col]], ignore_index=True),
+                                           pd.concat([df[winner_col], df[loser_col]], ignore_index=True)])
+        codes, uniques = pd.factorize(pairs, sort=True)
+        group_codes, group_ids = pd.factorize(uniques.get_level_values(0), sort=True)
+        sizes = np.bincount(group_codes, minlength=len(group_ids))
+        local_codes = np.arange(len(uniques)) - np.searchsorted(group_codes, group_codes)
+
+        # Count interactions into the padded stack
+        batch = cls([], group_col=group_col)
+        batch.sizes = sizes.astype('int64')
+        n = int(sizes.max()) if len(sizes) > 0 else 0
+        batch.mats = np.zeros((len(group_ids), n, n), dtype='float64')
+        winner_codes, loser_codes = codes[:len(df)], codes[len(df):]
+        np.add.at(batch.mats, (group_codes[winner_codes], local_codes[winner_codes], local_codes[loser_codes]), 1)
+        batch.mask = np.arange(n) < batch.sizes[:, np.newaxis]
+        names = uniques.get_level_values(1)
+        group_starts = np.concatenate([[0], np.cumsum(sizes)])
+        batch.indices = [list(names[group_starts[idx]:group_starts[idx + 1]]) for idx in range(len(group_ids))]
+        batch.group_ids = list(group_ids)
+        return batch
+
+    def __len__(self):
+        return len(self.group_ids)
+
+    # Matrix manipulation
+
+    def _proportions(self, method: str = 'Pij') -> np.ndarray:
+
+        # Stack of Pij or Dij matrices, NaN on the diagonal and for dyads without interactions (incl. padding)
+        mat = self.mats
+        if method == 'Dij':
+            total_mat = mat + np.swapaxes(mat, 1, 2)
+            mat = np.divide(mat, total_mat, out=np.zeros_like(mat), where=total_mat != 0)
+            mat -= np.divide((mat - 0.5), total_mat + 1, out=np.zeros_like(mat), where=total_mat != 0)
+        return mat / pair_totals(mat)
+
+    def _davids_scores(self, method: str = 'Pij') -> np.ndarray:
+
+        # (groups x n) David's scores, dyads without interactions contribute zero
+        prop_mat = np.nan_to_num(self._proportions(method), nan=0.0)
+        var_l = prop_mat.sum(axis=1)
+        var_w = prop_mat.sum(axis=2)
+        var_l2 = np.einsum('gji,gj->gi', prop_mat, var_l)
+        var_w2 = np.einsum('gij,gj->gi', prop_mat, var_w)
+        return var_w + var_w2 - var_l - var_l2
+
+    def _normalized_davids_scores(self, method: str = 'Pij') -> np.ndarray:
+
+        # (groups x n) normalized David's scores, rounded as in davids_score(normalize=True)
+        sizes = self.sizes[:, np.newaxis]
+        return np.round((np.round(self._davids_scores(method), 4) + sizes * (sizes - 1) / 2) / sizes, 4)
+
+    def _individual_frame(self, values: np.ndarray, name: str) -> pd.DataFrame:
+
+        # Tidy dataframe of a (groups x n) array of individual values, padding removed
+        return pd.DataFrame({self.group_col: pd.Index(self.group_ids).repeat(self.sizes),
+                             'individual': [name for name_seq in self.indices for name in name_seq],
+                             name: [round(value, 4) for value in values[self.mask].tolist()]})
+
+    def _group_frame(self, values: np.ndarray, name: str) -> pd.DataFrame:
+
+        # Tidy dataframe of one value per group
+        return pd.DataFrame({self.group_col: self.group_ids,
+                             name: [round(value, 4) for value in values.tolist()]})
+
+    # Metrics
+
+    def davids_score(self, method: str = 'Pij', normalize: bool = False) -> pd.DataFrame:
+
+        """David's scores of every group, see :py:func:`_davids_score.davids_score`.
+
+        Parameters
+        ----------
+        :param method: str
+            Valid arguments are 'Dij' and 'Pij'. ('Pij')
+        :param normalize: bool
+            Normalization of the David's scores using formula of NormDS = (DS+N(N −1)/2)/N. (False)
+
+        Returns
+        -------
+        davids_score_df : pd.DataFrame
+            Tidy dataframe with the columns <group_col>, 'individual' and 'davids_score' (rounded to 4 decimal
+            places), in the order of the groups and their individuals.
+        """
+
+        assert method in ['Dij', 'Pij']
+        assert type(normalize) == bool
+        values = self._normalized_davids_scores(method) if normalize else self._davids_scores(method)
+        return self._individual_frame(values, 'davids_score')
+
+    def average_dominance_index(self) -> pd.DataFrame:
+
+        """Average dominance indices of every group, see :py:func:`_average_dominance_index.average_dominance_index`.
+
+        Returns
+        -------
+        average_dominance_index_df : pd.DataFrame
+            Tidy dataframe with the columns <group_col>, 'individual' and 'average_dominance_index' (rounded to 4
+            decimal places), in the order of the groups and their individuals.
+        """
+
+        prop_mat = self._proportions()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var_adi = np.nansum(prop_mat, axis=2) / np.count_nonzero(~np.isnan(prop_mat), axis=2)
+        return self._individual_frame(var_adi, 'average_dominance_index')
+
+    def dci(self) -> pd.DataFrame:
+
+        """Directional consistency index of every group, see :py:func:`_dci.dci`.
+
+        Returns
+        -------
+        dci_df : pd.DataFrame
+            Tidy dataframe with the columns <group_col> and 'dci' (rounded to 4 decimal places).
+        """
+
+        diagonal = np.arange(self.mats.shape[1])
+        mat = self.mats.copy()
+        mat[:, diagonal, diagonal] = 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dc_index = np.sum(np.abs(mat - np.swapaxes(mat, 1, 2)), axis=(1, 2)) / 2 / np.sum(mat, axis=(1, 2))
+        return self._group_frame(dc_index, 'dci')
+
+    def get_steepness(self, method: str = 'Dij') -> pd.DataFrame:
+
+        """Steepness of every group, see :py:func:`_steepness.get_steepness`.
+
+        Parameters
+        ----------
+        :param method: str
+            Valid arguments are 'Dij' and 'Pij'. ('Dij')
+
+        Returns
+        -------
+        steepness_df : pd.DataFrame
+            Tidy dataframe with the columns <group_col> and 'steepness' (rounded to 4 decimal places), the absolute
+            slope of the ordinary least-squares line of the sorted normalized David's scores against their ranks. The
+            slopes are computed in closed form, so they can differ from get_steepness in the last decimal place.
+        """
+
+        assert method in ['Dij', 'Pij']
+
+        # Normalized David's scores in descending order, padding at the end
+        n_ds = np.where(self.mask, self._normalized_davids_scores(method), -np.inf)
+        y = -np.sort(-n_ds, axis=1)
+
+        # OLS slopes of all groups at once (closed form, padding excluded)
+        sizes = self.sizes.astype('float64')
+        x = np.where(self.mask, np.arange(1, self.mats.shape[1] + 1), 0.0)
+        y = np.where(self.mask, y, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x_mean = x.sum(axis=1) / sizes
+            y_mean = y.sum(axis=1) / sizes
+            x_centered = np.where(self.mask, x - x_mean[:, np.newaxis], 0.0)
+            slopes = (x_centered * y).sum(axis=1) / (x_centered ** 2).sum(axis=1)
+        return self._group_frame(np.abs(slopes), 'steepness')
@@ -1,4 +1,26 @@
 import numpy as np
+from ..utilities._cache import derived
+from ..utilities._derived import proportion_matrix, sparse_proportions
+from ..utilities._sparse import is_sparse
+
+
+def _davids_score_vector(self, method: str) -> np.ndarray:
+
+    # David's scores in the order of indices; sparse matrices only store the dyads that interacted
+    if is_sparse(self.mat):
+        prop_mat, _ = sparse_proportions(self, method=method)
+        var_l = np.asarray(prop_mat.sum(axis=0)).ravel()
+        var_w = np.asarray(prop_mat.sum(axis=1)).ravel()
+        var_l2 = prop_mat.T @ var_l
+        var_w2 = prop_mat @ var_w
+    else:
+        prop_mat = proportion_matrix(self, method=method)
+        var_l = np.nansum(prop_mat, axis=0)
+        var_w = np.nansum(prop_mat, axis=1)
+        var_l2 = np.nansum(np.transpose(prop_mat) * var_l, axis=1)
+        var_w2 = np.nansum(prop_mat * var_w, axis=1)
+
+    return var_w + var_w2 - var_l - var_l2
 
 
 def davids_score(self, method: str = 'Pij', normalize: bool = False, order: bool = True) -> dict:
@@ -49,33 +71,8 @@ def davids_score(self, method: str = 'Pij', normalize: bool = False, order: bool
     assert type(normalize) == bool
     assert type(order) == bool
 
-    # Matrix manipulation
-    mat = self.mat.astype('float64')
-    if method == 'Dij':
-        total_mat = mat + np.transpose(mat)
-        mat = np.divide(mat, total_mat, out=np.zeros_like(mat), where=total_mat != 0)
-        mat -= np.divide((mat - 0.5), total_mat + 1, out=np.zeros_like(mat), where=total_mat != 0)
-
-    np.fill_diagonal(mat, np.nan)
-    sum_mat = mat.copy()
-
-    for idx in range(0, mat.shape[0]):
-        for idy in range(idx + 1, mat.shape[0]):
-            temp_sum = mat[idx, idy] + mat[idy, idx]
-            if temp_sum > 0:
-                sum_mat[idx, idy] = temp_sum
-                sum_mat[idy, idx] = temp_sum
-            else:
-                sum_mat[idx, idy] = np.nan
-                sum_mat[idy, idx] = np.nan
-
-    # Calculation of matrix properties
-    prop_mat = mat / sum_mat
-    var_l = np.nansum(prop_mat, axis=0)
-    var_w = np.nansum(prop_mat, axis=1)
-    var_l2 = np.nansum(np.transpose(prop_mat) * var_l, axis=1)
-    var_w2 = np.nansum(prop_mat * var_w, axis=1)
-    var_ds = var_w + var_w2 - var_l - var_l2
+    # David's scores, computed once per object and shared with the steepness methods
+    var_ds = derived(self, 'davids_score_' + method, lambda: _davids_score_vector(self, method))
 
     # Create David's score dictionary
     davids_score_dict = {i: round(var_ds[idx], 4) for idx, i in enumerate(self.indices)}
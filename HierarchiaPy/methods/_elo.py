@@ -1,4 +1,7 @@
-from scipy.special import erfc
+import numpy as np
+import pandas as pd
+from ._elo_engine import elo_multi_k, elo_sequence, elo_trajectory_sequence, interaction_codes, \
+    interaction_days
 
 
 def elo(self, start_value: float = 1000, K: float = 100, normal_probability: bool = False) -> dict:
@@ -12,7 +15,7 @@ def elo(self, start_value: float = 1000, K: float = 100, normal_probability: boo
         an effect on relative differences after the calculation. (1000)
     :param K: float
         Parameter of the Elo function that acts as a factor and determines the speed at which scores change
-        after an interaction. Optimization might be a good idea but not implemented yet. (100)
+        after an interaction. See optimize_elo_k for a maximum-likelihood estimate of K. (100)
     :param normal_probability: bool
         Adjust the calculation of expected win/loss probabilities; default is Logistic,
         the normal probabilities are calculated using standard normal tables. For normalised probabilities,
@@ -53,28 +56,127 @@ def elo(self, start_value: float = 1000, K: float = 100, normal_probability: boo
       Animal Behaviour, 61, 489-495. (DOI: 10.1006/anbe.2000.1571)
     """
 
-    # Check whether Pandas dataframe provided
-    if not hasattr(self, 'df'):
-        raise ValueError('Elo rating depends on sequence of wins/loses, computation uses Pandas dataframe, '
-                         'consider using randomized elo')
+    # Integer-coded interaction sequence (raises if no Pandas dataframe provided)
+    winner_codes, loser_codes = interaction_codes(self)
 
-    # Initialize elo dictionary
-    elo_dict = {i: start_value for i in self.indices}
+    # Sequential Elo update over the coded interactions
+    ratings = elo_sequence(winner_codes, loser_codes, len(self.indices), start_value=start_value, K=K,
+                           normal_probability=normal_probability)
 
-    # Iterate through the dataframe rows and compute elo scores
-    for idx, row in self.df.iterrows():
+    # Return final elo scores dictionary
+    elo_dict = {i: round(rating, 4) for i, rating in zip(self.indices, ratings.tolist())}
+    return elo_dict
 
-        elo_diff = elo_dict[row[self.winner_col]] - elo_dict[row[self.loser_col]]
-        if normal_probability:
-            expected_winner = erfc(-elo_diff / ((2000 / 7) * (2 ** 0.5))) / 2
-            expected_loser = erfc(elo_diff / ((2000 / 7) * (2 ** 0.5))) / 2
-        else:
-            expected_winner = 1 / (1 + 10 ** ((-elo_diff) / 400))
-            expected_loser = 1 / (1 + 10 ** (elo_diff / 400))
 
-        elo_dict[row[self.winner_col]] += (K - K * expected_winner)
-        elo_dict[row[self.loser_col]] += (-K * expected_loser)
+def elo_trajectory(self, start_value: float = 1000, K: float = 100, normal_probability: bool = False,
+                   date_col: str = None) -> dict:
 
-    # Return final elo scores dictionary
-    elo_dict = {key: round(elo_dict[key], 4) for key in elo_dict}
-    return elo_dict
+    """Elo rating trajectories from an interaction dataframe.
+
+    Parameters
+    ----------
+    :param start_value: float
+        Parameter of the Elo function that determines the initial scores. (1000)
+    :param K: float
+        Parameter of the Elo function that acts as a factor and determines the speed at which scores change
+        after an interaction. (100)
+    :param normal_probability: bool
+        Adjust the calculation of expected win/loss probabilities; default is Logistic,
+        the normal probabilities are calculated using standard normal tables. (False)
+    :param date_col: str
+        Name of a date/time column of the dataframe. If provided, the ratings of all individuals at the end of every
+        calendar day are returned as well. The dataframe has to be in chronological order. (None)
+
+    Returns
+    -------
+    trajectory : dict
+        'elo': final Elo ratings as returned by :py:func:`_elo.elo`. 'winner_before', 'winner_after', 'loser_before'
+        and 'loser_after': float arrays with one entry per interaction (in dataframe order) holding the ratings of the
+        two participants before and after the interaction. 'daily' (only if date_col provided): dataframe of the
+        ratings at the end of every day, indexed by date with individuals as columns.
+
+    Notes
+    -----
+    All trajectories are filled during the single chronological Elo pass, so the cost is linear in the number of
+    interactions instead of re-running Elo on every prefix of the interaction sequence.
+    """
+
+    # Integer-coded interaction sequence (raises if no Pandas dataframe provided)
+    winner_codes, loser_codes = interaction_codes(self)
+
+    # Calendar day of every interaction
+    day_codes = None
+    if date_col is not None:
+        first_day, day_codes = interaction_days(self, date_col)
+
+    # Single Elo pass with trajectories
+    ratings, (winner_before, winner_after, loser_before, loser_after), daily = elo_trajectory_sequence(
+        winner_codes, loser_codes, len(self.indices), start_value=start_value, K=K,
+        normal_probability=normal_probability, day_codes=day_codes)
+
+    # Return trajectory dictionary
+    trajectory = {'elo': {i: round(rating, 4) for i, rating in zip(self.indices, ratings.tolist())},
+                  'winner_before': winner_before,
+                  'winner_after': winner_after,
+                  'loser_before': loser_before,
+                  'loser_after': loser_after}
+    if daily is not None:
+        trajectory['daily'] = pd.DataFrame(daily, columns=self.indices,
+                                           index=pd.date_range(first_day, periods=len(daily), freq='D')
+                                           if len(daily) > 0 else pd.DatetimeIndex([]))
+    return trajectory
+
+
+def optimize_elo_k(self, K_values=None, start_value: float = 1000, normal_probability: bool = False) -> dict:
+
+    """Maximum-likelihood estimate of the Elo K parameter from an interaction dataframe.
+
+    Parameters
+    ----------
+    :param K_values: list or np.ndarray
+        Grid of candidate K values, all evaluated in a single pass over the interactions. (None, K = 1, 2, ..., 300)
+    :param start_value: float
+        Parameter of the Elo function that determines the initial scores. (1000)
+    :param normal_probability: bool
+        Adjust the calculation of expected win/loss probabilities; default is Logistic,
+        the normal probabilities are calculated using standard normal tables. (False)
+
+    Returns
+    -------
+    results : dict
+        Dictionary with the best K ('K'), its log-likelihood ('log_likelihood'), the Elo ratings obtained with the
+        best K ('elo', rounded to 4 decimal places) and the log-likelihood of every candidate ('log_likelihoods').
+
+    Notes
+    -----
+    The probability that the observed winner wins an interaction is the expected score of the winner before the
+    interaction. The likelihood of a given K is the product of these probabilities over the interaction sequence and
+    the K with the highest likelihood is selected (Foerster et al, 2016). All individuals start with the same
+    start_value, so it cancels out of the rating differences and does not change the likelihood; it is kept as a
+    parameter only to report the ratings on the usual scale.
+
+    References
+    ----------
+    * Foerster, S., Franz, M., Murray, C. M., Gilby, I. C., Feldblum, J. T., Walker, K. K. & Pusey, A. E. 2016.
+      Chimpanzee females queue but males compete for social status. Scientific Reports, 6, 35404.
+      (DOI: 10.1038/srep35404)
+    """
+
+    # Candidate K values
+    if K_values is None:
+        K_values = np.arange(1, 301)
+    K_values = np.asarray(K_values, dtype='float64').ravel()
+    assert len(K_values) > 0 and (K_values >= 0).all()
+
+    # Evaluate all candidates in one pass (raises if no Pandas dataframe provided)
+    winner_codes, loser_codes = interaction_codes(self)
+    ratings, log_likelihood = elo_multi_k(winner_codes, loser_codes, len(self.indices), K_values,
+                                          start_value=start_value, normal_probability=normal_probability)
+
+    # Return best K with its ratings
+    best = int(np.argmax(log_likelihood))
+    results = {'K': K_values[best].item(),
+               'log_likelihood': round(log_likelihood[best].item(), 4),
+               'elo': {i: round(rating, 4) for i, rating in zip(self.indices, ratings[best].tolist())},
+               'log_likelihoods': {K: round(ll, 4) for K, ll in zip(K_values.tolist(), log_likelihood.tolist())}}
+    return results
@@ -0,0 +1,341 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.special import erfc
+from scipy.stats import rankdata
+
+# Number of interactions converted to Python integers at once in sequential passes
+_SEQUENCE_BLOCK_SIZE = 1000000
+
+
+def expected_scores(elo_diff, normal_probability: bool = False):
+
+    """Expected win probabilities of the winner and the loser for a given rating difference.
+
+    Works on scalars as well as on NumPy arrays of rating differences (winner - loser).
+    """
+
+    if normal_probability:
+        expected_winner = erfc(-elo_diff / ((2000 / 7) * (2 ** 0.5))) / 2
+        expected_loser = erfc(elo_diff / ((2000 / 7) * (2 ** 0.5))) / 2
+    else:
+        expected_winner = 1 / (1 + 10 ** ((-elo_diff) / 400))
+        expected_loser = 1 / (1 + 10 ** (elo_diff / 400))
+    return expected_winner, expected_loser
+
+
+def encode_interactions(winners, losers, indices) -> tuple:
+
+    """Integer-code winner and loser sequences against the ordered name sequence (indices).
+
+    Returns two int64 arrays of the same length as the interaction sequence.
+    """
+
+    name_index = pd.Index(indices)
+    winner_codes = name_index.get_indexer(winners).astype('int64')
+    loser_codes = name_index.get_indexer(losers).astype('int64')
+    if (winner_codes < 0).any() or (loser_codes < 0).any():
+        raise ValueError('Interaction sequence contains individuals that are not in the name sequence')
+    return winner_codes, loser_codes
+
+
+def matrix_interaction_codes(mat: np.ndarray) -> tuple:
+
+    """Expand an interaction matrix into compact winner and loser code arrays, one entry per interaction.
+
+    Only the nonzero cells are visited; each flat cell index is repeated by its interaction count and split into
+    row (winner) and column (loser) codes. Sparse matrices are expanded from their stored cells, in the same row-major
+    order as dense ones.
+    """
+
+    if sparse.issparse(mat):
+        coo_mat = sparse.coo_matrix(mat)
+        coo_mat.sum_duplicates()
+        cells = coo_mat.row.astype('int64') * mat.shape[0] + coo_mat.col
+        order = np.argsort(cells, kind='stable')
+        flat_codes = np.repeat(cells[order], coo_mat.data[order].astype('int64'))
+    else:
+        flat_mat = np.asarray(mat).ravel()
+        cells = np.flatnonzero(flat_mat)
+        flat_codes = np.repeat(cells, flat_mat[cells].astype('int64'))
+    winner_codes, loser_codes = np.divmod(flat_codes, mat.shape[0])
+    return winner_codes.astype('int32'), loser_codes.astype('int32')
+
+
+def permutation_batches(n_interactions: int, n: int, batch_size: int, rng: np.random.Generator):
+
+    """Yield (batch_size x n_interactions) permutation-index matrices until n permutations are drawn.
+
+    Permutations are drawn lazily, so only one batch is held in memory at a time. A batch is drawn in bulk from rng as
+    the argsort of uniform random keys.
+    """
+
+    for batch_start in range(0, n, batch_size):
+        n_batch = min(batch_size, n - batch_start)
+        yield np.argsort(rng.random((n_batch, n_interactions)), axis=1).astype('int32')
+
+
+def elo_sequence(winner_codes: np.ndarray, loser_codes: np.ndarray, n_individuals: int, start_value: float = 1000,
+                 K: float = 100, normal_probability: bool = False) -> np.ndarray:
+
+    """Sequential Elo update over integer-coded interactions.
+
+    The ratings are kept in a contiguous buffer and the interaction sequence is walked once, in order. The arithmetic
+    is identical to the row-wise implementation, so the ratings are identical as well. The codes are read in blocks,
+    so memory-mapped sequences are never fully loaded.
+    """
+
+    ratings = [start_value] * n_individuals
+    for block_start in range(0, len(winner_codes), _SEQUENCE_BLOCK_SIZE):
+        for winner, loser in zip(winner_codes[block_start:block_start + _SEQUENCE_BLOCK_SIZE].tolist(),
+                                 loser_codes[block_start:block_start + _SEQUENCE_BLOCK_SIZE].tolist()):
+            expected_winner, expected_loser = expected_scores(ratings[winner] - ratings[loser], normal_probability)
+            ratings[winner] += (K - K * expected_winner)
+            ratings[loser] += (-K * expected_loser)
+    return np.array(ratings, dtype='float64')
+
+
+def elo_trajectory_sequence(winner_codes: np.ndarray, loser_codes: np.ndarray, n_individuals: int,
+                            start_value: float = 1000, K: float = 100, normal_probability: bool = False,
+                            day_codes: np.ndarray = None) -> tuple:
+
+    """Sequential Elo update that also records the rating trajectory during the same pass.
+
+    The ratings of the winner and the loser before and after every interaction are written into preallocated float
+    arrays. If non-decreasing day codes (0 = first day) are given, a dense (n_days x n_individuals) matrix of the
+    ratings at the end of every day is filled as well; days without interactions repeat the previous ratings.
+    Returns the final ratings, the four trajectory arrays and the daily matrix (None without day codes).
+    """
+
+    n_interactions = len(winner_codes)
+    winner_before = np.empty(n_interactions, dtype='float64')
+    winner_after = np.empty(n_interactions, dtype='float64')
+    loser_before = np.empty(n_interactions, dtype='float64')
+    loser_after = np.empty(n_interactions, dtype='float64')
+    daily = None
+    if day_codes is not None:
+        daily = np.empty((int(day_codes[-1]) + 1 if n_interactions > 0 else 0, n_individuals), dtype='float64')
+        day_codes = day_codes.tolist()
+    current_day = 0
+
+    ratings = [start_value] * n_individuals
+    for idx, (winner, loser) in enumerate(zip(winner_codes.tolist(), loser_codes.tolist())):
+        if daily is not None and day_codes[idx] != current_day:
+            daily[current_day:day_codes[idx]] = ratings
+            current_day = day_codes[idx]
+        winner_before[idx], loser_before[idx] = ratings[winner], ratings[loser]
+        expected_winner, expected_loser = expected_scores(ratings[winner] - ratings[loser], normal_probability)
+        ratings[winner] += (K - K * expected_winner)
+        ratings[loser] += (-K * expected_loser)
+        winner_after[idx], loser_after[idx] = ratings[winner], ratings[loser]
+    if daily is not None and n_interactions > 0:
+        daily[current_day:] = ratings
+
+    return np.array(ratings, dtype='float64'), (winner_before, winner_after, loser_before, loser_after), daily
+
+
+def elo_stability_sequence(winner_codes: np.ndarray, loser_codes: np.ndarray, n_individuals: int,
+                           day_codes: np.ndarray, start_value: float = 1000, K: float = 100,
+                           normal_probability: bool = False, weighted: bool = True) -> tuple:
+
+    """Sequential Elo update that tracks the daily rank order for the stability index during the same pass.
+
+    At every change of (non-decreasing) day code, the ranks of the individuals present so far are compared between
+    the end of the previous observed day and the end of the current day. Returns, per observed day, the day code,
+    the (weighted) sum of absolute rank changes against the previous observed day and the number of individuals
+    present at the end of the day.
+    """
+
+    observed_days = np.unique(day_codes)
+    rank_change = np.zeros(len(observed_days), dtype='float64')
+    n_present = np.zeros(len(observed_days), dtype='int64')
+    present = np.zeros(n_individuals, dtype=bool)
+    previous_present = present.copy()
+    previous_ratings = None
+    ratings = [start_value] * n_individuals
+    day_idx = 0
+
+    def close_day():
+        if previous_ratings is not None and previous_present.any():
+            before = np.array(previous_ratings)[previous_present]
+            after = np.array(ratings)[previous_present]
+            changes = np.abs(rankdata(-before) - rankdata(-after))
+            if weighted:
+                spread = before.max() - before.min()
+                changes = changes * ((before - before.min()) / spread if spread > 0 else np.zeros_like(before))
+            rank_change[day_idx] = changes.sum()
+        n_present[day_idx] = present.sum()
+
+    day_codes = day_codes.tolist()
+    for idx, (winner, loser) in enumerate(zip(winner_codes.tolist(), loser_codes.tolist())):
+        if day_codes[idx] != observed_days[day_idx]:
+            close_day()
+            previous_ratings, previous_present = list(ratings), present.copy()
+            day_idx += 1
+        present[winner] = present[loser] = True
+        expected_winner, expected_loser = expected_scores(ratings[winner] - ratings[loser], normal_probability)
+        ratings[winner] += (K - K * expected_winner)
+        ratings[loser] += (-K * expected_loser)
+    if len(observed_days) > 0:
+        close_day()
+
+    return observed_days, rank_change, n_present
+
+
+def interaction_codes(hierarchia) -> tuple:
+
+    """Integer-coded interaction sequence of a Hierarchia object, computed once and kept on the object. Codes
+    buffered by :py:func:`_update.add_interactions` are appended here, once per read."""
+
+    if not hasattr(hierarchia, '_interaction_codes'):
+        if not hasattr(hierarchia, 'df'):
+            raise ValueError('Elo rating depends on sequence of wins/loses, computation uses Pandas dataframe, '
+                             'consider using randomized elo')
+        hierarchia._interaction_codes = encode_interactions(hierarchia.df[hierarchia.winner_col],
+                                                            hierarchia.df[hierarchia.loser_col],
+                                                            hierarchia.indices)
+    if len(getattr(hierarchia, '_pending_codes', [])) > 0:
+        hierarchia._interaction_codes = tuple(np.concatenate([codes] + [chunk[side] for chunk in
+                                                                        hierarchia._pending_codes])
+                                              for side, codes in enumerate(hierarchia._interaction_codes))
+        hierarchia._pending_codes = []
+    return hierarchia._interaction_codes
+
+
+def interaction_days(hierarchia, date_col: str) -> tuple:
+
+    """First calendar day and day codes (days since the first day) of the interactions of a Hierarchia object.
+
+    The interactions have to be in chronological order of the date column.
+    """
+
+    if not hasattr(hierarchia, 'df'):
+        raise ValueError('Dates of the interactions are read from the Pandas dataframe, Hierarchia objects created '
+                         'from a NumPy array or from a file have none; consider using the Pandas DataFrame '
+                         'initialization')
+    if date_col not in hierarchia.df.columns:
+        raise ValueError('Please provide a valid date column name')
+    days = pd.to_datetime(hierarchia.df[date_col]).dt.normalize()
+    if not days.is_monotonic_increasing:
+        raise ValueError('Interactions have to be in chronological order of the date column')
+    if len(days) == 0:
+        return None, np.zeros(0, dtype='int64')
+    return days.iloc[0], ((days - days.iloc[0]) // pd.Timedelta(days=1)).to_numpy(dtype='int64')
+
+
+def elo_permutations(winner_codes: np.ndarray, loser_codes: np.ndarray, n_individuals: int,
+                     permutations: np.ndarray, start_value: float = 1000, K: float = 100,
+                     normal_probability: bool = False) -> np.ndarray:
+
+    """Sequential Elo update for many orderings of the same interactions at once.
+
+    Each row of the (n_permutations x n_interactions) permutation-index matrix is one ordering of the interaction
+    sequence. All orderings are advanced through interaction step k together on an (n_permutations x n_individuals)
+    rating array, so the Python-level loop runs once per interaction instead of once per interaction and ordering.
+    """
+
+    ratings = np.full((permutations.shape[0], n_individuals), start_value, dtype='float64')
+    rows = np.arange(permutations.shape[0])
+    for step in range(permutations.shape[1]):
+        winners = winner_codes[permutations[:, step]]
+        losers = loser_codes[permutations[:, step]]
+        expected_winner, expected_loser = expected_scores(ratings[rows, winners] - ratings[rows, losers],
+                                                          normal_probability)
+        ratings[rows, winners] += (K - K * expected_winner)
+        ratings[rows, losers] += (-K * expected_loser)
+    return ratings
+
+
+class RatingAccumulator:
+
+    """Running summary of Elo ratings over random orders without storing every sample.
+
+    Mean and variance are accumulated with Welford's algorithm (batch-wise combination of Chan et al.). With ranks,
+    for every individual a histogram of its rank (0 = highest rating) over all orders is kept as well, so memory is
+    O(n_individuals^2) regardless of the number of orders; without, memory is O(n_individuals) and the rank
+    statistics are not available.
+    """
+
+    def __init__(self, n_individuals: int, ranks: bool = False):
+        self.count = 0
+        self.mean = np.zeros(n_individuals, dtype='float64')
+        self.m2 = np.zeros(n_individuals, dtype='float64')
+        self.rank_counts = np.zeros((n_individuals, n_individuals), dtype='int64') if ranks else None
+
+    def add(self, ratings: np.ndarray):
+
+        """Add a (n_orders x n_individuals) batch of ratings."""
+
+        n_batch = ratings.shape[0]
+        batch_mean = ratings.mean(axis=0)
+        batch_m2 = ((ratings - batch_mean) ** 2).sum(axis=0)
+        self._combine(n_batch, batch_mean, batch_m2)
+        if self.rank_counts is None:
+            return
+
+        # Rank histogram, ties are broken by the order of the name sequence
+        n_individuals = ratings.shape[1]
+        ranks = np.empty_like(ratings, dtype='int64')
+        ranks[np.arange(n_batch)[:, np.newaxis], np.argsort(-ratings, axis=1, kind='stable')] = \
+            np.arange(n_individuals)
+        self.rank_counts += np.bincount((np.arange(n_individuals) * n_individuals + ranks).ravel(),
+                                        minlength=n_individuals * n_individuals).reshape(n_individuals, n_individuals)
+
+    def merge(self, other):
+
+        """Merge another accumulator of the same individuals into this one."""
+
+        self._combine(other.count, other.mean, other.m2)
+        if self.rank_counts is not None:
+            self.rank_counts += other.rank_counts
+
+    def _combine(self, n_other: int, mean_other: np.ndarray, m2_other: np.ndarray):
+        if n_other == 0:
+            return
+        n_total = self.count + n_other
+        delta = mean_other - self.mean
+        self.mean = self.mean + delta * n_other / n_total
+        self.m2 = self.m2 + m2_other + delta ** 2 * self.count * n_other / n_total
+        self.count = n_total
+
+    @property
+    def sd(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    @property
+    def mean_rank(self) -> np.ndarray:
+        return (self.rank_counts * np.arange(1, self.rank_counts.shape[1] + 1)).sum(axis=1) / self.count
+
+    def rank_range(self, coverage: float = 0.95) -> tuple:
+
+        """Lower and upper rank (1 = highest) bounding the central <coverage> share of the rank distribution."""
+
+        cumulative = np.cumsum(self.rank_counts, axis=1) / self.count
+        lower = np.argmax(cumulative >= (1 - coverage) / 2, axis=1) + 1
+        upper = np.argmax(cumulative >= 1 - (1 - coverage) / 2 - 1e-12, axis=1) + 1
+        return lower, upper
+
+
+def elo_multi_k(winner_codes: np.ndarray, loser_codes: np.ndarray, n_individuals: int, K_values: np.ndarray,
+                start_value: float = 1000, normal_probability: bool = False) -> tuple:
+
+    """Sequential Elo update for a grid of K values in a single pass over the interactions.
+
+    An (n_K x n_individuals) rating array is advanced through the sequence, and the log-likelihood of the observed
+    outcomes (sum of the log expected win probabilities of the winners, before each update) is accumulated per K.
+    Returns the rating array and the log-likelihood vector.
+    """
+
+    K_values = np.asarray(K_values, dtype='float64')
+    ratings = np.full((len(K_values), n_individuals), start_value, dtype='float64')
+    log_likelihood = np.zeros(len(K_values), dtype='float64')
+    with np.errstate(divide='ignore'):
+        for winner, loser in zip(winner_codes.tolist(), loser_codes.tolist()):
+            expected_winner, expected_loser = expected_scores(ratings[:, winner] - ratings[:, loser],
+                                                              normal_probability)
+            log_likelihood += np.log(expected_winner)
+            ratings[:, winner] += (K_values - K_values * expected_winner)
+            ratings[:, loser] += (-K_values * expected_loser)
+    return ratings, log_likelihood
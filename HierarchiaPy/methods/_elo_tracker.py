@@ -0,0 +1,147 @@
+import numpy as np
+import json
+from ._elo_engine import elo_sequence, expected_scores, interaction_codes
+
+
+class EloTracker:
+
+    """Stateful Elo rating for live interaction feeds.
+
+    The tracker keeps the current rating of every individual and updates it with each new interaction in constant
+    time, so the cost of a new event does not depend on the length of the history. New individuals enter with the
+    start value when they first appear.
+
+    .. note::
+
+        A tracker is usually created from an existing Hierarchia object with :py:func:`_elo_tracker.elo_tracker`,
+        which replays the interaction history once. The state can be saved and restored with save() and load().
+
+    """
+
+    def __init__(self, start_value: float = 1000, K: float = 100, normal_probability: bool = False,
+                 indices=None, ratings=None, n_interactions: int = 0):
+
+        """Elo tracker with the given Elo parameters.
+
+        Parameters
+        ----------
+        :param start_value: float
+            Initial rating of every individual entering the tracker. (1000)
+        :param K: float
+            Factor that determines the speed at which ratings change after an interaction. (100)
+        :param normal_probability: bool
+            Use normal instead of logistic expected win/loss probabilities, see :py:func:`_elo.elo`. (False)
+        :param indices: list
+            Names of the individuals already known to the tracker. (None)
+        :param ratings: list
+            Current ratings of the individuals in indices, start_value for all if not provided. (None)
+        :param n_interactions: int
+            Number of interactions the ratings are based on. (0)
+        """
+
+        self.start_value = start_value
+        self.K = K
+        self.normal_probability = normal_probability
+        self.n_interactions = n_interactions
+        self._names = list(indices) if indices is not None else []
+        self._codes = {name: code for code, name in enumerate(self._names)}
+        if ratings is None:
+            self._ratings = [start_value] * len(self._names)
+        else:
+            self._ratings = [float(rating) for rating in ratings]
+            if len(self._ratings) != len(self._names):
+                raise ValueError('Ratings are not equal to the length of indices')
+
+    def _code(self, name) -> int:
+        if name not in self._codes:
+            self._codes[name] = len(self._names)
+            self._names.append(name)
+            self._ratings.append(self.start_value)
+        return self._codes[name]
+
+    def update(self, winner, loser):
+
+        """Update the ratings with a single interaction won by <winner> against <loser>."""
+
+        winner, loser = self._code(winner), self._code(loser)
+        expected_winner, expected_loser = expected_scores(self._ratings[winner] - self._ratings[loser],
+                                                          self.normal_probability)
+        self._ratings[winner] += (self.K - self.K * expected_winner)
+        self._ratings[loser] += (-self.K * expected_loser)
+        self.n_interactions += 1
+
+    def update_batch(self, winners, losers):
+
+        """Update the ratings with a sequence of interactions, in the given order."""
+
+        if len(winners) != len(losers):
+            raise ValueError('Winner and loser sequences are not equal in length')
+        for winner, loser in zip(winners, losers):
+            self.update(winner, loser)
+
+    def ratings(self) -> dict:
+
+        """Snapshot of the current ratings, keys are individual names and values are Elo scores (rounded to 4
+        decimal places)"""
+
+        return {name: round(rating, 4) for name, rating in zip(self._names, self._ratings)}
+
+    def save(self, path: str):
+
+        """Save the tracker state (parameters, names and ratings) to a JSON file."""
+
+        state = {'start_value': self.start_value,
+                 'K': self.K,
+                 'normal_probability': self.normal_probability,
+                 'n_interactions': self.n_interactions,
+                 'indices': [name.item() if isinstance(name, np.generic) else name for name in self._names],
+                 'ratings': self._ratings}
+        with open(path, 'w') as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path: str):
+
+        """Restore a tracker saved with save()."""
+
+        with open(path, 'r') as f:
+            state = json.load(f)
+        return cls(**state)
+
+
+def elo_tracker(self, start_value: float = 1000, K: float = 100, normal_probability: bool = False) -> EloTracker:
+
+    """Online Elo tracker seeded with the interaction history of the Hierarchia object.
+
+    Parameters
+    ----------
+    :param start_value: float
+        Parameter of the Elo function that determines the initial scores. (1000)
+    :param K: float
+        Parameter of the Elo function that acts as a factor and determines the speed at which scores change
+        after an interaction. (100)
+    :param normal_probability: bool
+        Adjust the calculation of expected win/loss probabilities; default is Logistic,
+        the normal probabilities are calculated using standard normal tables. (False)
+
+    Returns
+    -------
+    tracker : EloTracker
+        Tracker holding the Elo ratings after the interaction history, identical to :py:func:`_elo.elo`. New
+        interactions can be added with update() and update_batch(), ratings() returns the current ratings.
+
+    Notes
+    -----
+    The history is replayed once to seed the tracker. Afterwards, every new interaction costs a constant amount of
+    work, which suits continuously arriving observations (e.g. live dashboards) better than recomputing
+    :py:func:`_elo.elo` on the growing interaction dataframe.
+    """
+
+    # Replay the history (raises if no Pandas dataframe provided)
+    winner_codes, loser_codes = interaction_codes(self)
+    ratings = elo_sequence(winner_codes, loser_codes, len(self.indices), start_value=start_value, K=K,
+                           normal_probability=normal_probability)
+
+    # Return seeded tracker
+    return EloTracker(start_value=start_value, K=K, normal_probability=normal_probability, indices=self.indices,
+                      ratings=ratings.tolist(), n_interactions=len(winner_codes))
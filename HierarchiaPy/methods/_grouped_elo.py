@@ -0,0 +1,65 @@
+import pandas as pd
+from ._elo_engine import elo_sequence
+
+
+def grouped_elo(df: pd.DataFrame, group_col: str, winner_col: str, loser_col: str, start_value: float = 1000,
+                K: float = 100, normal_probability: bool = False) -> pd.DataFrame:
+
+    """Elo ratings of many social groups from a single interaction dataframe.
+
+    Parameters
+    ----------
+    :param df: pd.DataFrame
+        Interaction dataframe with one row per interaction, in chronological order within every group. Rows with a
+        missing group, winner or loser are skipped.
+    :param group_col: str
+        Name of the column identifying the social group of each interaction.
+    :param winner_col: str
+        Name of the column of winner individuals.
+    :param loser_col: str
+        Name of the column of loser individuals.
+    :param start_value: float
+        Parameter of the Elo function that determines the initial scores. (1000)
+    :param K: float
+        Parameter of the Elo function that acts as a factor and determines the speed at which scores change
+        after an interaction. (100)
+    :param normal_probability: bool
+        Adjust the calculation of expected win/loss probabilities; default is Logistic,
+        the normal probabilities are calculated using standard normal tables. (False)
+
+    Returns
+    -------
+    elo_df : pd.DataFrame
+        Tidy dataframe with the columns <group_col>, 'individual' and 'elo' (rounded to 4 decimal places), sorted by
+        group and individual. The ratings are identical to :py:func:`_elo.elo` of a Hierarchia object per group.
+
+    Notes
+    -----
+    Individuals are identified by their (group, name) pair, so the same name in two groups refers to two different
+    individuals. All pairs are integer-coded in one step and the interactions of all groups are run through a single
+    sequential Elo scan; as ratings only change within a group, this equals running Elo on every group separately
+    without the per-group Hierarchia overhead.
+    """
+
+    # Validate columns
+    for col in [group_col, winner_col, loser_col]:
+        if col not in df.columns:
+            raise ValueError('Please provide valid group, winner and/or loser column names')
+    df = df.dropna(subset=[group_col, winner_col, loser_col])
+
+    # Integer-code (group, individual) pairs of winners and losers together
+    pairs = pd.MultiIndex.from_arrays([pd.concat([df[group_col], df[group_col]], ignore_index=True),
+                                       pd.concat([df[winner_col], df[loser_col]], ignore_index=True)])
+    codes, uniques = pd.factorize(pairs)
+    codes = codes.astype('int64')
+
+    # Single sequential scan over all groups
+    ratings = elo_sequence(codes[:len(df)], codes[len(df):], len(uniques), start_value=start_value, K=K,
+                           normal_probability=normal_probability)
+
+    # Return tidy dataframe
+    elo_df = pd.DataFrame({group_col: uniques.get_level_values(0),
+                           'individual': uniques.get_level_values(1),
+                           'elo': [round(rating, 4) for rating in ratings.tolist()]})
+    elo_df = elo_df.sort_values([group_col, 'individual'], kind='stable').reset_index(drop=True)
+    return elo_df
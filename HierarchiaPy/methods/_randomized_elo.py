@@ -1,9 +1,34 @@
 import numpy as np
-import pandas as pd
-from scipy.special import erfc
+import warnings
+from ._elo_engine import RatingAccumulator, elo_permutations, matrix_interaction_codes, permutation_batches
+from ..utilities._cache import result_key, cached_result, store_result
+from ..utilities._parallel import map_blocks, randomization_blocks
 
+# Upper bound of permutation-index entries held in memory at once
+_PERMUTATION_BATCH_ELEMENTS = 2 ** 22
 
-def randomized_elo(self, start_value: float = 1000, K: float = 100, n: int = 1000, normal_probability: bool = False) -> dict:
+# Default upper bound of random orders per batch, every batch is one random stream (and one parallel task)
+_RANDOM_ORDER_BATCH_SIZE = 500
+
+# Default number of random orders per batch when checking for convergence
+_CONVERGENCE_BATCH_SIZE = 100
+
+
+def _random_elo_batch(batch_size: int, seed, winner_codes: np.ndarray, loser_codes: np.ndarray, n_individuals: int,
+                      start_value: float, K: float, normal_probability: bool, ranks: bool) -> RatingAccumulator:
+
+    # Rating summary (with rank histogram if ranks) of batch_size random orders drawn with the seed
+    rng = np.random.default_rng(seed)
+    accumulator = RatingAccumulator(n_individuals, ranks=ranks)
+    for permutations in permutation_batches(len(winner_codes), batch_size, batch_size, rng=rng):
+        accumulator.add(elo_permutations(winner_codes, loser_codes, n_individuals, permutations,
+                                         start_value=start_value, K=K, normal_probability=normal_probability))
+    return accumulator
+
+
+def randomized_elo(self, start_value: float = 1000, K: float = 100, n: int = 1000, normal_probability: bool = False,
+                   batch_size: int = None, uncertainty: bool = False, tol: float = None,
+                   convergence: str = 'rating', n_jobs: int = 1, random_state=None) -> dict:
 
     """Randomized Elo rating from an interaction dataframe/matrix.
 
@@ -14,7 +39,7 @@ def randomized_elo(self, start_value: float = 1000, K: float = 100, n: int = 100
         an effect on relative differences after the calculation. (1000)
     :param K: float
         Parameter of the Elo function that acts as a factor and determines the speed at which scores change
-        after an interaction. Optimization might be a good idea but not implemented yet. (100)
+        after an interaction. See optimize_elo_k for a maximum-likelihood estimate of K. (100)
     :param n: integer
         Parameter to adjust number of iterations for random ordering. Higher numbers result in more stable Elo ratings.
         The number of random orders. (1000)
@@ -22,12 +47,39 @@ def randomized_elo(self, start_value: float = 1000, K: float = 100, n: int = 100
         Adjust the calculation of expected win/loss probabilities; default is Logistic,
         the normal probabilities are calculated using standard normal tables. For normalised probabilities,
         refer to https://handbook.fide.com (False)
+    :param batch_size: int
+        Number of random orders drawn and computed together. Peak memory is batch_size x number of interactions
+        integers; by default it is chosen so that about 4 million permutation indices (and at most 500 random
+        orders) are held at once. Every batch has its own random stream and is the unit of parallel work, use
+        smaller batches to spread few random orders across more workers. (None)
+    :param uncertainty: bool
+        Return the uncertainty of the ratings as well: their standard deviation, the mean rank and the range of ranks
+        over the random orders. The rank histogram behind the rank statistics needs memory quadratic in the number of
+        individuals and is only kept if uncertainty is True (or ranks are checked for convergence). Implied by tol.
+        (False)
+    :param tol: float
+        Convergence tolerance. If provided, random orders are drawn batch by batch until the mean ratings (or mean
+        ranks, see convergence) change by less than tol between consecutive batches, n being the maximum number of
+        random orders; a RuntimeWarning is raised if they do not converge within n. The result is then returned as
+        with uncertainty True, its 'count' is the number of random orders used. (None)
+    :param convergence: str
+        Statistic checked for convergence with tol. Valid arguments are 'rating' (mean Elo ratings) and 'rank' (mean
+        ranks). ('rating')
+    :param n_jobs: int
+        Number of worker processes the batches of random orders are split across, -1 uses all CPUs. (1)
+    :param random_state: int, np.random.SeedSequence or np.random.Generator
+        Seed of the random orders. Results are identical for a given seed and batch_size whatever the number of
+        workers, and results of integer seeds are cached on the object; the global NumPy random state seeds the random
+        orders if not provided. (None)
     
     Returns
     -------
     randomized_elo_dict : dict
         Randomized Elo ratings, keys are individual names derived from either the Dataframe or name sequence (user 
         provided, see class module for more details) and values are Randomized Elo scores (rounded to 4 decimal places)
+        If uncertainty is True or tol is provided, a dictionary with keys 'elo' (mean ratings), 'sd', 'mean_rank',
+        'rank_range' (lower and upper rank, 1 being the highest) each mapping individual names to values, and 'count'
+        (number of random orders used)
     
     See also
     --------
@@ -53,39 +105,58 @@ def randomized_elo(self, start_value: float = 1000, K: float = 100, n: int = 100
       bioRxiv. 111146. 10.1101/111146.
     """
 
-    # Transform matrix to df
-    interactions = np.array([[self.indices[ix], self.indices[iy]] for ix, iy in np.ndindex(self.mat.shape)
-                             for _ in range(int(self.mat[ix, iy]))])
-    df = pd.DataFrame({'winner_col': interactions[:, 0], 'loser_col': interactions[:, 1]})
+    # Assertions
+    assert convergence in ['rating', 'rank']
+    assert tol is None or tol > 0
+    uncertainty = uncertainty or tol is not None
 
-    # Initialize elo dictionary
-    elo_dict_master = {i: [] for i in self.indices}
+    # Cached result of seeded random orders
+    key = result_key('randomized_elo', random_state, start_value, K, n, normal_probability, batch_size, uncertainty,
+                     tol, convergence)
+    randomized_elo_dict = cached_result(self, key)
+    if randomized_elo_dict is not None:
+        return randomized_elo_dict
 
-    # Iterate n times
-    for _ in range(n):
-        random_df = df.sample(frac=1)
-        elo_dict_temp = {i: start_value for i in self.indices}
+    # Transform matrix to integer-coded interactions
+    winner_codes, loser_codes = matrix_interaction_codes(self.mat)
+    if batch_size is None:
+        batch_size = max(1, min(n, _RANDOM_ORDER_BATCH_SIZE, _PERMUTATION_BATCH_ELEMENTS // max(1, len(winner_codes))))
+        if tol is not None:
+            batch_size = min(batch_size, _CONVERGENCE_BATCH_SIZE)
 
-        for idx, row in random_df.iterrows():
+    # Advance each batch of random orders through the interaction sequence together (optionally in parallel), the
+    # batch summaries are merged in batch order; ranks are only tracked when they are reported or checked
+    ranks = uncertainty or convergence == 'rank'
+    accumulator = RatingAccumulator(len(self.indices), ranks=ranks)
+    previous_state = None
+    converged = False
+    for batch_accumulator in map_blocks(_random_elo_batch, randomization_blocks(n, batch_size),
+                                        random_state=random_state, n_jobs=n_jobs,
+                                        args=(winner_codes, loser_codes, len(self.indices), start_value, K,
+                                              normal_probability, ranks)):
+        accumulator.merge(batch_accumulator)
 
-            elo_diff = elo_dict_temp[row['winner_col']] - elo_dict_temp[row['loser_col']]
-            if normal_probability:
-                expected_winner = erfc(-elo_diff / ((2000 / 7) * (2 ** 0.5))) / 2
-                expected_loser = erfc(elo_diff / ((2000 / 7) * (2 ** 0.5))) / 2
-            else:
-                expected_winner = 1 / (1 + 10 ** ((-elo_diff) / 400))
-                expected_loser = 1 / (1 + 10 ** (elo_diff / 400))
+        # Stop once the mean ratings/ranks are stable between consecutive batches
+        if tol is not None:
+            state = accumulator.mean.copy() if convergence == 'rating' else accumulator.mean_rank
+            if previous_state is not None and np.max(np.abs(state - previous_state)) < tol:
+                converged = True
+                break
+            previous_state = state
 
-            elo_dict_temp[row['winner_col']] += (K - K * expected_winner)
-            elo_dict_temp[row['loser_col']] += (-K * expected_loser)
+    if tol is not None and not converged:
+        warnings.warn('Randomized Elo did not converge within ' + str(n) + ' random orders, consider increasing n',
+                      RuntimeWarning)
 
-        for key in elo_dict_temp:
-            elo_dict_master[key].append(elo_dict_temp[key])
-
-    # Take the average of the elo ratings (n times)
-    for key in elo_dict_master:
-        elo_dict_master[key] = sum(elo_dict_master[key]) / len(elo_dict_master[key])
-    
     # Return randomized Elo dictionary
-    randomized_elo_dict = {key: round(elo_dict_master[key], 4) for key in elo_dict_master}
-    return randomized_elo_dict
+    randomized_elo_dict = {i: round(rating, 4) for i, rating in zip(self.indices, accumulator.mean.tolist())}
+    if uncertainty:
+        rank_lower, rank_upper = accumulator.rank_range(0.95)
+        randomized_elo_dict = {
+            'elo': randomized_elo_dict,
+            'sd': {i: round(sd, 4) for i, sd in zip(self.indices, accumulator.sd.tolist())},
+            'mean_rank': {i: round(rank, 4) for i, rank in zip(self.indices, accumulator.mean_rank.tolist())},
+            'rank_range': {i: (lower, upper) for i, lower, upper in
+                           zip(self.indices, rank_lower.tolist(), rank_upper.tolist())},
+            'count': accumulator.count}
+    return store_result(self, key, randomized_elo_dict)
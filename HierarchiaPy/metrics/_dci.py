@@ -1,4 +1,6 @@
 import numpy as np
+from ..utilities._derived import float_matrix
+from ..utilities._sparse import is_sparse, offdiagonal
 
 
 def dci(self) -> float:
@@ -23,9 +25,13 @@ def dci(self) -> float:
     """
     
     # Calculate DCI
-    mat = self.mat.astype('float64')
-    np.fill_diagonal(mat, np.nan)
-    dc_index = round(np.nansum(np.abs(mat - np.transpose(mat))) / 2 / np.nansum(mat), 4)
+    if is_sparse(self.mat):
+        mat = offdiagonal(self.mat)
+        dc_index = round(abs(mat - mat.T).sum() / 2 / mat.sum(), 4)
+    else:
+        mat = float_matrix(self).copy()
+        np.fill_diagonal(mat, np.nan)
+        dc_index = round(np.nansum(np.abs(mat - np.transpose(mat))) / 2 / np.nansum(mat), 4)
     
     # Return statement
     return dc_index
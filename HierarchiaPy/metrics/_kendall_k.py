@@ -2,42 +2,99 @@ from scipy.stats.distributions import chi2
 from itertools import *
 import numpy as np
 import warnings
+from ..utilities._cache import result_key, cached_result, store_result
+from ..utilities._derived import float_matrix, dominance_matrix
+from ..utilities._dyads import dominance_relations, dyad_states
+from ..utilities._null_store import null_path, stored_null
+from ..utilities._parallel import map_blocks, randomization_blocks
+from ..utilities._sequential import sequential_blocks
 
+# Number of matrix elements drawn at once for the empirical CDF
+_ECDF_BATCH_ELEMENTS = 2 ** 22
 
-def get_ecdf(n, runs=100000):
+# Number of random matrices per random stream of the empirical CDF
+_ECDF_BLOCK_SIZE = 10000
+
+# Default seed of the stored null distributions of d
+KENDALL_NULL_SEED = 0
+
+
+def _random_d(runs: int, seed, n: int) -> np.ndarray:
+
+    # Circular dyads (d) of runs random n x n matrices drawn with the seed, drawn and binarized in batches
+    rng = np.random.default_rng(seed)
+    d_values = np.empty(runs, dtype='float64')
+    batch_size = max(1, _ECDF_BATCH_ELEMENTS // (n * n))
+    diagonal = np.arange(n)
+    for batch_start in range(0, runs, batch_size):
+        mat = rng.integers(0, 1000, size=(min(batch_size, runs - batch_start), n, n)).astype('float64')
+        mat[:, diagonal, diagonal] = 0
+        mat = dominance_relations(mat, tie_value=0.5)
+        d_values[batch_start:batch_start + len(mat)] = ((n * (n - 1) * (2 * n - 1)) / 12) - (
+            0.5 * np.sum(np.sum(mat, axis=2) ** 2, axis=1))
+    return d_values
+
+
+def ecdf_samples(n, runs=100000, n_jobs=1, random_state=None, alpha=None, d=None):
+
+    # Circular dyads (d) of random matrices drawn in blocks with independent random streams (optionally in parallel).
+    # With alpha and an observed d, blocks are drawn until the p-value P(random d <= d) is decided at alpha
+    blocks = map_blocks(_random_d, randomization_blocks(runs, _ECDF_BLOCK_SIZE), random_state=random_state,
+                        n_jobs=n_jobs, args=(n,))
+    if d is None:
+        alpha = None
+    return np.concatenate(list(sequential_blocks(blocks, lambda d_values: (np.sum(d_values <= d), len(d_values)),
+                                                 alpha=alpha)))
+
+
+def ecdf_dict(d_master):
 
     # Parameter initialization
     results = {}
-    d_master = []
-
-    # Loop to calculate empirical CDF
-    for _ in range(runs):
-        mat = np.random.randint(0, 1000, size=(n, n)).astype('float64')
-        np.fill_diagonal(mat, 0)
-        for idx in range(mat.shape[0]):
-            for idy in range(idx + 1, mat.shape[0]):
-                if mat[idx, idy] == mat[idy, idx]:
-                    mat[idx, idy] = 0.5
-                    mat[idy, idx] = 0.5
-                elif mat[idx, idy] > mat[idy, idx]:
-                    mat[idx, idy] = 1
-                    mat[idy, idx] = 0
-                else:
-                    mat[idx, idy] = 0
-                    mat[idy, idx] = 1
-        d_master.append(((n * (n - 1) * (2 * n - 1)) / 12) - (0.5 * np.sum(np.sum(mat, axis=1) ** 2, axis=0)))
-
-    # Calculate result dict
-    sorted_d_master = np.sort(np.array(d_master))
-    for d_idx in np.unique(sorted_d_master):
-        if len(np.argwhere(sorted_d_master == d_idx)) > 0:
-            results[d_idx] = round((np.argwhere(sorted_d_master == d_idx)[-1] / runs)[0], 3)
+
+    # Calculate result dict (share of samples up to the last occurrence of every d)
+    sorted_d_master = np.sort(d_master)
+    unique_d = np.unique(sorted_d_master)
+    last_indices = np.searchsorted(sorted_d_master, unique_d, side='right') - 1
+    for d_idx, last_idx in zip(unique_d, last_indices):
+        results[d_idx] = round(last_idx / len(d_master), 3)
 
     # Return statement
     return results
 
 
-def kendall_k(self, odd_K: bool = False) -> dict:
+def get_ecdf(n, runs=100000, n_jobs=1, random_state=None, alpha=None, d=None):
+
+    # Calculate empirical CDF
+    return ecdf_dict(ecdf_samples(n, runs=runs, n_jobs=n_jobs, random_state=random_state, alpha=alpha, d=d))
+
+
+def kendall_null(n: int, runs: int = 100000, seed: int = KENDALL_NULL_SEED, n_jobs: int = 1) -> np.ndarray:
+
+    """Sorted null distribution of d for n individuals from the on-disk null store (memory-mapped, read-only).
+
+    The distribution of runs random matrices drawn with the seed is computed on the first request and stored in the
+    cache directory ($HIERARCHIAPY_CACHE_DIR or ~/.cache/HierarchiaPy), see :py:func:`_null_store.stored_null`.
+    """
+
+    return stored_null('kendall_d', n, runs, seed,
+                       lambda: np.sort(ecdf_samples(n, runs=runs, n_jobs=n_jobs, random_state=seed)))
+
+
+def precompute_kendall_nulls(sizes, runs: int = 100000, seed: int = KENDALL_NULL_SEED, n_jobs: int = 1) -> list:
+
+    """Compute and store the null distributions of d for all group sizes (see :py:func:`kendall_null`), returns the
+    paths of the stored files."""
+
+    paths = []
+    for n in sizes:
+        kendall_null(n, runs=runs, seed=seed, n_jobs=n_jobs)
+        paths.append(null_path('kendall_d', n, runs, seed))
+    return paths
+
+
+def kendall_k(self, odd_K: bool = False, n_jobs: int = 1, random_state=None, alpha: float = None,
+              null_store: bool = False) -> dict:
 
     """Function to calculate of circular dyads (d), Kendall K (coefficient K) and statistical tests of linearity
 
@@ -45,6 +102,20 @@ def kendall_k(self, odd_K: bool = False) -> dict:
     ----------
     :param odd_K: bool
         Parameter to use odd N formula irrespective of the actual number of animals. For details see notes. (False)
+    :param n_jobs: int
+        Number of worker processes the random matrices of the ECDF are split across, -1 uses all CPUs. (1)
+    :param random_state: int, np.random.SeedSequence or np.random.Generator
+        Seed of the random matrices of the ECDF. Results are identical for a given seed whatever the number of
+        workers, and results of integer seeds are cached on the object; the global NumPy random state seeds the ECDF
+        if not provided. (None)
+    :param alpha: float
+        Significance level of sequential testing. If provided, random matrices of the ECDF are drawn in blocks of
+        10,000 until the 99% Clopper-Pearson interval of the ECDF p-value of d lies entirely below or above alpha,
+        100,000 being the maximum number of random matrices. All random matrices are used if not provided. (None)
+    :param null_store: bool
+        Use the on-disk store of null distributions of d (see :py:func:`kendall_null`), computed once per group size
+        and seed and memory-mapped afterwards, so repeated calls do not draw random matrices. The integer
+        random_state is the seed of the stored distribution (0 if not provided) and alpha is ignored. (False)
 
     Returns
     -------
@@ -53,6 +124,7 @@ def kendall_k(self, odd_K: bool = False) -> dict:
         cannot be used so that ECDF is calculated. The result dictionary contains unbiased d, unbiased p-value (ECDF),
          coefficient K and unbiased coefficient K. If N >= 10 then the result dictionary contains chi-square statistic,
          degree of freedom and p-value (chi-square) else these are equal to None. (rounded to 4 decimal places)
+         'ecdf_count' is the number of random matrices of the ECDF.
 
     See also
     --------
@@ -77,38 +149,43 @@ def kendall_k(self, odd_K: bool = False) -> dict:
     * de Vries, H.1995. An improved test of linearity in dominance hierarchies containing unknown or tied relationships. Animal Behaviour, 50,1375e1389.
     """
 
+    # Cached result of a seeded ECDF
+    assert alpha is None or 0 < alpha < 1
+    assert not null_store or random_state is None or isinstance(random_state, (int, np.integer))
+    key = result_key('kendall_k', random_state, odd_K, alpha, null_store)
+    results = cached_result(self, key)
+    if results is not None:
+        return results
+
     # Parameter initialization
     results = {}
     initial_ecdf_samples = 100000
-    mat = self.mat.astype('float64')
-
-    # Matrix manipulation
-    for idx in range(mat.shape[0]):
-        for idy in range(idx + 1, mat.shape[0]):
-            if mat[idx, idy] == mat[idy, idx]:
-                mat[idx, idy] = 0.5
-                mat[idy, idx] = 0.5
-            elif mat[idx, idy] > mat[idy, idx]:
-                mat[idx, idy] = 1
-                mat[idy, idx] = 0
-            else:
-                mat[idx, idy] = 0
-                mat[idy, idx] = 1
+
+    # Matrix manipulation (ties and unknown relationships count half)
+    mat = dominance_matrix(self, tie_value=0.5)
 
     # Calculate d
     results['d'] = ((mat.shape[0] * (mat.shape[0] - 1) * (2 * mat.shape[0] - 1)) / 12) - (0.5 * np.sum(
         np.sum(mat, axis=1) ** 2, axis=0))
 
+    # Null distribution of d, from the null store or drawn (sequentially if alpha is provided)
+    def null_d(runs, **kwargs):
+        if null_store:
+            null_seed = KENDALL_NULL_SEED if random_state is None else int(random_state)
+            return kendall_null(mat.shape[0], runs=runs, seed=null_seed, n_jobs=n_jobs)
+        return ecdf_samples(mat.shape[0], runs=runs, n_jobs=n_jobs, random_state=random_state, **kwargs)
+
     # Calculate ECDF
-    ecdf_dict = get_ecdf(mat.shape[0], runs=initial_ecdf_samples)
-    if results['d'] in ecdf_dict:
-        results['ecdf_p_value'] = ecdf_dict[results['d']]
-    else:
+    d_samples = null_d(initial_ecdf_samples, alpha=alpha, d=results['d'])
+    ecdf = ecdf_dict(d_samples)
+    if results['d'] not in ecdf:
         print(str(initial_ecdf_samples) + ' samples for ECDF not enough for calculations, '
               'new ECDF is calculating with 10x new samples.')
         initial_ecdf_samples *= 10
-        ecdf_dict = get_ecdf(mat.shape[0], runs=initial_ecdf_samples)
-        results['ecdf_p_value'] = ecdf_dict[results['d']]
+        d_samples = null_d(initial_ecdf_samples)
+        ecdf = ecdf_dict(d_samples)
+    results['ecdf_p_value'] = ecdf[results['d']]
+    results['ecdf_count'] = len(d_samples)
 
     # Chi-square approximation
     if mat.shape[0] < 10:
@@ -123,25 +200,9 @@ def kendall_k(self, odd_K: bool = False) -> dict:
                                                       - results['d'] + 0.5) + results['chi_sq_df']
         results['chi_sq_p_value'] = chi2.sf(results['chi_sq'], results['chi_sq_df'])
 
-    # Unbiased calculation using permutations
-    mat = self.mat.astype('float64')
-    unknown_triangle_upper = []
-    for idx in range(mat.shape[0]):
-        for idy in range(idx + 1, mat.shape[0]):
-            if mat[idx, idy] == mat[idy, idx] == 0:
-                unknown_triangle_upper.append((idx, idy))
-
-    for idx in range(mat.shape[0]):
-        for idy in range(idx + 1, mat.shape[0]):
-            if mat[idx, idy] == mat[idy, idx] != 0:
-                mat[idx, idy] = 0.5
-                mat[idy, idx] = 0.5
-            elif mat[idx, idy] > mat[idy, idx]:
-                mat[idx, idy] = 1
-                mat[idy, idx] = 0
-            else:
-                mat[idx, idy] = 0
-                mat[idy, idx] = 1
+    # Unbiased calculation using permutations (unknown relationships are set by every permutation)
+    rows, cols, _, _, _, unknown = dyad_states(float_matrix(self))
+    unknown_triangle_upper = list(zip(rows[unknown].tolist(), cols[unknown].tolist()))
 
     # Compute permutations for unknown relationships
     print('Computing, ' + str(2 ** len(unknown_triangle_upper)) + ' possible matrices for unknown relationships...')
@@ -156,14 +217,14 @@ def kendall_k(self, odd_K: bool = False) -> dict:
         temp_d = ((temp_mat.shape[0] * (temp_mat.shape[0] - 1) * (2 * temp_mat.shape[0] - 1)) / 12) - (0.5 * np.sum(
             np.sum(temp_mat, axis=1) ** 2, axis=0))
         d_arr.append(temp_d)
-        if temp_d in ecdf_dict:
-            p_arr.append(ecdf_dict[temp_d])
+        if temp_d in ecdf:
+            p_arr.append(ecdf[temp_d])
         else:
             print(str(initial_ecdf_samples) + ' samples for ECDF was enough for calculations, '
                                               'new ECDF is calculating with 10x new samples.')
             initial_ecdf_samples *= 10
-            ecdf_dict = get_ecdf(mat.shape[0], runs=1000000)
-            p_arr.append(ecdf_dict[temp_d])
+            ecdf = ecdf_dict(null_d(1000000))
+            p_arr.append(ecdf[temp_d])
 
     results['unbiased_d'] = sum(d_arr)/len(d_arr)
     results['unbiased_p_ecdf'] = sum(p_arr)/len(p_arr)
@@ -176,4 +237,4 @@ def kendall_k(self, odd_K: bool = False) -> dict:
         results['unbiased_K'] = 1 - ((24 * results['unbiased_d']) / (mat.shape[0] ** 3 - 4 * mat.shape[0]))
 
     # Return statement
-    return results
+    return store_result(self, key, results)
@@ -1,9 +1,68 @@
 import numpy as np
+from scipy import sparse
 import warnings
+from ..utilities._cache import result_key, cached_result, store_result
+from ..utilities._derived import float_matrix, dominance_matrix
+from ..utilities._dyads import dominance_relations, dyad_states
+from ..utilities._parallel import map_blocks, randomization_blocks
+from ..utilities._sequential import sequential_blocks
+
+
+# Default memory budget of the random dyads drawn at once (bytes)
+_LANDAU_MAX_BYTES = 2 ** 28
+
+
+def _landau_h_values(row_sums: np.ndarray) -> np.ndarray:
+
+    # Landau h of every row of a (matrices x N) array of row sums
+    size = row_sums.shape[1]
+    return (12 / ((size ** 3) - size)) * np.sum(((row_sums - ((size - 1) / 2)) ** 2), axis=1)
+
+
+def _random_row_sums(rng: np.random.Generator, n_rows: int, fixed_row_sums: np.ndarray, rows: np.ndarray,
+                     cols: np.ndarray) -> np.ndarray:
+
+    # Row sums of n_rows binarized matrices with fixed row sums and a random winner for every dyad (rows, cols): the
+    # column individual gets the win unless the row individual wins, i.e. row_sums = fixed + cols count + wins @ D
+    # with D the (dyads x N) incidence matrix of +1 for rows and -1 for cols
+    wins = rng.integers(0, 2, size=(n_rows, len(rows)))
+    incidence = sparse.csr_matrix((np.concatenate([np.ones(len(rows)), -np.ones(len(cols))]),
+                                   (np.concatenate([rows, cols]), np.tile(np.arange(len(rows)), 2))),
+                                  shape=(len(fixed_row_sums), len(rows)))
+    base_row_sums = fixed_row_sums + np.bincount(cols, minlength=len(fixed_row_sums))
+    return base_row_sums + np.asarray(incidence @ wins.T).T
+
+
+def _random_landau_h(n_random: int, seed, mat: np.ndarray, max_bytes: int) -> tuple:
+
+    # h' of n_random matrices with random tie breaking and h of n_random fully random matrices, drawn with the seed.
+    # Only row sums are simulated: known dyads give fixed row sums and only the random dyads are drawn, in chunks
+    tie_rng, random_rng = [np.random.default_rng(child_seed) for child_seed in seed.spawn(2)]
+    rows, cols, _, _, _, unknown = dyad_states(mat)
+    diagonal = np.diagonal(mat)
+
+    # Fixed row sums: known dyads count 1 for the winner, ties 0.5 for both individuals (diagonal kept)
+    relations = dominance_relations(mat, tie_value=0.5)
+    relations[rows[unknown], cols[unknown]] = relations[cols[unknown], rows[unknown]] = 0
+    fixed_row_sums = np.sum(relations, axis=1)
+
+    # Row sums of the random matrices in chunks within the memory budget (row-major draws, so the draws do not depend
+    # on the chunk size)
+    improved_landau_h = np.empty(n_random, dtype='float64')
+    improved_landau_h_right = np.empty(n_random, dtype='float64')
+    chunk_size = max(1, int(max_bytes // (3 * 8 * max(1, len(rows)))))
+    for chunk_start in range(0, n_random, chunk_size):
+        n_rows = min(chunk_size, n_random - chunk_start)
+        improved_landau_h[chunk_start:chunk_start + n_rows] = _landau_h_values(
+            _random_row_sums(tie_rng, n_rows, fixed_row_sums, rows[unknown], cols[unknown]))
+        improved_landau_h_right[chunk_start:chunk_start + n_rows] = _landau_h_values(
+            _random_row_sums(random_rng, n_rows, diagonal, rows, cols))
+    return improved_landau_h, improved_landau_h_right
 
 
 # noinspection PyTypeChecker
-def landau_h(self, improved: bool = True, n_random: int = 10000) -> dict:
+def landau_h(self, improved: bool = True, n_random: int = 10000, n_jobs: int = 1, random_state=None,
+             max_bytes: int = _LANDAU_MAX_BYTES, alpha: float = None) -> dict:
     """Function to calculate Landau h, improved Landau h (h') and statistical tests of linearity
 
       Parameters
@@ -13,13 +72,27 @@ def landau_h(self, improved: bool = True, n_random: int = 10000) -> dict:
       :param n_random: int
         If improved version is calculated, it is the parameter to determine number of random matrices to calculate
         h' and corresponding p-values.
+      :param n_jobs: int
+        Number of worker processes the random matrices are split across, -1 uses all CPUs. (1)
+      :param random_state: int, np.random.SeedSequence or np.random.Generator
+        Seed of the random matrices. Results are identical for a given seed whatever the number of workers, and
+        results of integer seeds are cached on the object; the global NumPy random state seeds the test if not
+        provided. (None)
+      :param max_bytes: int
+        Memory budget of the random dyads drawn at once (per worker) in bytes. Only the row sums of the random
+        matrices are simulated, in chunks that fit into the budget; the results do not depend on it. (2 ** 28)
+      :param alpha: float
+        Significance level of sequential testing. If provided, random matrices are drawn in blocks of 1000 until the
+        99% Clopper-Pearson interval of the right p-value lies entirely below or above alpha, n_random being the
+        maximum number of random matrices. All n_random random matrices are used if not provided. (None)
 
       Returns
       -------
       results : dict
           The result dictionary depends on the argument <improved>, the original version (improved=False) return a
           dictionary with single key named 'Landau_h'. If the improved version is asked (improved=True), the improved
-          version of the Landau h (h') is returned with right and left p-values.
+          version of the Landau h (h') is returned with right and left p-values and the number of random matrices
+          used ('count').
 
       References
       ----------
@@ -30,34 +103,15 @@ def landau_h(self, improved: bool = True, n_random: int = 10000) -> dict:
       """
 
     # Matrix manipulation
-    mat = self.mat.astype('float64')
+    mat = float_matrix(self)
 
     # Original version
     if not improved:
-        check_mat = False
-        temp_mat = mat.copy()
-        for idx in range(temp_mat.shape[0]):
-            for idy in range(idx + 1, temp_mat.shape[0]):
-                if temp_mat[idx, idy] == temp_mat[idy, idx] == 0:
-                    check_mat = True
-                    break
-        if check_mat:
+        if dyad_states(mat)[5].any():
             warnings.warn("Original Landau's h needs all relationships to be known. Consider using improved version.")
             return {'Landau_h': None}
         else:
-            temp_mat = mat.copy()
-            for idx in range(temp_mat.shape[0]):
-                for idy in range(idx + 1, temp_mat.shape[0]):
-                    if temp_mat[idx, idy] == temp_mat[idy, idx]:
-                        temp_mat[idx, idy] = 1 / 2
-                        temp_mat[idy, idx] = 1 / 2
-                    elif temp_mat[idx, idy] > temp_mat[idy, idx]:
-                        temp_mat[idx, idy] = 1
-                        temp_mat[idy, idx] = 0
-                    else:
-                        temp_mat[idx, idy] = 0
-                        temp_mat[idy, idx] = 1
-
+            temp_mat = dominance_matrix(self, tie_value=0.5)
             row_sums = np.sum(temp_mat, axis=1)
             landaus_h = (12 / ((temp_mat.shape[0] ** 3) - temp_mat.shape[0])) * np.sum(
                 ((row_sums - ((len(row_sums) - 1) / 2)) ** 2), axis=0)
@@ -67,45 +121,29 @@ def landau_h(self, improved: bool = True, n_random: int = 10000) -> dict:
 
     # Improved version
     if improved:
-        upper_indices = np.triu_indices_from(mat, k=1)
-        higher_indices = np.where(mat[upper_indices] > mat[upper_indices[1], upper_indices[0]])[0]
-        lower_indices = np.where(mat[upper_indices] < mat[upper_indices[1], upper_indices[0]])[0]
-        equal_indices = np.where((mat[upper_indices] == mat[upper_indices[1], upper_indices[0]]))[0]
-        zero_indices = np.where((mat[upper_indices] == mat[upper_indices[1], 
-                                                           upper_indices[0]]) & (mat[upper_indices] == 0))[0]
-
-        # Expand the matrix to 3D
-        mat = np.tile(mat, (n_random, 1, 1))
-
-        # Landau h matrix with random tie breaking
-        mat[:, np.hstack([upper_indices[0][equal_indices, ], upper_indices[1][equal_indices, ]]),
-            np.hstack([upper_indices[1][equal_indices, ], upper_indices[0][equal_indices, ]])] = 0.5
-        mat[:, np.hstack([upper_indices[0][higher_indices, ], upper_indices[1][lower_indices, ]]),
-            np.hstack([upper_indices[1][higher_indices, ], upper_indices[0][lower_indices, ]])] = 1
-        mat[:, np.hstack([upper_indices[1][higher_indices, ], upper_indices[0][lower_indices, ]]),
-            np.hstack([upper_indices[0][higher_indices, ], upper_indices[1][lower_indices, ]])] = 0
-        random_winners = np.random.randint(0, 2, (len(mat), len(zero_indices),))
-        random_losers = 1 - random_winners
-        mat[:, upper_indices[0][zero_indices, ], upper_indices[1][zero_indices, ]] = random_winners
-        mat[:, upper_indices[1][zero_indices, ], upper_indices[0][zero_indices, ]] = random_losers
-        row_sums = np.sum(mat, axis=2)
-        improved_landau_h = (12 / ((mat.shape[1] ** 3) - mat.shape[1])) * np.sum(
-            ((row_sums - ((row_sums.shape[1] - 1) / 2)) ** 2), axis=1)
-
-        # Fully random matrix
-        random_winners = np.random.randint(0, 2, (len(mat), len(upper_indices[0]),))
-        random_losers = 1 - random_winners
-        mat[:, upper_indices[0], upper_indices[1]] = random_winners
-        mat[:, upper_indices[1], upper_indices[0]] = random_losers
-        row_sums = np.sum(mat, axis=2)
-        improved_landau_h_right = (12 / ((mat.shape[1] ** 3) - mat.shape[1])) * np.sum(
-            ((row_sums - ((row_sums.shape[1] - 1) / 2)) ** 2), axis=1)
-        right_p_value = len(np.where(improved_landau_h_right > improved_landau_h)[0]) / n_random
+
+        # Cached result of a seeded test
+        assert alpha is None or 0 < alpha < 1
+        key = result_key('landau_h', random_state, n_random, alpha)
+        results = cached_result(self, key)
+        if results is not None:
+            return results
+
+        # Random matrices in blocks with independent random streams (optionally in parallel) until the right p-value
+        # is decided at alpha
+        blocks = map_blocks(_random_landau_h, randomization_blocks(n_random), random_state=random_state,
+                            n_jobs=n_jobs, args=(mat, max_bytes))
+        blocks = list(sequential_blocks(blocks, lambda block: (np.sum(block[1] > block[0]), len(block[0])),
+                                        alpha=alpha))
+        improved_landau_h = np.concatenate([block[0] for block in blocks])
+        improved_landau_h_right = np.concatenate([block[1] for block in blocks])
+        right_p_value = len(np.where(improved_landau_h_right > improved_landau_h)[0]) / len(improved_landau_h)
 
         # Create results dictionary
         results = {'Improved_Landau_h': round(np.mean(improved_landau_h), 4),
                    'p_value_r': round(right_p_value, 4),
-                   'p_value_l': round(1 - right_p_value, 4)}
+                   'p_value_l': round(1 - right_p_value, 4),
+                   'count': len(improved_landau_h)}
 
         # Return statements
-        return results
+        return store_result(self, key, results)
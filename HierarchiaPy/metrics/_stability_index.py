@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from ..methods._elo_engine import elo_stability_sequence, interaction_codes, interaction_days
+
+
+def stability_index(self, date_col: str, start_value: float = 1000, K: float = 100, normal_probability: bool = False,
+                    weighted: bool = True, windows: list = None):
+
+    """Elo stability index (S) of the hierarchy from an interaction dataframe with dates.
+
+    Parameters
+    ----------
+    :param date_col: str
+        Name of the date/time column of the dataframe. The dataframe has to be in chronological order.
+    :param start_value: float
+        Parameter of the Elo function that determines the initial scores. (1000)
+    :param K: float
+        Parameter of the Elo function that acts as a factor and determines the speed at which scores change
+        after an interaction. (100)
+    :param normal_probability: bool
+        Adjust the calculation of expected win/loss probabilities; default is Logistic,
+        the normal probabilities are calculated using standard normal tables. (False)
+    :param weighted: bool
+        Weight the rank changes with the standardized Elo rating of the individual on the previous day, so that
+        changes at the top of the hierarchy count more than changes at the bottom (Neumann et al, 2011). (True)
+    :param windows: list
+        List of (start, end) date pairs, S is computed for every window over the consecutive day pairs with both
+        days inside the window. If not provided, S is computed over the whole observation period. (None)
+
+    Returns
+    -------
+    stability : float or dict
+        Stability index over the whole period (rounded to 4 decimal places), or if windows are provided, a dictionary
+        with the (start, end) pairs as keys and the stability indices as values. None if a window does not contain
+        a pair of consecutive days with individuals present.
+
+    Notes
+    -----
+    The stability index is S = 1 - sum(C_i,d * W_i,d) / sum(N_d), where C_i,d is the absolute change of the rank of
+    individual i from day d - 1 to day d, W_i,d the weighting factor and N_d the number of individuals present
+    (i.e. observed in at least one interaction) on day d - 1. S ranges from 0 (complete reversal of the hierarchy on
+    every day) to 1 (no rank changes at all). Every calendar day between the first and last interaction counts, days
+    without interactions contribute no rank change.
+
+    The rank order is tracked during a single chronological Elo pass, ranks are recomputed only at the end of days
+    with interactions, so the cost is linear in the number of interactions.
+
+    References
+    ----------
+    * Neumann, C., Duboscq, J., Dubuc, C., Ginting, A., Irwan, A. M., Agil, M., Widdig, A. & Engelhardt, A. 2011.
+      Assessing dominance hierarchies: validation and advantages of progressive evaluation with Elo-rating.
+      Animal Behaviour, 82, 911-921. (DOI: 10.1016/j.anbehav.2011.07.016)
+    """
+
+    # Integer-coded interaction sequence and calendar days (raises if no Pandas dataframe provided)
+    winner_codes, loser_codes = interaction_codes(self)
+    first_day, day_codes = interaction_days(self, date_col)
+    if len(day_codes) == 0:
+        raise ValueError('Stability index needs at least one interaction')
+
+    # Single Elo pass with daily rank changes
+    observed_days, rank_change, n_present = elo_stability_sequence(
+        winner_codes, loser_codes, len(self.indices), day_codes, start_value=start_value, K=K,
+        normal_probability=normal_probability, weighted=weighted)
+
+    # Cumulative rank changes and present individuals over calendar days
+    cumulative_change = np.concatenate([[0], np.cumsum(rank_change)])
+    cumulative_present = np.concatenate([[0], np.cumsum(n_present[:-1] * np.diff(observed_days))])
+
+    def present_before(day):
+        # Sum of individuals present at the end of calendar days 0 ... day - 1
+        idx = np.searchsorted(observed_days, day, side='left') - 1
+        if idx < 0:
+            return 0
+        return cumulative_present[idx] + n_present[idx] * (day - observed_days[idx])
+
+    def window_stability(start_day, end_day):
+        start_day, end_day = max(start_day, 0), min(end_day, observed_days[-1])
+        if end_day <= start_day:
+            return None
+        change = cumulative_change[np.searchsorted(observed_days, end_day, side='right')] - \
+            cumulative_change[np.searchsorted(observed_days, start_day, side='right')]
+        present = present_before(end_day) - present_before(start_day)
+        if present == 0:
+            return None
+        return round(1 - change / present, 4)
+
+    # Return stability index
+    if windows is None:
+        return window_stability(0, observed_days[-1])
+    stability = {}
+    for start, end in windows:
+        start_day = (pd.Timestamp(start).normalize() - first_day) // pd.Timedelta(days=1)
+        end_day = (pd.Timestamp(end).normalize() - first_day) // pd.Timedelta(days=1)
+        stability[(start, end)] = window_stability(start_day, end_day)
+    return stability
@@ -1,5 +1,20 @@
 import numpy as np
 import pandas as pd
+from ..utilities._cache import result_key, cached_result, store_result
+from ..utilities._derived import dij_matrix as chance_corrected_matrix
+from ..utilities._parallel import map_blocks, randomization_blocks
+from ..utilities._sequential import sequential_blocks
+from ..utilities._dyads import upper_triangle
+from ..utilities._sparse import dense_matrix
+
+# Number of random matrices per independent random stream
+_STEEPNESS_BLOCK_SIZE = 250
+
+# Default memory budget of the random matrices processed at once (bytes)
+_STEEPNESS_MAX_BYTES = 2 ** 28
+
+# Number of (chunk x N x N) float32 arrays (or equivalents of the random wins) alive at once for a chunk
+_STEEPNESS_WORKING_ARRAYS = 8
 
 
 def get_Dij(self) -> np.ndarray:
@@ -36,12 +51,8 @@ def get_Dij(self) -> np.ndarray:
       Animal Behaviour, 71, 585-592. doi: 10.1016/j.anbehav.2005.05.015.
     """
 
-    # Calculate Dij
-    mat = self.mat.astype('float64')
-    total_mat = mat + np.transpose(mat)
-    mat = np.divide(mat, total_mat, out=np.zeros_like(mat), where=total_mat != 0)
-    mat -= np.divide((mat - 0.5), total_mat + 1, out=np.zeros_like(mat), where=total_mat != 0)
-    dij_matrix = mat.round(decimals=4)
+    # Calculate Dij (shared with David's scores)
+    dij_matrix = chance_corrected_matrix(self).round(decimals=4)
 
     # Return statement
     return dij_matrix
@@ -100,7 +111,68 @@ def get_steepness(self, method: str = 'Dij') -> float:
     return steepness
 
 
-def steepness_test(self, method: str = 'Dij', n: int = 2000) -> dict:
+def _steepness_chunk_size(size: int, max_bytes: int = _STEEPNESS_MAX_BYTES) -> int:
+
+    """Number of random size x size matrices of the steepness test that are processed at once within max_bytes."""
+
+    return max(1, int(max_bytes // (_STEEPNESS_WORKING_ARRAYS * size * size * np.dtype('float32').itemsize)))
+
+
+def _random_steepness(n: int, seed, observed_mat: np.ndarray, method: str, max_bytes: int) -> np.ndarray:
+
+    # Steepness slopes of n random matrices drawn with the seed, one block of the randomization test
+    rng = np.random.default_rng(seed)
+    size = observed_mat.shape[0]
+    rows, cols = upper_triangle(size)
+    pair_totals = (observed_mat[rows, cols] + observed_mat[cols, rows]).astype('int64')
+
+    # Slopes of the random matrices in chunks within the memory budget; the random wins of all dyads of a chunk are
+    # one draw with per-dyad upper bounds (row by row, so the draws do not depend on the chunk size)
+    slopes = np.empty(n, dtype='float64')
+    chunk_size = _steepness_chunk_size(size, max_bytes)
+    for chunk_start in range(0, n, chunk_size):
+        random_wins = rng.integers(0, pair_totals + 1, size=(min(chunk_size, n - chunk_start), len(rows)))
+        slopes[chunk_start:chunk_start + len(random_wins)] = _steepness_slopes(size, rows, cols, random_wins,
+                                                                               pair_totals, method)
+    return slopes
+
+
+def _steepness_slopes(size: int, rows: np.ndarray, cols: np.ndarray, random_wins: np.ndarray,
+                      pair_totals: np.ndarray, method: str) -> np.ndarray:
+
+    # Steepness slopes of a stack of random matrices from the random wins of every dyad (i, j), scattered into the
+    # upper and lower triangles of the stack with the diagonal set to NaN
+    mat = np.empty((len(random_wins), size, size), dtype='float32')
+    mat[:, rows, cols] = random_wins
+    mat[:, cols, rows] = pair_totals - random_wins
+    i, j = np.diag_indices(size)
+    mat[:, i, j] = np.nan
+
+    # Method specific manipulations
+    if method == 'Dij':
+        total_mat = mat + np.rollaxis(mat, 2, 1)
+        mat = np.divide(mat, total_mat, out=np.zeros_like(mat, dtype='float32'), where=total_mat != 0)
+        mat -= np.divide((mat - 0.5), total_mat + 1, out=np.zeros_like(mat, dtype='float32'), where=total_mat != 0)
+    else:
+        total_mat = mat + np.rollaxis(mat, 2, 1)
+        total_mat = np.where(total_mat == 0, np.nan, total_mat)
+        mat = np.divide(mat, total_mat, out=np.zeros_like(mat, dtype='float32'), where=total_mat != 0)
+
+    # Calculation of matrix properties
+    var_l = np.nansum(mat, axis=1, dtype='float32')
+    var_w = np.nansum(mat, axis=2, dtype='float32')
+    var_l2 = np.nansum(np.rollaxis(mat, 2, 1) * var_l[:, np.newaxis, :], axis=2, dtype='float32')
+    var_w2 = np.nansum(mat * var_w[:, np.newaxis, :], axis=2, dtype='float32')
+    var_ds = ((var_w + var_w2 - var_l - var_l2) + (size * size - 1 / 2)) / size
+    var_ds.sort(axis=1)
+
+    # OLS regression slopes in closed form, row by row so that the slopes do not depend on the chunk size
+    x_centered = np.arange(1, size + 1, dtype='float64') - (size + 1) / 2
+    return np.sum(var_ds * x_centered, axis=1) / np.sum(x_centered ** 2)
+
+
+def steepness_test(self, method: str = 'Dij', n: int = 2000, n_jobs: int = 1, random_state=None,
+                   max_bytes: int = _STEEPNESS_MAX_BYTES, alpha: float = None) -> dict:
 
     """Function to test steepness measure from randomized dominance matrices
 
@@ -113,17 +185,30 @@ def steepness_test(self, method: str = 'Dij', n: int = 2000) -> dict:
     :param n: int
         Parameter to adjust number of random matrices to use in the test. Higher numbers result in more stable test
         results. The maximum number is 1,000,000 while as low as 2,000 is good for robust test results. (2000)
+    :param n_jobs: int
+        Number of worker processes the random matrices are split across, -1 uses all CPUs. (1)
+    :param random_state: int, np.random.SeedSequence or np.random.Generator
+        Seed of the random matrices. Results are identical for a given seed whatever the number of workers, and
+        results of integer seeds are cached on the object; the global NumPy random state seeds the test if not
+        provided. (None)
+    :param max_bytes: int
+        Memory budget of the random matrices processed at once (per worker) in bytes. The random matrices are
+        processed in chunks that fit into it, the results do not depend on it. (2 ** 28)
+    :param alpha: float
+        Significance level of sequential testing. If provided, random matrices are drawn in blocks of 250 until the
+        99% Clopper-Pearson interval of the right p-value lies entirely below or above alpha, n being the maximum
+        number of random matrices. All n random matrices are used if not provided. (None)
 
     Returns
     -------
      steepness_test_dict : dict
-        Summary dictionary of test measures calculated from the randomized process (all rounded to 4 decimal places)
+        Summary dictionary of test measures calculated from the randomized process (all rounded to 4 decimal places),
+        'count' is the number of random matrices used.
 
     See also
     --------
-    https://numpy.org/doc/stable/reference/generated/numpy.tile.html
-    https://numpy.org/doc/stable/reference/generated/numpy.linalg.lstsq.html
-    https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.describe.html
+    https://numpy.org/doc/stable/reference/random/generated/numpy.random.Generator.integers.html
+    https://pandas.pydata.org/docs/reference/api/pandas.Series.describe.html
 
     Notes
     -----
@@ -148,48 +233,30 @@ def steepness_test(self, method: str = 'Dij', n: int = 2000) -> dict:
     # Assertions
     assert type(n) == int and (0 < n <= 1000000)
     assert (method in ['Dij', 'Pij'])
+    assert alpha is None or 0 < alpha < 1
+
+    # Cached result of a seeded test
+    key = result_key('steepness_test', random_state, method, n, alpha)
+    steepness_test_dict = cached_result(self, key)
+    if steepness_test_dict is not None:
+        return steepness_test_dict
 
     # Initial steepness
     initial_steep = self.get_steepness(method=method)
 
-    # Matrix randomization
-    mat = np.tile(self.mat.astype('float32'), (n, 1, 1))
-    for idx in range(self.mat.shape[0]):
-        for idy in range(idx + 1, self.mat.shape[0]):
-            n_ij = self.mat[idx, idy] + self.mat[idy, idx]
-            random_i = np.random.randint(0, n_ij + 1, n)
-            random_j = n_ij - random_i
-            mat[:, idx, idy] = random_i
-            mat[:, idy, idx] = random_j
-
-    # Fill the diagonal Np.nan
-    i, j = np.diag_indices(self.mat.shape[0])
-    mat[:, i, j] = np.nan
-
-    # Method specific manipulations
-    if method == 'Dij':
-        total_mat = mat + np.rollaxis(mat, 2, 1)
-        mat = np.divide(mat, total_mat, out=np.zeros_like(mat, dtype='float32'), where=total_mat != 0)
-        mat -= np.divide((mat - 0.5), total_mat + 1, out=np.zeros_like(mat, dtype='float32'), where=total_mat != 0)
-    else:
-        total_mat = mat + np.rollaxis(mat, 2, 1)
-        total_mat = np.where(total_mat == 0, np.nan, total_mat)
-        mat = np.divide(mat, total_mat, out=np.zeros_like(mat, dtype='float32'), where=total_mat != 0)
-
-    # Calculation of matrix properties
-    var_l = np.nansum(mat, axis=1, dtype='float32')
-    var_w = np.nansum(mat, axis=2, dtype='float32')
-    var_l2 = np.nansum(np.rollaxis(mat, 2, 1) * var_l[:, np.newaxis, :], axis=2, dtype='float32')
-    var_w2 = np.nansum(mat * var_w[:, np.newaxis, :], axis=2, dtype='float32')
-    var_ds = ((var_w + var_w2 - var_l - var_l2) + (self.mat.shape[0] * self.mat.shape[0] - 1 / 2)) / self.mat.shape[0]
-    var_ds.sort(axis=1)
-
-    # OLS regression
-    mat_x = np.vstack([np.arange(1, self.mat.shape[0] + 1, dtype='int32'), np.ones(self.mat.shape[0], dtype='int32')]).T
-    steep_slopes = np.linalg.lstsq(mat_x, np.rollaxis(var_ds, 1, 0), rcond=None)[0][0]
+    # Steepness of random matrices, in blocks with independent random streams (optionally in parallel) until the
+    # right p-value is decided at alpha
+    steep_slopes = np.empty(n, dtype='float64')
+    block_start = 0
+    blocks = map_blocks(_random_steepness, randomization_blocks(n, _STEEPNESS_BLOCK_SIZE), random_state=random_state,
+                        n_jobs=n_jobs, args=(dense_matrix(self.mat), method, max_bytes))
+    for block_slopes in sequential_blocks(blocks, lambda slopes: (np.sum(slopes > abs(initial_steep)), len(slopes)),
+                                          alpha=alpha):
+        steep_slopes[block_start:block_start + len(block_slopes)] = block_slopes
+        block_start += len(block_slopes)
 
     # Verbose Results
-    steep_series = pd.Series(steep_slopes)
+    steep_series = pd.Series(steep_slopes[:block_start])
     steep_desc = steep_series.describe()
     right_p = ((len(steep_series[steep_series > abs(initial_steep)])) / len(steep_series))
     left_p = ((len(steep_series[steep_series < abs(initial_steep)])) / len(steep_series))
@@ -205,7 +272,7 @@ def steepness_test(self, method: str = 'Dij', n: int = 2000) -> dict:
         'percentile_25': round(steep_desc['25%'], 4),
         'percentile_50': round(steep_desc['50%'], 4),
         'percentile_75': round(steep_desc['75%'], 4),
-        'count': n}
+        'count': block_start}
 
     # Return statements
-    return steepness_test_dict
+    return store_result(self, key, steepness_test_dict)
@@ -0,0 +1,180 @@
+from collections import OrderedDict
+import copy
+import numpy as np
+from scipy import sparse
+
+# Default memory cap of the derived-matrix cache of every Hierarchia object (bytes)
+DEFAULT_CACHE_BYTES = 2 ** 28
+
+
+def _nbytes(value) -> int:
+
+    # Memory held by a cache entry (NumPy arrays, SciPy sparse matrices and tuples of them)
+    if isinstance(value, tuple):
+        return sum(_nbytes(element) for element in value)
+    if sparse.issparse(value):
+        return sum(getattr(value, name).nbytes for name in ['data', 'indices', 'indptr', 'row', 'col']
+                   if hasattr(value, name))
+    return getattr(value, 'nbytes', 0)
+
+
+def _read_only(value):
+
+    # Freeze NumPy arrays so that cached entries cannot be modified by the methods sharing them
+    if isinstance(value, tuple):
+        return tuple(_read_only(element) for element in value)
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+class DerivedMatrixCache:
+
+    """Least-recently-used cache of the matrices derived from an interaction matrix.
+
+    Entries are keyed by name and NumPy arrays are stored read-only, so methods that modify a derived matrix have to
+    copy it first. The total size of the entries is kept below max_bytes by evicting the least recently used ones;
+    entries larger than max_bytes are computed but not stored.
+
+    Parameters
+    ----------
+    :param max_bytes: int
+        Memory cap of the cache in bytes. (2 ** 28)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.source = None
+        self._entries = OrderedDict()
+
+    def get(self, key, compute):
+
+        """Cached value of key, computed with compute() and stored on the first request."""
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+        self.misses += 1
+        value = _read_only(compute())
+        size = _nbytes(value)
+        if size <= self.max_bytes:
+            while self.nbytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+            self._entries[key] = (value, size)
+            self.nbytes += size
+        return value
+
+    def discard(self, key):
+
+        """Drop the entry of key, if cached."""
+
+        if key in self._entries:
+            _, size = self._entries.pop(key)
+            self.nbytes -= size
+
+    def clear(self):
+
+        """Drop all entries."""
+
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _object_cache(self) -> DerivedMatrixCache:
+
+    # Cache of the Hierarchia object, emptied when mat is replaced
+    if not hasattr(self, '_cache'):
+        self._cache = DerivedMatrixCache()
+    if self._cache.source is not self.mat:
+        self._cache.clear()
+        self._cache.source = self.mat
+    return self._cache
+
+
+def derived(self, key, compute):
+
+    # Derived matrix of the Hierarchia object from its cache
+    return _object_cache(self).get(key, compute)
+
+
+def result_key(name: str, random_state, *params):
+
+    # Cache key of the result of a randomization method; only integer seeds identify a result (a Generator or the
+    # global random state give new draws on every call), None otherwise
+    if isinstance(random_state, (bool, np.bool_)) or not isinstance(random_state, (int, np.integer)):
+        return None
+    return (name, int(random_state)) + params
+
+
+def cached_result(self, key):
+
+    # Copy of the cached result of a seeded randomization method, None if not cached
+    if key is None or key not in _object_cache(self):
+        return None
+    return copy.deepcopy(self._cache.get(key, None))
+
+
+def store_result(self, key, result):
+
+    # Cache the result of a seeded randomization method (if seeded) and return it
+    if key is not None:
+        _object_cache(self).get(key, lambda: copy.deepcopy(result))
+    return result
+
+
+def clear_cache(self, max_bytes: int = None):
+
+    """Drop the derived matrices cached on the Hierarchia object.
+
+    Parameters
+    ----------
+    :param max_bytes: int
+        New memory cap of the cache in bytes, the current one is kept if not provided. (None)
+
+    Notes
+    -----
+    Derived matrices (e.g. the pair totals, the Dij matrix or David's scores) are computed once per object and shared
+    by the methods, and results of randomization methods called with an integer random_state are kept per parameter
+    set and seed. The cache is emptied automatically when mat is replaced; :py:func:`_update.add_interactions` keeps
+    the dyad-level matrices (updated at the changed dyads) and drops the rest. Call this method after modifying mat in
+    place by other means.
+    """
+
+    if not hasattr(self, '_cache'):
+        self._cache = DerivedMatrixCache()
+    self._cache.clear()
+    self._cache.source = None
+    if max_bytes is not None:
+        self._cache.max_bytes = max_bytes
+
+
+def cache_info(self) -> dict:
+
+    """Statistics of the derived-matrix cache of the Hierarchia object.
+
+    Returns
+    -------
+    cache_info_dict : dict
+        'hits' and 'misses' (number of derived matrices served from the cache and computed), 'entries' (names of the
+        cached derived matrices, least recently used first), 'nbytes' (memory held) and 'max_bytes' (memory cap).
+    """
+
+    if not hasattr(self, '_cache'):
+        self._cache = DerivedMatrixCache()
+    return {'hits': self._cache.hits,
+            'misses': self._cache.misses,
+            'entries': list(self._cache._entries),
+            'nbytes': self._cache.nbytes,
+            'max_bytes': self._cache.max_bytes}
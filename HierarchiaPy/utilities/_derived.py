@@ -0,0 +1,110 @@
+import numpy as np
+from ._cache import derived, _object_cache
+from ._dyads import pair_totals, dominance_relations
+from ._sparse import dense_matrix, dyad_proportions
+
+
+def _dij(mat: np.ndarray, total_mat: np.ndarray) -> np.ndarray:
+
+    # Dij of a float interaction matrix and its pair totals
+    dij = np.divide(mat, total_mat, out=np.zeros_like(mat), where=total_mat != 0)
+    dij -= np.divide((dij - 0.5), total_mat + 1, out=np.zeros_like(mat), where=total_mat != 0)
+    return dij
+
+
+def _proportions(mat: np.ndarray) -> np.ndarray:
+
+    # Proportions of a float (Pij) or Dij matrix over the dyad totals
+    return mat / pair_totals(mat)
+
+
+def _dyadic_matrix(key: str, mat: np.ndarray):
+
+    # Cached matrix of key from a float interaction matrix if its cell (i, j) depends on the dyad (mat[i, j] and
+    # mat[j, i]) only, None for cache entries that depend on the whole matrix
+    if key == 'float':
+        return mat
+    if key == 'total':
+        return mat + np.transpose(mat)
+    if key == 'Dij':
+        return _dij(mat, mat + np.transpose(mat))
+    if key == 'proportion_Pij':
+        return _proportions(mat)
+    if key == 'proportion_Dij':
+        return _proportions(_dij(mat, mat + np.transpose(mat)))
+    if key.startswith('dominance_'):
+        return dominance_relations(mat, float(key[len('dominance_'):]))
+    return None
+
+
+def float_matrix(self) -> np.ndarray:
+
+    """Dense float64 copy of the interaction matrix (read-only, cached)."""
+
+    return derived(self, 'float', lambda: dense_matrix(self.mat).astype('float64'))
+
+
+def total_matrix(self) -> np.ndarray:
+
+    """Pair-total matrix mat + mat.T, the number of interactions of every dyad (read-only, cached)."""
+
+    return derived(self, 'total', lambda: _dyadic_matrix('total', float_matrix(self)))
+
+
+def dij_matrix(self) -> np.ndarray:
+
+    """Dyadic dominance index corrected for chance, Dij (unrounded, read-only, cached)."""
+
+    return derived(self, 'Dij', lambda: _dij(float_matrix(self), total_matrix(self)))
+
+
+def proportion_matrix(self, method: str = 'Pij') -> np.ndarray:
+
+    """Proportion of wins (Pij) or Dij of every dyad, NaN on the diagonal and for dyads without interactions
+    (read-only, cached)."""
+
+    return derived(self, 'proportion_' + method,
+                   lambda: _proportions(dij_matrix(self) if method == 'Dij' else float_matrix(self)))
+
+
+def sparse_proportions(self, method: str = 'Pij') -> tuple:
+
+    """Pij or Dij and pair-total CSR matrices of a sparse interaction matrix (cached), see
+    :py:func:`_sparse.dyad_proportions`."""
+
+    return derived(self, 'sparse_proportion_' + method, lambda: dyad_proportions(self.mat, method=method))
+
+
+def dominance_matrix(self, tie_value: float = 0.5) -> np.ndarray:
+
+    """Binarized dominance matrix: 1 for the winner and 0 for the loser of every dyad, tie_value for both individuals
+    of tied (or unknown) dyads. The diagonal is kept from the interaction matrix (read-only, cached)."""
+
+    return derived(self, 'dominance_' + str(tie_value), lambda: dominance_relations(float_matrix(self), tie_value))
+
+
+def update_dyads(self, rows: np.ndarray, cols: np.ndarray):
+
+    """Bring the cache in line with a dense mat that was changed in place at the dyads (rows, cols).
+
+    Cached matrices whose cells depend on a single dyad (float, total, Dij, proportion and dominance matrices) are
+    recomputed at the changed dyads only, from the submatrix of the individuals involved. All other entries (e.g.
+    David's scores or results of randomization methods) depend on the whole matrix and are dropped.
+    """
+
+    cache = _object_cache(self)
+    if len(cache) == 0:
+        return
+    individuals = np.unique(np.concatenate([rows, cols]))
+    sub_mat = dense_matrix(self.mat)[np.ix_(individuals, individuals)].astype('float64')
+    sub_rows, sub_cols = np.searchsorted(individuals, rows), np.searchsorted(individuals, cols)
+    for key in list(cache._entries):
+        value = _dyadic_matrix(key, sub_mat) if isinstance(key, str) else None
+        entry = cache._entries[key][0]
+        if value is None or not isinstance(entry, np.ndarray):
+            cache.discard(key)
+            continue
+        entry.flags.writeable = True
+        entry[rows, cols] = value[sub_rows, sub_cols]
+        entry[cols, rows] = value[sub_cols, sub_rows]
+        entry.flags.writeable = False
@@ -0,0 +1,51 @@
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def upper_triangle(n: int) -> tuple:
+
+    """Row and column indices of the dyads (i < j) of an n x n matrix in row-major order (read-only, cached per n)."""
+
+    rows, cols = np.triu_indices(n, k=1)
+    rows.flags.writeable = False
+    cols.flags.writeable = False
+    return rows, cols
+
+
+def pair_totals(mat: np.ndarray) -> np.ndarray:
+
+    """Pair totals mat + mat.T of every dyad; NaN on the diagonal and for dyads without a positive total."""
+
+    total_mat = mat + np.swapaxes(mat, -1, -2)
+    total_mat = np.where(total_mat > 0, total_mat, np.nan)
+    diagonal = np.arange(mat.shape[-1])
+    total_mat[..., diagonal, diagonal] = np.nan
+    return total_mat
+
+
+def dominance_relations(mat: np.ndarray, tie_value: float = 0.5) -> np.ndarray:
+
+    """Binarized dominance relations of every dyad: 1 for the winner and 0 for the loser, tie_value for both
+    individuals of tied (or unknown) dyads. The diagonal is kept from mat. Stacks of matrices (..., n, n) are
+    binarized at once."""
+
+    mat_t = np.swapaxes(mat, -1, -2)
+    relations = np.where(mat > mat_t, 1.0, np.where(mat < mat_t, 0.0, tie_value))
+    diagonal = np.arange(mat.shape[-1])
+    relations[..., diagonal, diagonal] = mat[..., diagonal, diagonal]
+    return relations
+
+
+def dyad_states(mat: np.ndarray) -> tuple:
+
+    """Upper-triangle dyads (i < j, row-major order) of mat and their states as boolean masks.
+
+    Returns the row and column indices of the dyads and the masks of the dyads where i won more often (higher), lost
+    more often (lower), as often (equal, including unknown dyads) and where no interaction was observed (unknown).
+    """
+
+    rows, cols = upper_triangle(mat.shape[0])
+    wins, losses = mat[rows, cols], mat[cols, rows]
+    equal = wins == losses
+    return rows, cols, wins > losses, wins < losses, equal, equal & (wins == 0)
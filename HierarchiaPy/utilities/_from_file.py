@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import os
+import tempfile
+
+
+def _read_chunks(path: str, columns: list, chunksize: int, file_format: str):
+
+    # Yield dataframes holding only the requested columns, chunksize rows at a time
+    if file_format == 'csv':
+        # Read the individuals as strings, so that all chunks share one dtype whatever values they hold
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, dtype={column: str for column in columns}):
+            yield chunk
+    elif file_format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('Reading Parquet files requires pyarrow, consider installing it (pip install pyarrow)')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        raise ValueError('Enter a valid file format: ["csv", "parquet"]')
+
+
+def from_file(cls, path: str, winner_col: str, loser_col: str, chunksize: int = 1000000, file_format: str = None,
+              spill_dir: str = None):
+
+    """Hierarchia object from a CSV or Parquet interaction log, read in chunks.
+
+    Parameters
+    ----------
+    :param path: str
+        Path of the interaction log with one row per interaction.
+    :param winner_col: str
+        Name of the column of winner individuals.
+    :param loser_col: str
+        Name of the column of loser individuals.
+    :param chunksize: int
+        Number of rows read at once. Peak memory depends on the chunk size, not on the size of the file. (1000000)
+    :param file_format: str
+        Valid arguments are 'csv' and 'parquet'. Inferred from the file extension if not provided. Parquet files
+        require the optional pyarrow dependency. (None)
+    :param spill_dir: str
+        Directory to store the integer-coded interaction sequence (needed by the Elo methods) on disk, in a pair of
+        uniquely named 'winner_codes_*.bin' and 'loser_codes_*.bin' files. The sequence is memory-mapped from there
+        instead of kept in memory. (None)
+
+    Returns
+    -------
+    Hierarchia : object
+        Hierarchia object with identical mat and indices to the one initialized with the full Pandas DataFrame read by
+        pd.read_csv (CSV columns are read as strings). The object has no df attribute; the Elo methods use the
+        integer-coded interaction sequence, methods that need further columns (e.g. dates) are not available.
+
+    Notes
+    -----
+    Only the winner and loser columns are read. Every chunk is integer-coded against a name index that grows when new
+    individuals appear, and its interactions are added to the dominance matrix, so the raw interaction log is never
+    held in memory as a whole. At the end, individuals are sorted by name as in the DataFrame initialization.
+    """
+
+    # Infer file format
+    if file_format is None:
+        extension = os.path.basename(path).lower().split('.')
+        file_format = 'parquet' if 'parquet' in extension[1:] or 'pq' in extension[1:] else 'csv'
+
+    # Spill files for the interaction sequence
+    spill_files = None
+    if spill_dir is not None:
+        os.makedirs(spill_dir, exist_ok=True)
+        spill_files = [tempfile.NamedTemporaryFile(dir=spill_dir, prefix=prefix, suffix='.bin', delete=False)
+                       for prefix in ['winner_codes_', 'loser_codes_']]
+
+    # Accumulate the matrix chunk by chunk with a growing name index
+    name_codes = {}
+    names = []
+    mat = np.zeros((0, 0), dtype='int64')
+    sequence = []
+    try:
+        for chunk in _read_chunks(path, [winner_col, loser_col], chunksize, file_format):
+            local_codes, local_names = pd.factorize(pd.concat([chunk[winner_col], chunk[loser_col]],
+                                                              ignore_index=True))
+            for name in local_names:
+                if name not in name_codes:
+                    name_codes[name] = len(names)
+                    names.append(name)
+            local_to_global = np.array([name_codes[name] for name in local_names], dtype='int32')
+
+            # Drop interactions with missing individuals
+            winner_codes, loser_codes = local_codes[:len(chunk)], local_codes[len(chunk):]
+            known = (winner_codes >= 0) & (loser_codes >= 0)
+            winner_codes = local_to_global[winner_codes[known]]
+            loser_codes = local_to_global[loser_codes[known]]
+
+            # Grow and update the matrix
+            if len(names) > mat.shape[0]:
+                grown_mat = np.zeros((len(names), len(names)), dtype='int64')
+                grown_mat[:mat.shape[0], :mat.shape[0]] = mat
+                mat = grown_mat
+            mat += np.bincount(winner_codes.astype('int64') * len(names) + loser_codes,
+                               minlength=len(names) ** 2).reshape(len(names), len(names))
+
+            # Keep the ordered sequence for the Elo methods
+            if spill_files is not None:
+                winner_codes.tofile(spill_files[0])
+                loser_codes.tofile(spill_files[1])
+            else:
+                sequence.append((winner_codes, loser_codes))
+    finally:
+        if spill_files is not None:
+            for spill_file in spill_files:
+                spill_file.close()
+
+    # Sort individuals by name, as pd.factorize does in the DataFrame initialization
+    new_codes, sorted_names = pd.factorize(pd.Index(names, dtype=object), sort=True)
+    new_codes = new_codes.astype('int32')
+    order = np.empty(len(names), dtype='int64')
+    order[new_codes] = np.arange(len(names), dtype='int64')
+    indices = list(sorted_names)
+    mat = mat[order][:, order]
+
+    # Recode the interaction sequence
+    if spill_dir is not None:
+        codes = []
+        for name in [spill_file.name for spill_file in spill_files]:
+            if os.path.getsize(name) == 0:
+                codes.append(np.zeros(0, dtype='int32'))
+                continue
+            code_map = np.memmap(name, dtype='int32', mode='r+')
+            for block_start in range(0, len(code_map), chunksize):
+                code_map[block_start:block_start + chunksize] = new_codes[code_map[block_start:block_start +
+                                                                                            chunksize]]
+            code_map.flush()
+            codes.append(np.memmap(name, dtype='int32', mode='r'))
+        winner_codes, loser_codes = codes
+    else:
+        winner_codes = new_codes[np.concatenate([w for w, l in sequence] + [np.zeros(0, dtype='int32')])]
+        loser_codes = new_codes[np.concatenate([l for w, l in sequence] + [np.zeros(0, dtype='int32')])]
+
+    # Create Hierarchia object
+    hierarchia = cls(mat, indices)
+    hierarchia.winner_col = winner_col
+    hierarchia.loser_col = loser_col
+    hierarchia.cross_tab_df = pd.DataFrame(hierarchia.mat, index=pd.Index(indices, name=winner_col),
+                                           columns=pd.Index(indices, name=loser_col), copy=False)
+    hierarchia._interaction_codes = (winner_codes, loser_codes)
+    hierarchia._owns_mat = True
+    return hierarchia
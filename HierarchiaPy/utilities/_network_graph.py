@@ -3,6 +3,7 @@ import networkx as nx
 import numpy as np
 import matplotlib
 import warnings
+from ..utilities._sparse import dense_matrix
 
 
 def directed_network_graph(self, **kwargs) -> matplotlib.figure.Figure:
@@ -28,7 +29,7 @@ def directed_network_graph(self, **kwargs) -> matplotlib.figure.Figure:
     """
 
     # Process matrix
-    processed_mat = self.mat - np.transpose(self.mat)
+    processed_mat = dense_matrix(self.mat) - np.transpose(dense_matrix(self.mat))
     processed_mat = np.where(processed_mat < 0, 0, processed_mat)
 
     # Network graph
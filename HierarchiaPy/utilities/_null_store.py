@@ -0,0 +1,39 @@
+import numpy as np
+import os
+import tempfile
+
+# Environment variable of the directory of stored null distributions
+CACHE_DIR_VARIABLE = 'HIERARCHIAPY_CACHE_DIR'
+
+
+def cache_dir() -> str:
+
+    """Directory of stored null distributions: $HIERARCHIAPY_CACHE_DIR, or ~/.cache/HierarchiaPy if not set."""
+
+    return os.environ.get(CACHE_DIR_VARIABLE) or os.path.join(os.path.expanduser('~'), '.cache', 'HierarchiaPy')
+
+
+def null_path(name: str, n: int, runs: int, seed: int) -> str:
+
+    """Path of the stored null distribution <name> of n individuals drawn with runs randomizations and the seed."""
+
+    return os.path.join(cache_dir(), '{}_n{}_runs{}_seed{}.npy'.format(name, n, runs, seed))
+
+
+def stored_null(name: str, n: int, runs: int, seed: int, compute) -> np.ndarray:
+
+    """Null distribution from the store, memory-mapped read-only.
+
+    The distribution is computed with compute() and saved (as a NumPy .npy file) on the first request, later requests
+    (also from other processes) only map the file. Files are written to a temporary file first and moved into place,
+    so concurrent writers cannot leave a partial file behind.
+    """
+
+    path = null_path(name, n, runs, seed)
+    if not os.path.exists(path):
+        values = np.asarray(compute())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix='.npy', delete=False) as temp_file:
+            np.save(temp_file, values)
+        os.replace(temp_file.name, path)
+    return np.load(path, mmap_mode='r')
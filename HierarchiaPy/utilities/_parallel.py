@@ -0,0 +1,96 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import os
+
+# Default number of randomizations per random stream; blocks (not workers) define the streams
+RANDOMIZATION_BLOCK_SIZE = 1000
+
+# Block function and arguments of the current worker process, set once per worker by the pool initializer
+_WORKER_STATE = {}
+
+
+def effective_n_jobs(n_jobs) -> int:
+
+    """Number of worker processes for n_jobs: None or 1 run in the calling process, -1 uses all CPUs and -2 all but
+    one (and so on)."""
+
+    if n_jobs is None:
+        return 1
+    if not isinstance(n_jobs, (int, np.integer)) or n_jobs == 0:
+        raise ValueError('n_jobs has to be a positive integer, -1 (all CPUs) or None')
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + int(n_jobs))
+    return int(n_jobs)
+
+
+def seed_sequence(random_state) -> np.random.SeedSequence:
+
+    """Root seed sequence of a randomization: from an integer seed, a SeedSequence, entropy drawn from a Generator
+    (which advances it, so repeated calls give new streams) or (None) entropy drawn from the global NumPy random
+    state, so that np.random.seed keeps results reproducible."""
+
+    if isinstance(random_state, np.random.SeedSequence):
+        return random_state
+    if isinstance(random_state, np.random.Generator):
+        return np.random.SeedSequence(random_state.integers(0, 2 ** 32, size=4).tolist())
+    if random_state is None:
+        return np.random.SeedSequence(np.random.randint(0, 2 ** 31 - 1, size=4).tolist())
+    return np.random.SeedSequence(random_state)
+
+
+def randomization_blocks(n: int, block_size: int = RANDOMIZATION_BLOCK_SIZE) -> list:
+
+    """Sizes of the blocks of n randomizations, all of block_size except the last one."""
+
+    return [min(block_size, n - block_start) for block_start in range(0, n, block_size)]
+
+
+def _init_worker(function, args):
+    _WORKER_STATE['function'] = function
+    _WORKER_STATE['args'] = args
+
+
+def _run_block(block_size, seed):
+    return _WORKER_STATE['function'](block_size, seed, *_WORKER_STATE['args'])
+
+
+def map_blocks(function, block_sizes: list, random_state=None, n_jobs: int = 1, args: tuple = ()):
+
+    """Yield function(block_size, seed, *args) for every block, in block order.
+
+    Every block gets an independent child of the root seed sequence (SeedSequence.spawn), so the results depend on
+    the seed and the blocks but not on the number of workers. With more than one worker, blocks are computed in a
+    process pool (function has to be a module-level function); args are sent to every worker once. Blocks are
+    submitted a few at a time, so a caller that stops consuming early (e.g. sequential stopping) wastes at most a
+    few blocks.
+    """
+
+    seeds = seed_sequence(random_state).spawn(len(block_sizes))
+    workers = min(effective_n_jobs(n_jobs), len(block_sizes))
+
+    # Serial execution
+    if workers <= 1:
+        for block_size, seed in zip(block_sizes, seeds):
+            yield function(block_size, seed, *args)
+        return
+
+    # Parallel execution with a bounded window of submitted blocks
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(function, args))
+    tasks = iter(zip(block_sizes, seeds))
+    futures = deque()
+    try:
+        for block_size, seed in tasks:
+            futures.append(executor.submit(_run_block, block_size, seed))
+            if len(futures) >= 2 * workers:
+                break
+        while futures:
+            result = futures.popleft().result()
+            for block_size, seed in tasks:
+                futures.append(executor.submit(_run_block, block_size, seed))
+                break
+            yield result
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,50 @@
+from scipy.stats import beta
+
+# Confidence level of the p-value interval that decides sequential randomization tests
+SEQUENTIAL_CONFIDENCE = 0.99
+
+
+def clopper_pearson(successes: int, trials: int, confidence: float = SEQUENTIAL_CONFIDENCE) -> tuple:
+
+    """Exact (Clopper-Pearson) confidence interval of a binomial proportion, (0, 1) without trials."""
+
+    if trials == 0:
+        return 0.0, 1.0
+    tail = (1 - confidence) / 2
+    lower = beta.ppf(tail, successes, trials - successes + 1) if successes > 0 else 0.0
+    upper = beta.ppf(1 - tail, successes + 1, trials - successes) if successes < trials else 1.0
+    return float(lower), float(upper)
+
+
+def p_value_decided(successes: int, trials: int, alpha: float, confidence: float = SEQUENTIAL_CONFIDENCE) -> bool:
+
+    """Whether the confidence interval of a Monte Carlo p-value (successes out of trials) lies entirely on one side
+    of alpha, i.e. more randomizations cannot change the decision at alpha with the given confidence."""
+
+    lower, upper = clopper_pearson(successes, trials, confidence)
+    return upper < alpha or lower > alpha
+
+
+def sequential_blocks(blocks, exceedances, alpha: float = None, confidence: float = SEQUENTIAL_CONFIDENCE):
+
+    """Yield the blocks of a randomization test until its p-value is decided at alpha.
+
+    After every block, exceedances(block) gives the number of randomizations at least as extreme as the observation
+    and the number of randomizations of the block. The blocks are yielded until :py:func:`p_value_decided` (or until
+    they run out, which is the maximum number of randomizations); all blocks are yielded if alpha is None. The block
+    iterator is closed on stopping, so pending parallel blocks are cancelled.
+    """
+
+    successes, trials = 0, 0
+    try:
+        for block in blocks:
+            yield block
+            if alpha is None:
+                continue
+            block_successes, block_trials = exceedances(block)
+            successes, trials = successes + block_successes, trials + block_trials
+            if p_value_decided(successes, trials, alpha, confidence):
+                return
+    finally:
+        if hasattr(blocks, 'close'):
+            blocks.close()
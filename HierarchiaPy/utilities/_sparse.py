@@ -0,0 +1,44 @@
+import numpy as np
+from scipy import sparse
+
+
+def is_sparse(mat) -> bool:
+
+    """True if the interaction matrix is a scipy.sparse matrix."""
+
+    return sparse.issparse(mat)
+
+
+def dense_matrix(mat) -> np.ndarray:
+
+    """Dense NumPy version of the interaction matrix, for methods that have no sparse implementation."""
+
+    return mat.toarray() if sparse.issparse(mat) else mat
+
+
+def offdiagonal(mat) -> sparse.csr_matrix:
+
+    """Float64 CSR copy of a sparse interaction matrix with the diagonal removed."""
+
+    mat = sparse.csr_matrix(mat, dtype='float64', copy=True)
+    mat.setdiag(0)
+    mat.eliminate_zeros()
+    return mat
+
+
+def dyad_proportions(mat, method: str = 'Pij') -> tuple:
+
+    """Proportion of wins (Pij) or chance-corrected dyadic dominance index (Dij) of a sparse interaction matrix.
+
+    Both are defined on the dyads with at least one interaction, i.e. on the structure of the pair-total matrix
+    (mat + mat.T); returns the dyadic index and the pair-total matrix as CSR matrices with the same structure.
+    """
+
+    mat = offdiagonal(mat)
+    total_mat = (mat + mat.T).tocoo()
+    wins = np.asarray(mat[total_mat.row, total_mat.col]).ravel()
+    proportions = wins / total_mat.data
+    if method == 'Dij':
+        proportions = proportions - (proportions - 0.5) / (total_mat.data + 1)
+    prop_mat = sparse.csr_matrix((proportions, (total_mat.row, total_mat.col)), shape=mat.shape)
+    return prop_mat, total_mat.tocsr()
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from ._derived import update_dyads
+
+
+def _get_df(self) -> pd.DataFrame:
+
+    # Interaction dataframe of the object; rows appended by update are concatenated once, on the first access after
+    # the updates
+    if '_df' not in self.__dict__:
+        raise AttributeError("'Hierarchia' object has no attribute 'df'")
+    if len(self._pending_rows) > 0:
+        self._df = pd.concat([self._df] + self._pending_rows, ignore_index=True)
+        self._pending_rows = []
+    return self._df
+
+
+def _set_df(self, df: pd.DataFrame):
+
+    # Replace the interaction dataframe (and drop rows waiting to be appended)
+    self._df = df
+    self._pending_rows = []
+
+
+def _append_to_spill(codes: np.memmap, new_codes: np.ndarray) -> np.memmap:
+
+    # Append codes to the spill file of a memory-mapped interaction sequence and map the grown file
+    with open(codes.filename, 'ab') as spill_file:
+        new_codes.astype(codes.dtype).tofile(spill_file)
+    return np.memmap(codes.filename, dtype=codes.dtype, mode='r')
+
+
+def _add_interactions(self, winners, losers, new_rows: pd.DataFrame = None) -> tuple:
+
+    # Shared implementation of add_interactions and update, new_rows are appended to df if provided
+
+    # Validate input
+    winners, losers = pd.Series(np.asarray(winners)), pd.Series(np.asarray(losers))
+    if len(winners) != len(losers):
+        raise ValueError('Winner and loser sequences are not equal in length')
+    if winners.isna().any() or losers.isna().any():
+        raise ValueError('Winner and loser sequences cannot contain missing values')
+
+    # Name index, built once
+    if not hasattr(self, '_name_codes'):
+        self._name_codes = {name: code for code, name in enumerate(self.indices)}
+
+    # Integer-code the new interactions, new individuals get the next codes
+    local_codes, local_names = pd.factorize(pd.concat([winners, losers], ignore_index=True))
+    new_names = [name for name in local_names if name not in self._name_codes]
+    if len(new_names) > 0:
+        self.indices = list(self.indices)
+        for name in new_names:
+            self._name_codes[name] = len(self.indices)
+            self.indices.append(name)
+    local_to_global = np.array([self._name_codes[name] for name in local_names], dtype='int64')
+    winner_codes = local_to_global[local_codes[:len(winners)]]
+    loser_codes = local_to_global[local_codes[len(winners):]]
+
+    # Sparse matrices are rebuilt from their stored cells and the new interactions (duplicates are summed)
+    if sparse.issparse(self.mat):
+        coo_mat = self.mat.tocoo()
+        new_counts = np.ones(len(winner_codes), dtype=coo_mat.dtype)
+        self.mat = sparse.csr_matrix((np.concatenate([coo_mat.data, new_counts]),
+                                      (np.concatenate([coo_mat.row, winner_codes]),
+                                       np.concatenate([coo_mat.col, loser_codes]))),
+                                     shape=(len(self.indices), len(self.indices)))
+
+    # Grow the matrix for new individuals, the matrix is copied once if it was provided by the user
+    else:
+        if len(self.indices) > self.mat.shape[0]:
+            grown_mat = np.zeros((len(self.indices), len(self.indices)), dtype=self.mat.dtype)
+            grown_mat[:self.mat.shape[0], :self.mat.shape[0]] = self.mat
+            self.mat = grown_mat
+            self._owns_mat = True
+        elif not getattr(self, '_owns_mat', False):
+            self.mat = self.mat.copy()
+            self._owns_mat = True
+        np.add.at(self.mat, (winner_codes, loser_codes), 1)
+
+    # Keep the derived attributes in line with the matrix (the cache is emptied when mat was replaced)
+    changed_dyads = np.divmod(np.unique(winner_codes * len(self.indices) + loser_codes), len(self.indices))
+    if not sparse.issparse(self.mat):
+        update_dyads(self, *changed_dyads)
+    if hasattr(self, 'cross_tab_df') and sparse.issparse(self.mat):
+        self.cross_tab_df = pd.DataFrame.sparse.from_spmatrix(
+            self.mat, index=pd.Index(self.indices, name=self.cross_tab_df.index.name),
+            columns=pd.Index(self.indices, name=self.cross_tab_df.columns.name))
+    elif hasattr(self, 'cross_tab_df'):
+        self.cross_tab_df = pd.DataFrame(self.mat, index=pd.Index(self.indices, name=self.cross_tab_df.index.name),
+                                         columns=pd.Index(self.indices, name=self.cross_tab_df.columns.name),
+                                         copy=False)
+
+    # Append to the interaction sequence and df; spilled sequences grow on disk, the others are buffered and
+    # concatenated once when they are read
+    if hasattr(self, '_interaction_codes') and isinstance(self._interaction_codes[0], np.memmap):
+        self._interaction_codes = tuple(_append_to_spill(codes, new_codes) for codes, new_codes in
+                                        zip(self._interaction_codes, [winner_codes, loser_codes]))
+    elif hasattr(self, '_interaction_codes'):
+        if not hasattr(self, '_pending_codes'):
+            self._pending_codes = []
+        self._pending_codes.append((winner_codes, loser_codes))
+    if hasattr(self, '_df'):
+        if new_rows is None:
+            new_rows = pd.DataFrame({self.winner_col: winners, self.loser_col: losers})
+        self._pending_rows.append(new_rows)
+
+    # Return changed dyads
+    return changed_dyads
+
+
+def add_interactions(self, winners, losers):
+
+    """Add new interactions (and new individuals) to an existing Hierarchia object.
+
+    Parameters
+    ----------
+    :param winners: list or np.ndarray or pd.Series
+        Winner individuals of the new interactions, in chronological order.
+    :param losers: list or np.ndarray or pd.Series
+        Loser individuals of the new interactions, in chronological order.
+
+    Returns
+    -------
+    changed_dyads : tuple
+        Row and column indices (two np.ndarray) of the matrix cells that received new interactions.
+
+    Notes
+    -----
+    The interactions are integer-coded against the existing name index and counted into mat in place, so no
+    crosstab of the full interaction history is recomputed. New individuals are appended to the end of indices (they
+    are not re-sorted) and mat grows accordingly, which is the only step that touches the whole matrix. If the object
+    keeps an interaction sequence (initialized with a Pandas DataFrame or from a file), the new interactions are
+    appended to it and to df, so the Elo methods include them. Appending is buffered: the new rows and codes are
+    concatenated with the existing ones once, when df or the sequence is read next, and sequences memory-mapped from
+    spill files grow on disk. Cached derived matrices that depend on single dyads (e.g. Dij) are updated at the
+    changed dyads only, the other cached results depend on the whole matrix and are dropped.
+    """
+
+    return _add_interactions(self, winners, losers)
+
+
+def update(self, df: pd.DataFrame):
+
+    """Add the interactions of a new Pandas DataFrame to an existing Hierarchia object.
+
+    Parameters
+    ----------
+    :param df: pd.DataFrame
+        New interactions with the same winner and loser columns as the DataFrame used to initialize the object.
+
+    Returns
+    -------
+    changed_dyads : tuple
+        Row and column indices (two np.ndarray) of the matrix cells that received new interactions.
+
+    Notes
+    -----
+    See :py:func:`_update.add_interactions`. Other columns of the new DataFrame (e.g. dates) are appended to df as
+    well, so date-based methods see the new interactions.
+    """
+
+    if not hasattr(self, 'winner_col') or not hasattr(self, 'loser_col'):
+        raise ValueError('Hierarchia object has no winner and loser columns, consider using add_interactions')
+    if self.winner_col not in df.columns or self.loser_col not in df.columns:
+        raise ValueError('Please provide valid winner and/or loser column names')
+
+    # Add interactions together with the remaining columns of the new rows
+    return _add_interactions(self, df[self.winner_col], df[self.loser_col], new_rows=df)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from ..methods._elo_engine import interaction_codes
+
+
+def rolling_windows(self, time_col: str, window='30D', step='1D', metrics=('davids_score', 'dci')):
+
+    """Hierarchy metrics over sliding time windows of an interaction dataframe.
+
+    Parameters
+    ----------
+    :param time_col: str
+        Name of the timestamp column of the dataframe.
+    :param window: str or pd.Timedelta
+        Length of every window, windows include their start and exclude their end. ('30D')
+    :param step: str or pd.Timedelta
+        Distance between the starts of consecutive windows. ('1D')
+    :param metrics: list or dict
+        Names of the Hierarchia methods to compute per window (e.g. 'davids_score', 'dci', 'landau_h'), or a dictionary
+        of method names and keyword arguments for them. (('davids_score', 'dci'))
+
+    Returns
+    -------
+    windows : generator
+        Yields one dictionary per window with 'start', 'end', 'n_interactions' and the result of every metric, computed
+        on the individuals that interacted within the window (None for windows without interactions).
+
+    Notes
+    -----
+    The windows are walked in chronological order with two pointers. The interaction matrix is maintained by adding
+    the interactions entering the window and subtracting the ones leaving it, so maintaining the matrix costs time
+    linear in the total number of interactions instead of rebuilding it for every window.
+    """
+
+    # Assertions
+    if not hasattr(self, 'df') or time_col not in self.df.columns:
+        raise ValueError('Please provide a valid time column name')
+    if not isinstance(metrics, dict):
+        metrics = {metric: {} for metric in metrics}
+    for metric in metrics:
+        if not hasattr(self, metric):
+            raise ValueError('Unknown metric: ' + str(metric))
+
+    # Chronologically sorted, integer-coded interactions
+    winner_codes, loser_codes = interaction_codes(self)
+    times = pd.to_datetime(self.df[time_col]).to_numpy()
+    order = np.argsort(times, kind='stable')
+    times, winner_codes, loser_codes = times[order], winner_codes[order], loser_codes[order]
+    window, step = pd.Timedelta(window), pd.Timedelta(step)
+    if window <= pd.Timedelta(0) or step <= pd.Timedelta(0):
+        raise ValueError('Window and step have to be positive')
+
+    # Return window generator
+    return _window_generator(self, times, winner_codes, loser_codes, window, step, metrics)
+
+
+def _window_generator(self, times, winner_codes, loser_codes, window, step, metrics):
+
+    # Window state
+    n = len(self.indices)
+    mat = np.zeros((n, n), dtype='int64')
+    n_interactions = np.zeros(n, dtype='int64')
+    names = np.empty(n, dtype=object)
+    names[:] = list(self.indices)
+    lower = upper = 0
+
+    # Slide the window
+    start = pd.Timestamp(times[0]) if len(times) > 0 else None
+    while start is not None and start <= times[-1]:
+        end = start + window
+
+        # Add entering and subtract leaving interactions
+        new_lower = np.searchsorted(times, start.to_datetime64(), side='left')
+        new_upper = np.searchsorted(times, end.to_datetime64(), side='left')
+        for (first, last), sign in [((lower, min(new_lower, upper)), -1), ((max(upper, new_lower), new_upper), 1)]:
+            np.add.at(mat, (winner_codes[first:last], loser_codes[first:last]), sign)
+            np.add.at(n_interactions, winner_codes[first:last], sign)
+            np.add.at(n_interactions, loser_codes[first:last], sign)
+        lower, upper = new_lower, new_upper
+
+        # Metrics on the individuals interacting within the window
+        results = {'start': start, 'end': end, 'n_interactions': upper - lower}
+        active = np.flatnonzero(n_interactions > 0)
+        window_hierarchia = type(self)(mat[np.ix_(active, active)], list(names[active])) if len(active) > 0 else None
+        for metric, kwargs in metrics.items():
+            results[metric] = getattr(window_hierarchia, metric)(**kwargs) if window_hierarchia is not None else None
+        yield results
+
+        start = start + step
@@ -17,6 +17,38 @@ mat = np.array([[0, 5, 4, 6, 3, 0, 2, 2, 3, 1],
                 [0, 0, 0, 0, 0, 1, 0, 2, 0, 6],
                 [0, 0, 0, 0, 0, 0, 0, 0, 2, 0]], dtype='int64')
 
+# Continuous-chain search of the original implementation: 18 inconsistencies of total strength 115 (118 for some
+# seeds) after 1000 runs on this 20 x 20 matrix
+
+mat_20 = np.array([[0, 0, 0, 4, 2, 2, 1, 0, 1, 0, 1, 0, 0, 0, 2, 2, 0, 3, 3, 1],
+                   [1, 0, 2, 3, 1, 1, 3, 0, 0, 0, 3, 1, 0, 2, 0, 0, 3, 1, 3, 2],
+                   [3, 2, 0, 5, 3, 3, 2, 0, 2, 2, 2, 1, 1, 0, 4, 4, 3, 2, 0, 0],
+                   [1, 2, 0, 0, 0, 1, 1, 0, 2, 0, 2, 0, 0, 2, 2, 0, 0, 0, 3, 1],
+                   [3, 0, 2, 4, 0, 2, 0, 1, 1, 2, 5, 3, 0, 3, 2, 1, 1, 0, 4, 5],
+                   [2, 3, 1, 1, 1, 0, 4, 0, 3, 1, 0, 0, 0, 1, 1, 4, 4, 0, 0, 2],
+                   [2, 2, 0, 4, 2, 1, 0, 2, 1, 0, 1, 1, 0, 0, 1, 4, 0, 1, 3, 3],
+                   [3, 1, 0, 5, 0, 0, 2, 0, 1, 0, 1, 4, 3, 2, 3, 4, 0, 4, 3, 0],
+                   [3, 2, 1, 0, 0, 1, 2, 1, 0, 3, 3, 2, 3, 2, 5, 1, 2, 0, 4, 4],
+                   [0, 0, 1, 0, 0, 0, 1, 0, 2, 0, 1, 1, 1, 4, 0, 1, 0, 0, 2, 1],
+                   [1, 1, 2, 3, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 1, 1, 1, 2, 2, 3],
+                   [0, 2, 0, 2, 1, 1, 2, 1, 0, 2, 2, 0, 0, 1, 3, 1, 0, 1, 3, 1],
+                   [0, 2, 0, 4, 0, 2, 2, 1, 0, 3, 3, 4, 0, 0, 0, 3, 2, 4, 3, 2],
+                   [1, 0, 1, 2, 2, 0, 2, 0, 1, 1, 3, 3, 2, 0, 4, 4, 4, 0, 5, 4],
+                   [3, 0, 0, 3, 0, 0, 0, 2, 0, 1, 0, 1, 0, 1, 0, 0, 0, 3, 2, 0],
+                   [0, 0, 1, 0, 0, 0, 0, 1, 2, 3, 1, 0, 0, 1, 2, 0, 2, 0, 0, 3],
+                   [0, 2, 0, 0, 0, 0, 0, 1, 0, 1, 3, 0, 0, 1, 1, 1, 0, 0, 0, 1],
+                   [0, 3, 1, 2, 0, 0, 1, 0, 0, 2, 3, 1, 1, 1, 0, 0, 2, 0, 5, 4],
+                   [2, 1, 0, 2, 1, 0, 1, 1, 1, 0, 1, 1, 2, 0, 1, 2, 1, 0, 0, 1],
+                   [0, 1, 0, 0, 0, 0, 2, 0, 0, 0, 2, 1, 0, 0, 1, 0, 1, 0, 4, 0]], dtype='int64')
+
+
+def inconsistency_counts(test_mat, isi98):
+    order = sorted(range(len(isi98)), key=lambda idx: isi98[idx])
+    ordered_mat = test_mat[np.ix_(order, order)]
+    dominance = (ordered_mat > ordered_mat.T).astype('int64')
+    rows, cols = np.where(np.triu(dominance - dominance.T) < 0)
+    return len(rows), int(np.sum(cols - rows))
+
 
 ###################################################################################################
 ## de Vries (1998) -          Figure 1                                                           ##
@@ -38,4 +70,15 @@ def test_ISI_verbose():
     assert (isinstance(isi98, dict))
     assert (len(isi98) == len(hier_mat.indices))
     assert(isi98 == {'a': 0, 'b': 1, 'v': 2, 'g': 3, 'w': 4, 'h': 5, 'k': 6, 'e': 7, 'c': 8, 'y': 9})
-    
+
+def test_ISI_verbose_messages(capsys):
+    Hierarchia(mat, name_seq).ISI98(runs=100, verbose=True)
+    assert ('Optimal' not in capsys.readouterr().out)
+    linear_mat = np.triu(np.ones((4, 4), dtype='int64'), k=1)
+    Hierarchia(linear_mat, ['a', 'b', 'c', 'd']).ISI98(runs=100, verbose=True)
+    assert ('Optimal or near-optimal linear ranking is found!' in capsys.readouterr().out)
+
+def test_ISI_chained_search():
+    for random_state in range(2):
+        isi98 = Hierarchia(mat_20, list(range(20))).ISI98(runs=1000, random_state=random_state)
+        assert (inconsistency_counts(mat_20, isi98) == (18, 115))
@@ -0,0 +1,62 @@
+from HierarchiaPy import Hierarchia, HierarchiaBatch
+import pandas as pd
+import numpy as np
+import pytest
+
+# Random groups of different sizes
+
+np.random.seed(2)
+mats = []
+for n in [3, 5, 8, 12]:
+    group_mat = np.random.randint(0, 4, size=(n, n))
+    np.fill_diagonal(group_mat, 0)
+    mats.append(group_mat)
+
+rows = []
+for group, group_mat in zip(['g1', 'g2', 'g3', 'g4'], mats):
+    for idx, idy in zip(*np.nonzero(group_mat)):
+        rows += [(group, 'ind' + str(idx), 'ind' + str(idy))] * group_mat[idx, idy]
+df = pd.DataFrame(rows, columns=['group', 'winner', 'loser']).sample(frac=1, random_state=0)
+
+
+# Batch metrics against Hierarchia objects
+
+def test_batch_from_dataframe():
+    batch = HierarchiaBatch.from_dataframe(df, 'group', 'winner', 'loser')
+    assert (len(batch) == 4)
+    assert (list(batch.sizes) == [3, 5, 8, 12])
+    for idx, group in enumerate(batch.group_ids):
+        hier_df = Hierarchia(df[df['group'] == group], 'winner', 'loser')
+        assert (batch.indices[idx] == hier_df.indices)
+        assert (np.array_equal(batch.mats[idx, :batch.sizes[idx], :batch.sizes[idx]], hier_df.mat))
+        assert (not batch.mask[idx, batch.sizes[idx]:].any())
+
+def test_batch_individual_metrics():
+    batch = HierarchiaBatch(mats, group_ids=['g1', 'g2', 'g3', 'g4'])
+    davids_score_df = batch.davids_score(method='Dij', normalize=True)
+    adi_df = batch.average_dominance_index()
+    assert (list(davids_score_df.columns) == ['group', 'individual', 'davids_score'])
+    for group, group_mat in zip(batch.group_ids, mats):
+        hier_mat = Hierarchia(group_mat, list(range(len(group_mat))))
+        group_ds = davids_score_df[davids_score_df['group'] == group]
+        assert (dict(zip(group_ds['individual'], group_ds['davids_score'])) ==
+                hier_mat.davids_score(method='Dij', normalize=True))
+        group_adi = adi_df[adi_df['group'] == group]
+        assert (dict(zip(group_adi['individual'], group_adi['average_dominance_index'])) ==
+                hier_mat.average_dominance_index())
+
+@pytest.mark.parametrize('method', ['Dij', 'Pij'])
+def test_batch_group_metrics(method):
+    batch = HierarchiaBatch(mats)
+    dci_df = batch.dci()
+    steepness_df = batch.get_steepness(method=method)
+    for idx, group_mat in enumerate(mats):
+        hier_mat = Hierarchia(group_mat, list(range(len(group_mat))))
+        assert (dci_df['dci'][idx] == hier_mat.dci())
+        assert (abs(steepness_df['steepness'][idx] - hier_mat.get_steepness(method=method)) <= 0.0001 + 1e-9)
+
+def test_batch_value_error():
+    with pytest.raises(ValueError):
+        HierarchiaBatch([np.zeros((3, 2))])
+    with pytest.raises(ValueError):
+        HierarchiaBatch(mats, name_seqs=[['a']] * 4)
@@ -0,0 +1,102 @@
+from HierarchiaPy import Hierarchia
+import pandas as pd
+import numpy as np
+import pytest
+
+# Simple Dataframe and Matrix
+
+df = pd.DataFrame({'winner': ['c', 'a', 'a', 'b', 'd', 'b', 'a', 'c', 'b'],
+                   'loser': ['a', 'b', 'b', 'a', 'c', 'd', 'b', 'b', 'a']})
+
+mat = np.array([[0, 6, 9, 8, 5],
+                [0, 0, 4, 6, 0],
+                [0, 2, 0, 4, 7],
+                [1, 0, 5, 0, 3],
+                [0, 0, 2, 3, 0]], dtype='int64')
+
+names = ['a', 'b', 'c', 'd', 'e']
+
+
+def metric_panel(hier_mat):
+    return [hier_mat.davids_score(), hier_mat.davids_score(method='Dij'), hier_mat.average_dominance_index(),
+            hier_mat.get_Dij().tolist(), hier_mat.get_steepness(), hier_mat.get_steepness(method='Pij'),
+            hier_mat.dci(), hier_mat.landau_h(improved=False), hier_mat.landau_h(n_random=100),
+            hier_mat.ISI98(runs=10)]
+
+
+# Derived matrix cache
+
+def test_cache_panel_computes_once():
+    hier_mat = Hierarchia(mat, names)
+    np.random.seed(0)
+    first_results = metric_panel(hier_mat)
+    misses = hier_mat.cache_info()['misses']
+    assert (misses == len(set(hier_mat.cache_info()['entries'])))
+    np.random.seed(0)
+    assert (metric_panel(hier_mat) == first_results)
+    assert (hier_mat.cache_info()['misses'] == misses)
+    assert (hier_mat.cache_info()['hits'] > 0)
+
+def test_cache_read_only():
+    hier_mat = Hierarchia(mat, names)
+    hier_mat.davids_score()
+    for key in hier_mat.cache_info()['entries']:
+        with pytest.raises(ValueError):
+            hier_mat._cache.get(key, None)[0] = 1
+    dij = hier_mat.get_Dij()
+    dij[0, 0] = 1
+    assert (hier_mat.get_Dij()[0, 0] == 0)
+
+def test_cache_invalidation():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    hier_df.davids_score()
+    hier_df.add_interactions(['d', 'd'], ['a', 'a'])
+    hier_new = Hierarchia(pd.concat([df, pd.DataFrame({'winner': ['d', 'd'], 'loser': ['a', 'a']})],
+                                    ignore_index=True), 'winner', 'loser')
+    assert (hier_df.davids_score(method='Dij') == hier_new.davids_score(method='Dij'))
+    hier_df.mat = hier_new.mat.copy()
+    hier_df.mat[0, 1] += 5
+    assert (hier_df.dci() != hier_new.dci())
+
+def test_cache_clear():
+    hier_mat = Hierarchia(mat, names)
+    hier_mat.davids_score(method='Dij')
+    assert (len(hier_mat.cache_info()['entries']) > 0)
+    hier_mat.clear_cache(max_bytes=1000)
+    assert (hier_mat.cache_info()['entries'] == [])
+    assert (hier_mat.cache_info()['max_bytes'] == 1000)
+
+def test_cache_memory_cap():
+    hier_mat = Hierarchia(mat, names, cache_max_bytes=500)
+    results = metric_panel(hier_mat)
+    assert (hier_mat.cache_info()['nbytes'] <= 500)
+    assert (results[:7] == metric_panel(Hierarchia(mat, names))[:7])
+
+def test_cache_seeded_results():
+    hier_mat = Hierarchia(mat, names)
+    steepness = hier_mat.steepness_test(n=500, random_state=7)
+    misses = hier_mat.cache_info()['misses']
+    steepness['steepness'] = None
+    fresh_steepness = Hierarchia(mat, names).steepness_test(n=500, random_state=7)
+    assert (hier_mat.steepness_test(n=500, random_state=7) == fresh_steepness)
+    assert (hier_mat.cache_info()['misses'] == misses)
+    assert (hier_mat.landau_h(n_random=500, random_state=7) == hier_mat.landau_h(n_random=500, random_state=7))
+    assert (('landau_h', 7, 500, None) in hier_mat.cache_info()['entries'])
+    rng = np.random.default_rng(7)
+    assert (hier_mat.randomized_elo(n=100, random_state=rng) != hier_mat.randomized_elo(n=100, random_state=rng))
+    assert (not any(key[0] == 'randomized_elo' for key in hier_mat.cache_info()['entries'] if isinstance(key, tuple)))
+
+def test_cache_update_dyads():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    hier_df.davids_score(method='Dij')
+    hier_df.dci()
+    hier_df.add_interactions(['d', 'd'], ['a', 'a'])
+    entries = hier_df.cache_info()['entries']
+    assert ('Dij' in entries and 'proportion_Dij' in entries and 'davids_score_Dij' not in entries)
+    hier_new = Hierarchia(pd.concat([df, pd.DataFrame({'winner': ['d', 'd'], 'loser': ['a', 'a']})],
+                                    ignore_index=True), 'winner', 'loser')
+    hier_new.davids_score(method='Dij')
+    for key in entries:
+        assert (np.array_equal(hier_df._cache.get(key, None), hier_new._cache.get(key, None), equal_nan=True))
+    assert (hier_df.dci() == hier_new.dci())
+    assert (hier_df.davids_score(method='Dij') == hier_new.davids_score(method='Dij'))
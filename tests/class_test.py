@@ -64,3 +64,47 @@ def test_elo():
     elo_ranks = hier_df.elo()
     assert (isinstance(elo_ranks, dict))
     assert (len(elo_ranks) == len(hier_df.indices))
+
+
+# Matrix from DataFrame
+
+def test_hierarchia_df_matrix():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    indices = sorted(set(list(df['winner']) + list(df['loser'])))
+    cross_tab = pd.crosstab(df['winner'], df['loser']).reindex(indices, fill_value=0, axis=0).reindex(
+        indices, fill_value=0, axis=1)
+    assert (hier_df.indices == indices)
+    assert (np.array_equal(hier_df.mat, cross_tab.to_numpy()))
+    assert (hier_df.cross_tab_df.equals(cross_tab))
+
+
+# Incremental update
+
+def test_hierarchia_update():
+    hier_df = Hierarchia(df.iloc[:5], 'winner', 'loser')
+    changed_dyads = hier_df.update(df.iloc[5:])
+    hier_full = Hierarchia(df, 'winner', 'loser')
+    assert (hier_df.indices == hier_full.indices)
+    assert (np.array_equal(hier_df.mat, hier_full.mat))
+    assert (hier_df.elo() == hier_full.elo())
+    assert (len(hier_df.df) == len(df))
+    assert (sorted(zip(*changed_dyads)) == [(0, 1), (1, 0), (1, 3), (2, 1)])
+
+def test_hierarchia_add_interactions():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    hier_mat.add_interactions(['a', 'f'], ['b', 'a'])
+    assert (hier_mat.indices == ['a', 'b', 'c', 'd', 'e', 'f'])
+    assert (hier_mat.mat.shape == (6, 6))
+    assert (hier_mat.mat[0, 1] == 7 and hier_mat.mat[5, 0] == 1)
+    assert (mat[0, 1] == 6)
+
+def test_hierarchia_update_buffered():
+    hier_df = Hierarchia(df.iloc[:3], 'winner', 'loser')
+    hier_df.elo()
+    for row in range(3, len(df)):
+        hier_df.update(df.iloc[row:row + 1])
+    assert (len(hier_df._pending_rows) == len(df) - 3 and len(hier_df._pending_codes) == len(df) - 3)
+    hier_full = Hierarchia(df, 'winner', 'loser')
+    assert (hier_df.elo() == hier_full.elo())
+    assert (hier_df.df.equals(hier_full.df))
+    assert (hier_df._pending_rows == [] and hier_df._pending_codes == [])
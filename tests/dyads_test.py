@@ -0,0 +1,58 @@
+from HierarchiaPy.utilities._dyads import upper_triangle, pair_totals, dominance_relations, dyad_states
+import numpy as np
+import pytest
+
+# Random test matrix with ties and unknown relationships
+
+np.random.seed(5)
+mat = np.random.randint(0, 3, size=(12, 12)).astype('float64')
+np.fill_diagonal(mat, 0)
+
+
+# Reference double loops
+
+def loop_pair_totals(test_mat):
+    test_mat = test_mat.copy()
+    np.fill_diagonal(test_mat, np.nan)
+    sum_mat = test_mat.copy()
+    for idx in range(0, test_mat.shape[0]):
+        for idy in range(idx + 1, test_mat.shape[0]):
+            temp_sum = test_mat[idx, idy] + test_mat[idy, idx]
+            sum_mat[idx, idy] = sum_mat[idy, idx] = temp_sum if temp_sum > 0 else np.nan
+    return sum_mat
+
+def loop_dominance_relations(test_mat, tie_value):
+    test_mat = test_mat.copy()
+    for idx in range(test_mat.shape[0]):
+        for idy in range(idx + 1, test_mat.shape[0]):
+            if test_mat[idx, idy] == test_mat[idy, idx]:
+                test_mat[idx, idy], test_mat[idy, idx] = tie_value, tie_value
+            elif test_mat[idx, idy] > test_mat[idy, idx]:
+                test_mat[idx, idy], test_mat[idy, idx] = 1, 0
+            else:
+                test_mat[idx, idy], test_mat[idy, idx] = 0, 1
+    return test_mat
+
+
+# Kernels
+
+def test_upper_triangle():
+    rows, cols = upper_triangle(12)
+    assert (np.array_equal(np.vstack([rows, cols]), np.vstack(np.triu_indices(12, k=1))))
+    with pytest.raises(ValueError):
+        rows[0] = 1
+
+def test_pair_totals():
+    assert (np.array_equal(pair_totals(mat), loop_pair_totals(mat), equal_nan=True))
+
+@pytest.mark.parametrize('tie_value', [0.5, 0])
+def test_dominance_relations(tie_value):
+    assert (np.array_equal(dominance_relations(mat, tie_value), loop_dominance_relations(mat, tie_value)))
+    stacked = np.stack([mat, mat.T])
+    assert (np.array_equal(dominance_relations(stacked, tie_value)[1], loop_dominance_relations(mat.T, tie_value)))
+
+def test_dyad_states():
+    rows, cols, higher, lower, equal, unknown = dyad_states(mat)
+    assert (np.all(higher + lower + equal == 1))
+    assert (list(zip(rows[unknown], cols[unknown])) ==
+            [(idx, idy) for idx in range(12) for idy in range(idx + 1, 12) if mat[idx, idy] == mat[idy, idx] == 0])
@@ -43,3 +43,50 @@ def my_func_error():
 def elo_value_error():
     with pytest.raises(ValueError):
         my_func_error()
+
+# Elo engine against row-wise reference
+
+def test_elo_engine_reference():
+    rng = np.random.default_rng(1)
+    names = np.array(['a', 'b', 'c', 'd', 'e', 'f'])
+    winners = rng.integers(0, 6, 500)
+    losers = (winners + rng.integers(1, 6, 500)) % 6
+    long_df = pd.DataFrame({'winner': names[winners], 'loser': names[losers]})
+    reference = {i: 1000 for i in names}
+    for idx, row in long_df.iterrows():
+        elo_diff = reference[row['winner']] - reference[row['loser']]
+        reference[row['winner']] += (100 - 100 * (1 / (1 + 10 ** ((-elo_diff) / 400))))
+        reference[row['loser']] += (-100 * (1 / (1 + 10 ** (elo_diff / 400))))
+    hier_df = Hierarchia(long_df, 'winner', 'loser')
+    elo_ranks = hier_df.elo(start_value=1000, K=100, normal_probability=False)
+    assert (elo_ranks == {key: round(reference[key], 4) for key in reference})
+
+# Maximum-likelihood K
+
+def test_optimize_elo_k():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    results = hier_df.optimize_elo_k(K_values=[50, 100, 200])
+    assert (isinstance(results, dict))
+    assert (results['K'] in [50, 100, 200])
+    assert (results['log_likelihood'] == max(results['log_likelihoods'].values()))
+    assert (hier_df.optimize_elo_k(K_values=[100])['elo'] == hier_df.elo(start_value=1000, K=100))
+    assert (hier_df.optimize_elo_k(K_values=[0])['log_likelihood'] == round(9 * np.log(0.5), 4))
+
+# Elo trajectories
+
+def test_elo_trajectory():
+    dated_df = df.assign(date=pd.to_datetime(['2021-01-01', '2021-01-01', '2021-01-02', '2021-01-02', '2021-01-04',
+                                              '2021-01-04', '2021-01-04', '2021-01-05', '2021-01-05']))
+    hier_df = Hierarchia(dated_df, 'winner', 'loser')
+    trajectory = hier_df.elo_trajectory(start_value=1000, K=100, date_col='date')
+    assert (trajectory['elo'] == hier_df.elo(start_value=1000, K=100))
+    assert (len(trajectory['winner_before']) == len(dated_df))
+    assert (trajectory['winner_before'][0] == 1000 and trajectory['winner_after'][0] == 1050)
+    assert (trajectory['loser_after'][0] == 950)
+    assert (np.all(trajectory['winner_after'] > trajectory['winner_before']))
+    daily = trajectory['daily']
+    assert (daily.shape == (5, 4))
+    assert (daily.loc['2021-01-03'].equals(daily.loc['2021-01-02']))
+    assert (daily.iloc[-1].round(4).to_dict() == trajectory['elo'])
+    assert (daily.loc['2021-01-02'].drop('d').round(4).to_dict() ==
+            Hierarchia(dated_df.iloc[:4], 'winner', 'loser').elo())
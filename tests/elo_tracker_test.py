@@ -0,0 +1,61 @@
+from HierarchiaPy import Hierarchia, EloTracker
+import pandas as pd
+import numpy as np
+import pytest
+
+# Simple Dataframe
+
+df = pd.DataFrame({'winner': ['c', 'a', 'a', 'b', 'd', 'b', 'a', 'c', 'b'],
+                   'loser': ['a', 'b', 'b', 'a', 'c', 'd', 'b', 'b', 'a']})
+
+########################
+## FICTIONAL DATASET ##
+########################
+
+# Elo tracker test
+
+def test_elo_tracker_seed():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    tracker = hier_df.elo_tracker(start_value=1000, K=100, normal_probability=False)
+    assert (isinstance(tracker, EloTracker))
+    assert (tracker.n_interactions == 9)
+    assert (tracker.ratings() == {'a': 971.0724, 'b': 993.3937, 'c': 1040.421, 'd': 995.113})
+
+def test_elo_tracker_update():
+    hier_df = Hierarchia(df.iloc[:5], 'winner', 'loser')
+    tracker = hier_df.elo_tracker(start_value=1000, K=100, normal_probability=True)
+    tracker.update(df['winner'].iloc[5], df['loser'].iloc[5])
+    tracker.update_batch(list(df['winner'].iloc[6:]), list(df['loser'].iloc[6:]))
+    assert (tracker.n_interactions == 9)
+    assert (tracker.ratings() == {'a': 971.3928, 'b': 992.7994, 'c': 1040.6227, 'd': 995.1851})
+
+def test_elo_tracker_new_individual():
+    tracker = EloTracker(start_value=1000, K=100)
+    tracker.update('x', 'y')
+    assert (tracker.ratings() == {'x': 1050.0, 'y': 950.0})
+
+def test_elo_tracker_save_load(tmp_path):
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    tracker = hier_df.elo_tracker()
+    tracker.save(str(tmp_path / 'tracker.json'))
+    restored = EloTracker.load(str(tmp_path / 'tracker.json'))
+    restored.update('e', 'a')
+    tracker.update('e', 'a')
+    assert (restored.ratings() == tracker.ratings())
+    assert (restored.n_interactions == 10)
+
+def test_elo_tracker_save_load_mixed_names(tmp_path):
+    hier_df = Hierarchia(pd.DataFrame({'winner': [1, 2, 3], 'loser': [2, 3, 1]}), 'winner', 'loser')
+    tracker = hier_df.elo_tracker()
+    tracker.update('x', 1)
+    tracker.save(str(tmp_path / 'tracker.json'))
+    restored = EloTracker.load(str(tmp_path / 'tracker.json'))
+    assert (list(restored.ratings()) == [1, 2, 3, 'x'])
+    restored.update(1, 2)
+    tracker.update(1, 2)
+    assert (restored.ratings() == tracker.ratings())
+    assert (len(restored.ratings()) == 4)
+
+def test_elo_tracker_value_error():
+    with pytest.raises(ValueError):
+        Hierarchia(np.zeros((3, 3)), ['a', 'b', 'c']).elo_tracker()
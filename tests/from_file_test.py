@@ -0,0 +1,87 @@
+from HierarchiaPy import Hierarchia
+import pandas as pd
+import numpy as np
+import pytest
+
+# Simple Dataframe
+
+df = pd.DataFrame({'winner': ['c', 'a', 'a', 'b', 'd', 'b', 'a', 'c', 'b', 'e'],
+                   'loser': ['a', 'b', 'b', 'a', 'c', 'd', 'b', 'b', 'a', 'a'],
+                   'date': range(10)})
+
+########################
+## FICTIONAL DATASET ##
+########################
+
+# Chunked file ingestion test
+
+def test_from_csv(tmp_path):
+    df.to_csv(tmp_path / 'interactions.csv', index=False)
+    hier_file = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=3)
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    assert (isinstance(hier_file, Hierarchia))
+    assert (not hasattr(hier_file, 'df'))
+    assert (hier_file.indices == hier_df.indices)
+    assert (np.array_equal(hier_file.mat, hier_df.mat))
+    assert (hier_file.elo() == hier_df.elo())
+
+def test_from_csv_spill(tmp_path):
+    df.to_csv(tmp_path / 'interactions.csv', index=False)
+    hier_file = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=4,
+                                     spill_dir=str(tmp_path / 'spill'))
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    assert (isinstance(hier_file._interaction_codes[0], np.memmap))
+    assert (np.array_equal(hier_file.mat, hier_df.mat))
+    assert (hier_file.elo(normal_probability=True) == hier_df.elo(normal_probability=True))
+
+def test_from_file_value_error(tmp_path):
+    with pytest.raises(ValueError):
+        Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', file_format='xlsx')
+
+def test_from_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    df.to_parquet(tmp_path / 'interactions.parquet')
+    hier_file = Hierarchia.from_file(str(tmp_path / 'interactions.parquet'), 'winner', 'loser', chunksize=3)
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    assert (np.array_equal(hier_file.mat, hier_df.mat))
+    assert (hier_file.elo() == hier_df.elo())
+
+def test_from_csv_mixed_chunks(tmp_path):
+    mixed_df = pd.DataFrame({'winner': [1, 2, 'x', 'y'], 'loser': [2, 1, 'y', 'x']})
+    mixed_df.to_csv(tmp_path / 'interactions.csv', index=False)
+    hier_file = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=2)
+    hier_df = Hierarchia(pd.read_csv(tmp_path / 'interactions.csv'), 'winner', 'loser')
+    assert (hier_file.indices == ['1', '2', 'x', 'y'])
+    assert (hier_file.indices == hier_df.indices)
+    assert (np.array_equal(hier_file.mat, hier_df.mat))
+
+def test_from_csv_spill_unique(tmp_path):
+    df.to_csv(tmp_path / 'interactions.csv', index=False)
+    hier_x = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=4,
+                                  spill_dir=str(tmp_path / 'spill'))
+    hier_y = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=4,
+                                  spill_dir=str(tmp_path / 'spill'))
+    assert (hier_x._interaction_codes[0].filename != hier_y._interaction_codes[0].filename)
+    assert (np.array_equal(hier_x._interaction_codes[0], hier_y._interaction_codes[0]))
+    assert (len(list((tmp_path / 'spill').iterdir())) == 4)
+
+def test_from_file_trajectory(tmp_path):
+    df.to_csv(tmp_path / 'interactions.csv', index=False)
+    hier_file = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=3)
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    trajectory = hier_file.elo_trajectory()
+    assert (trajectory['elo'] == hier_df.elo_trajectory()['elo'])
+    assert (np.array_equal(trajectory['winner_after'], hier_df.elo_trajectory()['winner_after']))
+    with pytest.raises(ValueError, match='dataframe'):
+        hier_file.elo_trajectory(date_col='date')
+    with pytest.raises(ValueError, match='dataframe'):
+        hier_file.stability_index('date')
+
+def test_from_csv_spill_update(tmp_path):
+    df.iloc[:6].to_csv(tmp_path / 'interactions.csv', index=False)
+    hier_file = Hierarchia.from_file(str(tmp_path / 'interactions.csv'), 'winner', 'loser', chunksize=4,
+                                     spill_dir=str(tmp_path / 'spill'))
+    hier_file.add_interactions(df['winner'].iloc[6:], df['loser'].iloc[6:])
+    assert (isinstance(hier_file._interaction_codes[0], np.memmap))
+    assert (len(hier_file._interaction_codes[0]) == len(df))
+    assert (hier_file.elo() == Hierarchia(df, 'winner', 'loser').elo())
@@ -0,0 +1,37 @@
+from HierarchiaPy import Hierarchia, grouped_elo
+import pandas as pd
+import numpy as np
+import pytest
+
+# Simple Dataframe with two groups sharing names
+
+df = pd.DataFrame({'group': ['g1', 'g2', 'g1', 'g1', 'g2', 'g1', 'g2', 'g1', 'g1', 'g1', 'g2', 'g1'],
+                   'winner': ['c', 'x', 'a', 'a', 'a', 'b', 'x', 'd', 'b', 'a', 'a', 'c'],
+                   'loser': ['a', 'a', 'b', 'b', 'x', 'a', 'a', 'c', 'd', 'b', 'x', 'b']})
+
+########################
+## FICTIONAL DATASET ##
+########################
+
+# Grouped Elo test
+
+def test_grouped_elo():
+    elo_df = grouped_elo(df, 'group', 'winner', 'loser', start_value=1000, K=100)
+    assert (isinstance(elo_df, pd.DataFrame))
+    assert (list(elo_df.columns) == ['group', 'individual', 'elo'])
+    assert (len(elo_df) == 6)
+    for group, group_df in df.groupby('group'):
+        elo_ranks = Hierarchia(group_df.reset_index(drop=True), 'winner', 'loser').elo(start_value=1000, K=100)
+        group_elo = elo_df[elo_df['group'] == group]
+        assert (dict(zip(group_elo['individual'], group_elo['elo'])) == elo_ranks)
+
+def test_grouped_elo_value_error():
+    with pytest.raises(ValueError):
+        grouped_elo(df, 'colony', 'winner', 'loser')
+
+def test_grouped_elo_missing_values():
+    missing_df = pd.concat([df.iloc[:4], pd.DataFrame({'group': ['g1', None], 'winner': [np.nan, 'a'],
+                                                       'loser': ['b', 'x']}), df.iloc[4:]], ignore_index=True)
+    elo_df = grouped_elo(missing_df, 'group', 'winner', 'loser')
+    assert (not elo_df.isna().any().any())
+    assert (elo_df.equals(grouped_elo(df, 'group', 'winner', 'loser')))
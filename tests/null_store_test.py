@@ -0,0 +1,43 @@
+from HierarchiaPy import Hierarchia
+from HierarchiaPy.__main__ import main
+from HierarchiaPy.metrics._kendall_k import ecdf_samples, kendall_null
+from HierarchiaPy.utilities._null_store import cache_dir, null_path
+import numpy as np
+import os
+
+# Define test matrix
+
+mat = np.array([[0, 6, 1, 4, 6],
+                [5, 0, 5, 0, 0],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                [2, 0, 0, 2, 0]], dtype='float32')
+
+
+# Null distribution store
+
+def test_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv('HIERARCHIAPY_CACHE_DIR', str(tmp_path))
+    assert (cache_dir() == str(tmp_path))
+    monkeypatch.delenv('HIERARCHIAPY_CACHE_DIR')
+    assert (cache_dir().endswith(os.path.join('.cache', 'HierarchiaPy')))
+
+def test_kendall_null(monkeypatch, tmp_path):
+    monkeypatch.setenv('HIERARCHIAPY_CACHE_DIR', str(tmp_path))
+    null_d = kendall_null(5, runs=20000, seed=3)
+    assert (os.path.exists(null_path('kendall_d', 5, 20000, 3)))
+    assert (isinstance(null_d, np.memmap) and not null_d.flags.writeable)
+    assert (np.array_equal(null_d, np.sort(ecdf_samples(5, runs=20000, random_state=3))))
+    assert (np.array_equal(kendall_null(5, runs=20000, seed=3), null_d))
+
+def test_kendall_k_null_store(monkeypatch, tmp_path):
+    monkeypatch.setenv('HIERARCHIAPY_CACHE_DIR', str(tmp_path))
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    kendall = hier_mat.kendall_k(random_state=0)
+    assert (hier_mat.kendall_k(null_store=True) == kendall)
+    assert (os.path.exists(null_path('kendall_d', 5, 100000, 0)))
+
+def test_precompute_command(monkeypatch, tmp_path):
+    monkeypatch.setenv('HIERARCHIAPY_CACHE_DIR', str(tmp_path))
+    main(['kendall-null', '3', '5', '--runs', '1000', '--seed', '1'])
+    assert (sorted(os.listdir(tmp_path)) == ['kendall_d_n{}_runs1000_seed1.npy'.format(n) for n in [3, 4, 5]])
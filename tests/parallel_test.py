@@ -0,0 +1,59 @@
+from HierarchiaPy import Hierarchia
+from HierarchiaPy.metrics._kendall_k import get_ecdf
+from HierarchiaPy.utilities._parallel import effective_n_jobs, map_blocks, randomization_blocks
+import numpy as np
+import pytest
+
+# Define test matrix
+
+mat = np.array([[0, 6, 9, 8, 5],
+                [0, 0, 4, 6, 0],
+                [0, 2, 0, 4, 7],
+                [1, 0, 5, 0, 3],
+                [0, 0, 2, 3, 0]], dtype='int64')
+
+
+def block_sums(block_size, seed, offset):
+    return np.random.default_rng(seed).integers(0, 10, block_size) + offset
+
+
+# Parallel backend
+
+def test_effective_n_jobs():
+    assert (effective_n_jobs(None) == 1)
+    assert (effective_n_jobs(3) == 3)
+    assert (effective_n_jobs(-1) >= 1)
+    with pytest.raises(ValueError):
+        effective_n_jobs(0)
+
+def test_map_blocks():
+    assert (randomization_blocks(2500) == [1000, 1000, 500])
+    serial = list(map_blocks(block_sums, [5, 5, 3], random_state=1, args=(10,)))
+    parallel = list(map_blocks(block_sums, [5, 5, 3], random_state=1, n_jobs=2, args=(10,)))
+    assert ([len(block) for block in serial] == [5, 5, 3])
+    assert (all(np.array_equal(block_x, block_y) for block_x, block_y in zip(serial, parallel)))
+
+
+# Identical results in serial and in parallel for a given seed
+
+def test_parallel_steepness_test():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    assert (hier_mat.steepness_test(n=600, random_state=3) == hier_mat.steepness_test(n=600, n_jobs=2, random_state=3))
+
+def test_parallel_landau_h():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    assert (hier_mat.landau_h(n_random=2500, random_state=3) ==
+            hier_mat.landau_h(n_random=2500, n_jobs=2, random_state=3))
+
+def test_parallel_ecdf():
+    assert (get_ecdf(5, runs=30000, random_state=3) == get_ecdf(5, runs=30000, n_jobs=2, random_state=3))
+
+def test_parallel_randomized_elo():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    serial = hier_mat.randomized_elo(n=300, batch_size=100, uncertainty=True, random_state=3)
+    assert (serial == hier_mat.randomized_elo(n=300, batch_size=100, uncertainty=True, n_jobs=2, random_state=3))
+    assert (serial != hier_mat.randomized_elo(n=300, batch_size=100, uncertainty=True, random_state=4))
+
+def test_parallel_ISI98():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    assert (hier_mat.ISI98(runs=300, random_state=3) == hier_mat.ISI98(runs=300, n_jobs=2, random_state=3))
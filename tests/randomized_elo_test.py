@@ -1,4 +1,5 @@
 from HierarchiaPy import Hierarchia
+from HierarchiaPy.methods._elo_engine import RatingAccumulator
 import pandas as pd
 import numpy as np
 import pytest
@@ -31,3 +32,48 @@ def test_elo_normal():
     elo_ranks = hier_mat.randomized_elo(start_value=1000, K=100, n=500, normal_probability=True)
     assert (isinstance(elo_ranks, dict))
     assert (len(elo_ranks) == len(hier_mat.indices))
+
+def test_randomized_elo_single_order():
+    one_way_mat = np.array([[0, 3, 0],
+                            [0, 0, 0],
+                            [0, 0, 0]], dtype='int64')
+    hier_mat = Hierarchia(one_way_mat, ['a', 'b', 'c'])
+    elo_ranks = hier_mat.randomized_elo(start_value=1000, K=100, n=50, normal_probability=False)
+    hier_df = Hierarchia(pd.DataFrame({'winner': ['a', 'a', 'a', 'c'], 'loser': ['b', 'b', 'b', 'c']}),
+                         'winner', 'loser')
+    assert (elo_ranks == hier_df.elo(start_value=1000, K=100))
+    elo_ranks_batched = hier_mat.randomized_elo(start_value=1000, K=100, n=50, batch_size=7)
+    assert (elo_ranks_batched == elo_ranks)
+
+def test_randomized_elo_uncertainty():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    elo_summary = hier_mat.randomized_elo(start_value=1000, K=100, n=300, batch_size=64, uncertainty=True)
+    assert (isinstance(elo_summary, dict))
+    assert (elo_summary['count'] == 300)
+    assert (set(elo_summary['elo']) == set(hier_mat.indices))
+    assert (all(sd > 0 for sd in elo_summary['sd'].values()))
+    assert (elo_summary['rank_range']['a'][0] == 1)
+    assert (all(lower <= upper for lower, upper in elo_summary['rank_range'].values()))
+    assert (abs(sum(elo_summary['mean_rank'].values()) - 15) < 0.001)
+
+def test_rating_accumulator_ranks():
+    ratings = np.array([[1010., 990., 1000.], [1020., 1000., 980.]])
+    accumulator = RatingAccumulator(3)
+    accumulator.add(ratings)
+    assert (accumulator.rank_counts is None)
+    rank_accumulator = RatingAccumulator(3, ranks=True)
+    rank_accumulator.add(ratings)
+    assert (np.array_equal(accumulator.mean, rank_accumulator.mean))
+    assert (np.array_equal(rank_accumulator.mean_rank, [1, 2.5, 2.5]))
+
+def test_randomized_elo_convergence():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    elo_summary = hier_mat.randomized_elo(n=10000, uncertainty=True, tol=5, convergence='rating')
+    assert (100 < elo_summary['count'] < 10000)
+    assert (elo_summary['count'] % 100 == 0)
+    elo_summary = hier_mat.randomized_elo(n=10000, batch_size=50, uncertainty=True, tol=0.5, convergence='rank')
+    assert (elo_summary['count'] < 10000)
+    assert (elo_summary['count'] % 50 == 0)
+    elo_summary = hier_mat.randomized_elo(n=10000, tol=5)
+    assert (set(elo_summary) == {'elo', 'sd', 'mean_rank', 'rank_range', 'count'})
+    assert (elo_summary['count'] < 10000)
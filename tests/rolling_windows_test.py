@@ -0,0 +1,43 @@
+from HierarchiaPy import Hierarchia
+import pandas as pd
+import numpy as np
+import pytest
+
+# Random Dataframe with timestamps
+
+rng = np.random.default_rng(7)
+names = np.array(['a', 'b', 'c', 'd', 'e', 'f'])
+winners = rng.integers(0, 6, 300)
+losers = (winners + rng.integers(1, 6, 300)) % 6
+df = pd.DataFrame({'winner': names[winners], 'loser': names[losers],
+                   'time': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 90 * 24, 300), 'h')})
+
+########################
+## FICTIONAL DATASET ##
+########################
+
+# Sliding window test
+
+def test_rolling_windows():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    windows = list(hier_df.rolling_windows('time', window='20D', step='7D',
+                                           metrics={'davids_score': {'order': False}, 'dci': {}}))
+    assert (len(windows) == 13)
+    for window in windows:
+        window_df = df[(df['time'] >= window['start']) & (df['time'] < window['end'])].reset_index(drop=True)
+        assert (window['n_interactions'] == len(window_df))
+        window_hierarchia = Hierarchia(window_df, 'winner', 'loser')
+        assert (window['davids_score'] == window_hierarchia.davids_score(order=False))
+        assert (window['dci'] == window_hierarchia.dci())
+
+def test_rolling_windows_gaps():
+    hier_df = Hierarchia(df, 'winner', 'loser')
+    windows = list(hier_df.rolling_windows('time', window='1D', step='10D', metrics=['dci']))
+    for window in windows:
+        assert (window['n_interactions'] == ((df['time'] >= window['start']) & (df['time'] < window['end'])).sum())
+
+def test_rolling_windows_value_error():
+    with pytest.raises(ValueError):
+        Hierarchia(df, 'winner', 'loser').rolling_windows('date')
+    with pytest.raises(ValueError):
+        Hierarchia(df, 'winner', 'loser').rolling_windows('time', metrics=['unknown'])
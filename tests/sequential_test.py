@@ -0,0 +1,48 @@
+from HierarchiaPy import Hierarchia
+from HierarchiaPy.utilities._sequential import clopper_pearson, p_value_decided, sequential_blocks
+import numpy as np
+
+# Define test matrix
+
+mat = np.array([[0, 6, 9, 8, 5],
+                [0, 0, 4, 6, 0],
+                [0, 2, 0, 4, 7],
+                [1, 0, 5, 0, 3],
+                [0, 0, 2, 3, 0]], dtype='int64')
+
+
+# Stopping rule
+
+def test_clopper_pearson():
+    assert (clopper_pearson(0, 0) == (0.0, 1.0))
+    lower, upper = clopper_pearson(5, 100, confidence=0.95)
+    assert (round(lower, 4) == 0.0164 and round(upper, 4) == 0.1128)
+    assert (clopper_pearson(0, 100)[0] == 0.0 and clopper_pearson(100, 100)[1] == 1.0)
+
+def test_p_value_decided():
+    assert (p_value_decided(0, 1000, 0.05))
+    assert (p_value_decided(500, 1000, 0.05))
+    assert (not p_value_decided(50, 1000, 0.05))
+
+def test_sequential_blocks():
+    blocks = [np.zeros(1000), np.zeros(1000), np.zeros(1000)]
+    assert (len(list(sequential_blocks(iter(blocks), lambda block: (0, len(block)), alpha=0.05))) == 1)
+    assert (len(list(sequential_blocks(iter(blocks), lambda block: (0, len(block))))) == 3)
+
+
+# Sequential randomization tests
+
+def test_sequential_steepness_test():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    full = hier_mat.steepness_test(n=5000, random_state=1)
+    sequential = hier_mat.steepness_test(n=5000, random_state=1, alpha=0.5)
+    assert (full['count'] == 5000)
+    assert (sequential['count'] < 5000 and sequential['count'] % 250 == 0)
+    assert (sequential['p_value_r'] < 0.5)
+    assert (sequential == hier_mat.steepness_test(n=5000, random_state=1, alpha=0.5, n_jobs=2))
+
+def test_sequential_landau_h():
+    hier_mat = Hierarchia(mat, ['a', 'b', 'c', 'd', 'e'])
+    landau = hier_mat.landau_h(n_random=10000, random_state=1, alpha=0.5)
+    assert (landau['count'] < 10000)
+    assert (hier_mat.landau_h(n_random=10000, random_state=1)['count'] == 10000)
@@ -0,0 +1,89 @@
+from HierarchiaPy import Hierarchia
+from scipy import sparse
+import pandas as pd
+import numpy as np
+import pytest
+
+# Simple Dataframe and Matrices
+
+df = pd.DataFrame({'winner': ['c', 'a', 'a', 'b', 'd', 'b', 'a', 'c', 'b'],
+                   'loser': ['a', 'b', 'b', 'a', 'c', 'd', 'b', 'b', 'a']})
+
+mat = np.array([[0, 6, 9, 8, 5],
+                [0, 0, 4, 6, 0],
+                [0, 2, 0, 4, 7],
+                [1, 0, 5, 0, 3],
+                [0, 0, 2, 3, 0]], dtype='int64')
+
+adagio_mat = np.array([[0, 1, 2, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 1, 0, 2, 1, 0],
+                       [1, 1, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 1, 0, 0]], dtype='int64')
+
+names = ['a', 'b', 'c', 'd', 'e']
+
+
+# Initialization
+
+@pytest.mark.parametrize('sparse_format', [sparse.csr_matrix, sparse.coo_matrix])
+def test_sparse_init(sparse_format):
+    hier_sparse = Hierarchia(sparse_format(mat), names)
+    assert (sparse.isspmatrix_csr(hier_sparse.mat))
+    assert (np.array_equal(hier_sparse.mat.toarray(), mat))
+
+def test_sparse_init_df():
+    hier_dense = Hierarchia(df, 'winner', 'loser')
+    hier_sparse = Hierarchia(df, 'winner', 'loser', sparse=True)
+    assert (sparse.issparse(hier_sparse.mat))
+    assert (np.array_equal(hier_sparse.mat.toarray(), hier_dense.mat))
+    assert (hier_sparse.cross_tab_df.sparse.to_dense().equals(hier_dense.cross_tab_df))
+    assert (hier_sparse.elo() == hier_dense.elo())
+
+def test_sparse_init_not_symmetric():
+    with pytest.raises(ValueError):
+        Hierarchia(sparse.csr_matrix(mat[:, :4]), names)
+
+
+# Methods computed on the sparse matrix
+
+def test_sparse_methods():
+    hier_dense = Hierarchia(mat, names)
+    hier_sparse = Hierarchia(sparse.csr_matrix(mat), names)
+    assert (hier_sparse.dci() == hier_dense.dci())
+    assert (hier_sparse.davids_score() == hier_dense.davids_score())
+    assert (hier_sparse.davids_score(method='Dij', normalize=True) ==
+            hier_dense.davids_score(method='Dij', normalize=True))
+    assert (hier_sparse.average_dominance_index() == hier_dense.average_dominance_index())
+
+def test_sparse_adagio():
+    hier_dense = Hierarchia(adagio_mat, ['a', 'b', 'c', 'd', 'e', 'f'])
+    hier_sparse = Hierarchia(sparse.csr_matrix(adagio_mat), ['a', 'b', 'c', 'd', 'e', 'f'])
+    for rank in ['topological', 'top', 'bottom']:
+        for preprocessing in [True, False]:
+            assert (hier_sparse.adagio(preprocessing=preprocessing, rank=rank) ==
+                    hier_dense.adagio(preprocessing=preprocessing, rank=rank))
+
+def test_sparse_randomized_elo():
+    hier_dense = Hierarchia(mat, names)
+    hier_sparse = Hierarchia(sparse.csr_matrix(mat), names)
+    np.random.seed(0)
+    dense_elo = hier_dense.randomized_elo(n=50)
+    np.random.seed(0)
+    assert (hier_sparse.randomized_elo(n=50) == dense_elo)
+
+def test_sparse_densified_methods():
+    hier_dense = Hierarchia(mat, names)
+    hier_sparse = Hierarchia(sparse.csr_matrix(mat), names)
+    assert (hier_sparse.get_steepness() == hier_dense.get_steepness())
+    assert (np.array_equal(hier_sparse.get_Dij(), hier_dense.get_Dij()))
+
+def test_sparse_add_interactions():
+    hier_sparse = Hierarchia(df, 'winner', 'loser', sparse=True)
+    hier_sparse.add_interactions(['a', 'e'], ['e', 'b'])
+    hier_dense = Hierarchia(pd.concat([df, pd.DataFrame({'winner': ['a', 'e'], 'loser': ['e', 'b']})],
+                                      ignore_index=True), 'winner', 'loser')
+    assert (sparse.issparse(hier_sparse.mat))
+    assert (np.array_equal(hier_sparse.mat.toarray(), hier_dense.mat))
+    assert (hier_sparse.davids_score() == hier_dense.davids_score())
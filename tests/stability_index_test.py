@@ -0,0 +1,44 @@
+from HierarchiaPy import Hierarchia
+import pandas as pd
+import numpy as np
+import pytest
+
+# Simple Dataframes with dates
+
+df_stable = pd.DataFrame({'winner': ['a', 'a', 'a', 'c'],
+                          'loser': ['b', 'b', 'c', 'b'],
+                          'date': pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-04', '2021-01-05'])})
+
+df_reversal = pd.DataFrame({'winner': ['a', 'b', 'b'],
+                            'loser': ['b', 'a', 'a'],
+                            'date': pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-02'])})
+
+########################
+## FICTIONAL DATASET ##
+########################
+
+# Stability index test
+
+def test_stability_stable():
+    hier_df = Hierarchia(df_stable, 'winner', 'loser')
+    assert (hier_df.stability_index('date') == 1)
+
+def test_stability_reversal():
+    hier_df = Hierarchia(df_reversal, 'winner', 'loser')
+    assert (hier_df.stability_index('date', weighted=False) == 0)
+    assert (hier_df.stability_index('date', weighted=True) == 0.5)
+
+def test_stability_windows():
+    hier_df = Hierarchia(pd.concat([df_reversal, df_stable.assign(date=df_stable['date'] + pd.Timedelta(days=10))],
+                                   ignore_index=True),
+                         'winner', 'loser')
+    stability = hier_df.stability_index('date', weighted=False, windows=[('2021-01-01', '2021-01-02'),
+                                                                          ('2021-01-02', '2021-01-15'),
+                                                                          ('2021-01-01', '2021-01-01')])
+    assert (stability[('2021-01-01', '2021-01-02')] == 0)
+    assert (0 < stability[('2021-01-02', '2021-01-15')] < 1)
+    assert (stability[('2021-01-01', '2021-01-01')] is None)
+
+def test_stability_value_error():
+    with pytest.raises(ValueError):
+        Hierarchia(df_stable.iloc[::-1], 'winner', 'loser').stability_index('date')
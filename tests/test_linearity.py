@@ -41,3 +41,13 @@ def test_kendall():
     assert kendall["chi_sq"] == None
     assert abs(landau["Improved_Landau_h"] - kendall["unbiased_K"]) <= 0.01
    
+
+def test_landau_chunks():
+    hier_mat = Hierarchia(test_appleby_1)
+    landau = hier_mat.landau_h(improved=True, n_random=3000, random_state=2)
+    for max_bytes in [1, 2000]:
+        hier_mat.clear_cache()
+        assert (hier_mat.landau_h(improved=True, n_random=3000, random_state=2, max_bytes=max_bytes) == landau)
+    hier_mat = Hierarchia(old_landau_h)
+    assert (hier_mat.landau_h(improved=True, n_random=500)['Improved_Landau_h'] ==
+            hier_mat.landau_h(improved=False)['Landau_h'])
@@ -50,3 +50,27 @@ def test_get_dij():
     assert (dij.shape == (5,5))
     assert (dij[0,0] == 0.0)
     assert (dij[1,2] == 0.6429)
+
+def test_steeptest_chunks():
+    hier_mat = Hierarchia(mat_hemelrijk_table_2_1, np.array(['a', 'b', 'c', 'd', 'e']))
+    stp = hier_mat.steepness_test(method='Dij', n=600, random_state=1)
+    for max_bytes in [1, 5000, 2 ** 20]:
+        hier_mat.clear_cache()
+        assert (hier_mat.steepness_test(method='Dij', n=600, random_state=1, max_bytes=max_bytes) == stp)
+
+def test_steeptest_fixed_seed():
+    # Single chunk result for the seed, the chunked and parallel tests draw the same random matrices
+    expected = {'steepness': 0.5262, 'p_value_r': 0.032, 'p_value_l': 0.968, 'mean': 0.3285, 'std_dev': 0.1037,
+                'variance': 0.0108, 'min': 0.0425, 'max': 0.6689, 'percentile_25': 0.2577, 'percentile_50': 0.3238,
+                'percentile_75': 0.4006, 'count': 1000}
+    hier_mat = Hierarchia(mat_hemelrijk_table_2_1, np.array(['a', 'b', 'c', 'd', 'e']))
+    assert (hier_mat.steepness_test(method='Dij', n=1000, random_state=7, max_bytes=2 ** 40) == expected)
+    hier_mat.clear_cache()
+    assert (hier_mat.steepness_test(method='Dij', n=1000, random_state=7, max_bytes=1) == expected)
+    hier_mat.clear_cache()
+    assert (hier_mat.steepness_test(method='Dij', n=1000, random_state=7, n_jobs=2) == expected)
+
+    # Null distribution of the unchunked numpy.tile implementation (n = 100000, random_state = 1)
+    stp = hier_mat.steepness_test(method='Dij', n=100000, random_state=1)
+    assert (abs(stp['mean'] - 0.3285) < 0.002 and abs(stp['std_dev'] - 0.1083) < 0.002)
+    assert (abs(stp['p_value_r'] - 0.0378) < 0.003)